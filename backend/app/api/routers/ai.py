@@ -1,4 +1,5 @@
-from fastapi import APIRouter, File, UploadFile, Depends
+from fastapi import APIRouter, File, UploadFile, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user
@@ -8,7 +9,7 @@ from app.domain.services.ai_service import identify_pokemon_with_vision
 from app.domain.services.pokemon_service import search_pokemon, get_pokemon
 from app.domain.models.ai import VisionIdentifyResult
 from app.domain.models.compare import CompareRequest, CompareResponse
-from app.domain.services.compare_service import compare_pokemon
+from app.domain.services.compare_service import compare_pokemon, stream_compare_summary
 from app.domain.services.recommend_service import recommend_for_user
 from app.domain.services.auto_team_service import build_auto_team
 from app.domain.services.fun_facts_service import get_fun_facts
@@ -212,15 +213,15 @@ def ai_identify(
 @router.post(
     "/compare",
     response_model=CompareResponse,
-    summary="Compare two Pokémon using AI analysis",
+    summary="Compare two Pokémon (numeric engine, optional AI prose)",
     responses={
         200: {
-            "description": "AI-generated Pokémon comparison",
+            "description": "Pokémon comparison with stat deltas, type multipliers and predicted winner",
             "content": {
                 "application/json": {
                     "example": {
-                        "summary": "### Detailed Comparison Summary\n\n#### **Strengths**\n**Charizard**\n- Excellent Special Attack (109) and Speed (100)...",
-                        "winner": "charizard",
+                        "summary": "**charizard** hits for 1x and needs 3 hit(s) (~37% per hit).\n\n**blastoise** hits for 2x and needs 2 hit(s) (~77% per hit).\n\nSpeed: 100 (fast) vs 78 (average), charizard moves first.\n\nPredicted winner: **blastoise**.",
+                        "winner": "blastoise",
                         "a": {
                             "id": 6,
                             "name": "charizard",
@@ -248,7 +249,11 @@ def ai_identify(
                                 "special_defense": 105,
                                 "speed": 78
                             }
-                        }
+                        },
+                        "stat_deltas": {"hp": -1, "attack": 1, "defense": -22, "special_attack": 24, "special_defense": -20, "speed": 22, "bst": 4},
+                        "type_effectiveness": {"a_vs_b": {"fire": 0.5, "flying": 1.0}, "b_vs_a": {"water": 2.0}},
+                        "speed": {"a": 100, "b": 78, "a_tier": "fast", "b_tier": "average", "faster": "charizard"},
+                        "battle": {"a_damage_pct": 37.3, "b_damage_pct": 76.5, "a_hits_to_ko": 3, "b_hits_to_ko": 2}
                     }
                 }
             }
@@ -279,21 +284,34 @@ def ai_identify(
         }
     }
 )
-def compare(req: CompareRequest):
+def compare(
+    req: CompareRequest,
+    ai_summary: bool = Query(False, description="Replace the numeric summary with LLM prose (slower)."),
+    trials: int = Query(0, ge=0, le=100_000, description="Monte Carlo battles to simulate (0 = skip)."),
+):
     """
-    Compare two Pokémon using an AI-powered statistical and strategic evaluation.
+    Compare two Pokémon with a local numeric engine.
 
     ### Description
-    This endpoint generates a detailed comparison between two Pokémon using:
-    - Stats (HP, Attack, Defense, Sp. Attack, Sp. Defense, Speed)
-    - Type advantages and weaknesses
-    - Strategic roles (sweeper, tank, support)
-    - Matchup predictions
-
-    The AI returns:
-    - A Markdown-formatted analysis summary
-    - Detailed Pokémon objects (`a` and `b`)
-    - A predicted winner
+    The comparison is computed locally and returns immediately:
+    - `stat_deltas`: A − B for every base stat and the BST
+    - `type_effectiveness`: multiplier of each of A's types against B (`a_vs_b`)
+      and vice versa (`b_vs_a`)
+    - `speed`: base speed, speed tier and who moves first
+    - `battle`: damage race at level 50 with each side's best STAB move
+      (damage per hit as % of the target's HP and hits needed to KO)
+    - `winner`: deterministic prediction from the damage race
+      (same number of hits → the faster one wins; `null` on a full tie)
+    - `summary`: short Markdown summary of the numbers
+
+    ### Query Parameters
+    - **ai_summary** (`bool`, default `false`): ask the LLM for detailed prose
+      and return it as `summary`. The numbers and `winner` never change.
+      To show the numbers first and the prose later, call
+      `POST /ai/compare/summary`, which streams the prose.
+    - **trials** (`int`, 0–100000, default `0`): also run that many Monte
+      Carlo battles and return `simulation` (win/draw probabilities with a
+      95% Wilson interval). See `POST /battles/simulate` for many pairs.
 
     ### Request Body
     Example:
@@ -311,19 +329,23 @@ def compare(req: CompareRequest):
     ### Successful Response Example
     ```json
     {
-        "summary": "### Detailed Comparison Summary...",
-        "winner": "charizard",
+        "summary": "**charizard** hits for 1x ...",
+        "winner": "blastoise",
         "a": {...},
-        "b": {...}
+        "b": {...},
+        "stat_deltas": {...},
+        "type_effectiveness": {...},
+        "speed": {...},
+        "battle": {...}
     }
     ```
 
     ### Error Cases
-    #### 400 — Pokémon not found
+    #### 404 — Pokémon not found
     Occurs if either `pokemon_a` or `pokemon_b` is invalid.
 
     ```json
-    { "detail": "Pokemon 'xyz' not found" }
+    { "detail": "One of the Pokémon could not be found" }
     ```
 
     #### 422 — Bad request
@@ -343,42 +365,98 @@ def compare(req: CompareRequest):
     Missing or invalid token.
 
     ### Notes
-    - Analysis is generated dynamically using AI.
     - Summary is Markdown-ready.
-    - Winner may differ from summary emphasis (AI reasoning).
+    - The damage race is a simplified model (one 80-power move, no items,
+      abilities or random rolls); it is meant for quick, consistent predictions.
     """
-    return compare_pokemon(req)
+    return compare_pokemon(req, ai_summary=ai_summary, trials=trials)
+
+
+@router.post(
+    "/compare/summary",
+    summary="Stream the AI prose for a Pokémon comparison",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Markdown prose streamed as plain text",
+            "content": {"text/plain": {"example": "### Charizard vs Blastoise\n\nBlastoise's Water STAB..."}}
+        },
+        404: {
+            "description": "One of the Pokémon could not be found",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "One of the Pokémon could not be found"}
+                }
+            }
+        },
+        502: {
+            "description": "The AI request could not be started",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "AI summary unavailable, try again later"}
+                }
+            }
+        },
+        503: {
+            "description": "AI is not configured on this server",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "AI summary unavailable (OPENAI_API_KEY not configured)"}
+                }
+            }
+        }
+    }
+)
+def compare_summary(req: CompareRequest):
+    """
+    Stream the LLM's detailed comparison prose.
+
+    Same body as `POST /ai/compare`. The LLM receives the numeric comparison
+    (including the predicted winner) and the text is streamed as it is
+    generated, so clients can render `/ai/compare` instantly and fill in the
+    prose afterwards.
+
+    ### Errors
+    - **404** — One of the Pokémon could not be found.
+    - **502** — The AI request failed before any text was sent.
+    - **503** — No OpenAI API key is configured.
+    - If the AI fails after streaming has started, the status is already
+      `200`, so the text ends with a line starting with `**Error:**`.
+    """
+    return StreamingResponse(stream_compare_summary(req), media_type="text/plain; charset=utf-8")
 
 @router.post(
     "/recommendations",
-    summary="Get personalized Pokémon recommendations using AI",
+    summary="Get personalized Pokémon recommendations for your collection",
     responses={
         200: {
-            "description": "AI-generated recommendations based on the user's collection",
+            "description": "Recommendations that fill the type and stat gaps of the user's collection",
             "content": {
                 "application/json": {
                     "example": {
-                        "summary": "Your team contains a broad mix of types, including strong representation of Steel, Flying, Ghost...",
+                        "summary": "Your 12 Pokémon hit 14/18 types super-effectively; biggest defensive gaps: ground, ice, rock; lowest stat vs the dex average: speed.",
                         "recommendations": [
                             {
-                                "id": None,
-                                "name": "Tapu Fini",
-                                "sprite": None,
-                                "types": [],
-                                "reason": "Water/Fairy typing gives a strong answer..."
-                            },
-                            {
-                                "id": 10008,
-                                "name": "rotom-heat",
-                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/10008.png",
-                                "types": ["electric", "fire"],
-                                "reason": "Electric/Fire typing offers immunity..."
+                                "id": 823,
+                                "name": "corviknight",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/823.png",
+                                "types": ["flying", "steel"],
+                                "score": 1.2431,
+                                "reason": "Adds super-effective STAB vs ice, rock, fairy; resists ground, rock; BST 495"
                             }
                         ]
                     }
                 }
             }
         },
+        400: {
+            "description": "Empty collection",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "You must have at least 1 Pokémon in your collection"}
+                }
+            }
+        },
         401: {
             "description": "Unauthorized",
             "content": {
@@ -390,6 +468,8 @@ def compare(req: CompareRequest):
     }
 )
 def ai_recommendations(
+    limit: int = Query(5, ge=1, le=20, description="Number of recommendations."),
+    rerank: bool = Query(False, description="Let the LLM reorder and explain the local candidates."),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -405,15 +485,18 @@ def ai_recommendations(
     - offensive versatility
     - redundancy reduction
 
-    The AI considers:
-    - type weaknesses and resistances
-    - role distribution (tank, sweeper, support, pivot)
-    - stat spreads
-    - dual-type synergy
-    - hazards and support options
+    Every Pokémon in the local Pokédex that the user does not own (default
+    forms only) is scored in one vectorized pass by:
+    - new offensive coverage (super-effective STAB the collection lacks)
+    - resistances to the types the collection is most weak to
+    - strong stats where the collection is below the dex average
+    - base stat total
 
-    Returned recommendations may include Pokémon outside the user’s current roster.
-    Some recommendations may lack valid IDs or sprites (e.g., special forms or non-standard entries).
+    ### Query Parameters
+    - **limit** (`int`, 1–20, default `5`): number of recommendations.
+    - **rerank** (`bool`, default `false`): send the top `3 × limit` local
+      candidates to the LLM to reorder and explain. The LLM can only pick from
+      that list; if it fails, the local ranking is returned.
 
     ### Response Format
     ```json
@@ -425,13 +508,17 @@ def ai_recommendations(
           "name": "corviknight",
           "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/823.png",
           "types": ["flying", "steel"],
-          "reason": "Steel/Flying type improves bulk and hazard control..."
+          "score": 1.2431,
+          "reason": "Adds super-effective STAB vs ice, rock, fairy; resists ground, rock; BST 495"
         }
       ]
     }
     ```
 
     ### Error Responses
+    #### 400 Bad Request
+    The collection is empty.
+
     #### 401 Unauthorized
     Returned when no valid token is provided:
     ```json
@@ -439,22 +526,22 @@ def ai_recommendations(
     ```
 
     ### Notes
-    - Recommendations are AI-generated and may include non-canonical variants.
-    - Invalid or missing Pokémon (id=null) should be filtered in the frontend.
-    - The analysis summary is designed for natural-language display.
+    - Recommendations always reference real Pokémon from the local Pokédex.
+    - `score` is the local ranking score (higher is better).
+    - Returns 503 if the local Pokédex dataset has not been built.
     """
-    return recommend_for_user(db, current_user.id)
+    return recommend_for_user(db, current_user.id, limit=limit, rerank=rerank)
 
 @router.post(
     "/auto-team",
-    summary="Generate an optimal Pokémon team using AI",
+    summary="Generate an optimal Pokémon team from your collection",
     responses={
         200: {
-            "description": "AI-generated balanced team based on the user's collection",
+            "description": "Balanced team selected from the user's collection",
             "content": {
                 "application/json": {
                     "example": {
-                        "summary": "This team covers a variety of types and ensures both offensive and defensive capabilities.",
+                        "summary": "Hits 17/18 types super-effectively; shared weaknesses: ice. Average BST 534.5.",
                         "team": [
                             {
                                 "id": 445,
@@ -469,13 +556,21 @@ def ai_recommendations(
                                     "special_defense": 85,
                                     "speed": 102
                                 },
-                                "reason": "Garchomp is a versatile Dragon/Ground type with powerful offensive and defensive stats."
+                                "reason": "Super-effective STAB vs fire, electric, poison, rock; resists fire, poison, rock, electric; BST 600"
                             }
                         ]
                     }
                 }
             }
         },
+        400: {
+            "description": "Empty collection, or none of its Pokémon are in the local Pokédex",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Collection is empty. Cannot build a team."}
+                }
+            }
+        },
         401: {
             "description": "Unauthorized",
             "content": {
@@ -487,30 +582,36 @@ def ai_recommendations(
     }
 )
 def ai_auto_team(
+    ai_summary: bool = Query(False, description="Ask the LLM to write the team summary (selection is always local)."),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Generate a fully-optimized Pokémon team using AI.
+    Generate a fully-optimized Pokémon team from the user's collection.
 
     ### Description
     This endpoint analyzes the user's entire collection and automatically selects
     the best possible combination of **six Pokémon** to form a balanced and powerful team.
 
-    The AI ensures:
-    - ✅ Type coverage  
-    - ✅ Offensive/defensive balance  
-    - ✅ Synergy between teammates  
-    - ✅ Reduced redundancy (avoid too many of the same type)  
-    - ✅ Strong overall stats and role distribution  
-    - ✅ Compatibility for typical battle scenarios  
+    The selection runs locally (beam search over per-Pokémon type bitmasks and
+    stats from the local Pokédex dataset) and optimizes for:
+    - ✅ Offensive type coverage (super-effective STAB)  
+    - ✅ Resistances across the team  
+    - ✅ Few shared weaknesses (especially ones nobody resists)  
+    - ✅ Strong overall stats  
+    - ✅ Physical/special attack balance  
 
     Returned results include:
     - Pokémon ID  
     - Official sprite URL  
     - Types  
     - Stats (hp, attack, defense, special stats, speed)  
-    - AI reasoning explaining why each Pokémon was chosen  
+    - A short reason for each pick  
+
+    ### Query Parameters
+    - **ai_summary** (`bool`, default `false`): let the LLM write the
+      `summary` text. The team itself never depends on the LLM; if the call
+      fails, the deterministic summary is returned.
 
     ### Response Format
     ```json
@@ -523,7 +624,7 @@ def ai_auto_team(
           "sprite": "https://.../445.png",
           "types": ["dragon", "ground"],
           "stats": {...},
-          "reason": "Why the AI picked this Pokémon"
+          "reason": "Why this Pokémon was picked"
         }
       ]
     }
@@ -531,8 +632,8 @@ def ai_auto_team(
 
     ### Notes
     - The validation ensures the user has a valid session (401 otherwise).
-    - All selected Pokémon MUST exist in the PokeAPI (invalid items are filtered automatically).
-    - If the user has fewer than 6 Pokémon in their collection, the AI still builds the best team possible.
+    - Only Pokémon from the user's collection can be selected.
+    - If the user has fewer than 6 Pokémon in their collection, all of them are returned.
 
     ### Errors
     #### 401 Unauthorized
@@ -542,7 +643,7 @@ def ai_auto_team(
     ```
 
     """
-    return build_auto_team(db, current_user.id)
+    return build_auto_team(db, current_user.id, ai_summary=ai_summary)
 
 
 @router.get(
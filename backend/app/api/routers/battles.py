@@ -0,0 +1,101 @@
+from fastapi import APIRouter, HTTPException
+
+from app.domain.models.battle import BattleSimBatchRequest, BattleSimBatchResult
+from app.domain.services import battle_sim_service
+
+router = APIRouter(prefix="/battles", tags=["Battles"])
+
+MAX_PAIRS = 500
+# pares x ensayos por request (1.5-2 s de CPU en un núcleo)
+MAX_SIMULATIONS = 5_000_000
+
+
+@router.post(
+    "/simulate",
+    response_model=BattleSimBatchResult,
+    response_model_exclude_none=True,
+    summary="Monte Carlo battle simulation for many Pokémon pairs",
+    description="Simulates 1 vs 1 battles locally (base stats, types and a simplified damage formula). No AI.",
+    responses={
+        200: {
+            "description": "Win probabilities per pair",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "trials": 1000,
+                        "results": [
+                            {
+                                "pokemon_a": "charizard",
+                                "pokemon_b": "blastoise",
+                                "winner": "blastoise",
+                                "simulation": {
+                                    "trials": 1000,
+                                    "a_win_probability": 0.002,
+                                    "b_win_probability": 0.998,
+                                    "draw_probability": 0.0,
+                                    "confidence": 0.95,
+                                    "a_win_interval": [0.0005, 0.0073]
+                                }
+                            },
+                            {
+                                "pokemon_a": "pikachu",
+                                "pokemon_b": "notapokemon",
+                                "error": "Pokémon not found"
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Too many pairs, or pairs x trials above the limit",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "At most 500 pairs per request"}
+                }
+            }
+        }
+    }
+)
+def simulate(req: BattleSimBatchRequest):
+    """
+    Simulate many 1 vs 1 battles in one call.
+
+    ### Model
+    - Level 50, IV 31, no EVs, neutral nature
+    - Each side uses one 80-power move: its best STAB type (or a neutral
+      move if that is better), physical or special, whichever hits harder
+    - Every hit rolls damage in [0.85, 1.0] and can crit (1/24, x1.5)
+    - The faster Pokémon attacks first; speed ties are a coin flip
+    - No KO within 64 hits counts as a draw
+
+    All trials for all pairs run as one vectorized NumPy pass (split across
+    a shared pool of worker processes for the largest requests).
+
+    ### Request Body
+    ```json
+    {
+      "pairs": [{"pokemon_a": "charizard", "pokemon_b": "blastoise"}],
+      "trials": 1000,
+      "seed": 42
+    }
+    ```
+    - **trials** (1–100000, default 1000): battles per pair.
+    - At most 500 pairs and **5,000,000** battles in total (`pairs × trials`)
+      per request; larger requests get a **400**.
+    - **seed** (optional): fixes the random stream for reproducible results.
+
+    ### Response
+    One item per pair, in order, with `winner` (higher win probability,
+    omitted on an exact tie) and `simulation`: win/draw probabilities and a
+    95% Wilson interval for `a_win_probability`. Pairs with an unknown
+    Pokémon carry `error` instead.
+    """
+    if len(req.pairs) > MAX_PAIRS:
+        raise HTTPException(400, f"At most {MAX_PAIRS} pairs per request")
+    if len(req.pairs) * req.trials > MAX_SIMULATIONS:
+        raise HTTPException(400, f"At most {MAX_SIMULATIONS} battles per request (pairs x trials)")
+    results = battle_sim_service.simulate_batch(
+        [(p.pokemon_a, p.pokemon_b) for p in req.pairs], req.trials, req.seed
+    )
+    return {"trials": req.trials, "results": results}
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query
 from sqlalchemy.orm import Session
 from app.core.dependencies import get_current_user
 from app.infra.db import get_db
-from app.domain.services import collection_service
+from app.domain.models.collection import CollectionBulkRequest, CollectionBulkResult, CounterResult
+from app.domain.services import collection_service, counter_service
 from app.infra.orm import User
 
 router = APIRouter(prefix="/collection", tags=["Collection"])
@@ -229,4 +230,171 @@ def remove_collection(
     - Pokémon IDs must be numeric and ≥ 1.
     - The operation is idempotent. If already removed, it returns an error **404**.
     """
-    return collection_service.remove_from_collection(db, current_user.id, pokemon_id)
\ No newline at end of file
+    return collection_service.remove_from_collection(db, current_user.id, pokemon_id)
+
+@router.post(
+    "/bulk",
+    response_model=CollectionBulkResult,
+    summary="Add and remove many Pokémon in one request",
+    responses={
+        200: {
+            "description": "Changes applied; one outcome per ID",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "added": 2,
+                        "removed": 1,
+                        "items": [
+                            {"pokemon_id": 25, "action": "add", "status": "added"},
+                            {"pokemon_id": 6, "action": "add", "status": "already_present"},
+                            {"pokemon_id": 149, "action": "add", "status": "added"},
+                            {"pokemon_id": 14, "action": "remove", "status": "removed"},
+                            {"pokemon_id": 999, "action": "remove", "status": "not_found"}
+                        ]
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "An ID appears in both lists, or is not positive",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "IDs in both add and remove: 25"}
+                }
+            },
+        },
+        401: {
+            "description": "Unauthorized — missing or invalid access token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            },
+        },
+    },
+)
+def bulk_collection(
+    data: CollectionBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Add and remove many Pokémon from the authenticated user's collection at once.
+
+    ## Description
+    Meant for importing results (recommendations, vision matches, a whole
+    list) without calling `/collection/add/{id}` once per Pokémon.
+
+    ## Request Body
+    ```json
+    {
+      "add": [25, 6, 149],
+      "remove": [14, 999]
+    }
+    ```
+
+    - Up to **1000** IDs per list; repeated IDs are applied once.
+    - An ID cannot appear in both lists.
+
+    ## Behavior
+    - Both lists are applied in a single transaction: one
+      `INSERT ... ON CONFLICT DO NOTHING` for `add` and one `DELETE ... IN`
+      for `remove`.
+    - Pokémon already in the collection are not an error: they come back
+      as `already_present`. IDs that were not there to remove come back as
+      `not_found`.
+
+    ## Returns
+    - `added` / `removed`: how many rows actually changed.
+    - `items`: one outcome per distinct ID, adds first, in request order.
+
+    ## Error Responses
+    - **400** — An ID is in both lists or is not ≥ 1.
+    - **401 Unauthorized** — Missing or invalid token.
+    - **422** — More than 1000 IDs in a list.
+    """
+    return collection_service.bulk_update_collection(db, current_user.id, data.add, data.remove)
+
+@router.get(
+    "/counters/{pokemon_id}",
+    response_model=CounterResult,
+    summary="Rank my Pokémon against an opponent",
+    description="Ranks the authenticated user's collection by expected performance against the given Pokémon. Computed locally, no AI.",
+    responses={
+        200: {
+            "description": "Best counters first",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "opponent": {
+                            "id": 6,
+                            "name": "charizard",
+                            "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/6.png",
+                            "types": ["fire", "flying"]
+                        },
+                        "total": 42,
+                        "items": [
+                            {
+                                "id": 9,
+                                "name": "blastoise",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/9.png",
+                                "types": ["water"],
+                                "score": 0.297,
+                                "outcome": 1,
+                                "offense": 2.0,
+                                "defense": 1.0,
+                                "faster": False
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized — invalid or missing token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        },
+        404: {
+            "description": "Opponent not found in the local Pokédex",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Pokemon '99999' not found"}
+                }
+            }
+        }
+    }
+)
+def collection_counters(
+    pokemon_id: int = Path(..., ge=1, description="Opponent Pokémon ID"),
+    limit: int = Query(10, ge=1, le=1000, description="Maximum number of counters to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Rank the Pokémon in my collection by how well they do against an opponent.
+
+    ## Description
+    Every owned Pokémon is scored against the opponent with the same
+    level-50 damage model used by `/ai/compare` and `/matchups/matrix`
+    (best STAB move, physical or special, type chart and base stats).
+    Moving first adds a small bonus. The whole collection is ranked in one
+    vectorized pass over precomputed stats, so even very large collections
+    answer in about a millisecond.
+
+    ## Fields
+    - `score`: ranking score (higher is better, roughly -1.1 to 1.1)
+    - `outcome`: `1` wins the damage race, `-1` loses, `0` full tie
+    - `offense`: best type multiplier of this Pokémon's types against the opponent
+    - `defense`: best type multiplier of the opponent's types against this Pokémon
+    - `faster`: whether it outspeeds the opponent (`null` on a speed tie)
+
+    ## Notes
+    - `total` is the number of owned Pokémon that were ranked.
+    - Owned Pokémon missing from the local Pokédex are skipped.
+    - Returns 503 if the local Pokédex dataset has not been built.
+    """
+    return counter_service.find_counters(db, current_user.id, pokemon_id, limit)
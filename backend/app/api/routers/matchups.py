@@ -0,0 +1,88 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+
+from app.domain.models.matchup import MatchupMatrixRequest, MatchupMatrixResult
+from app.domain.services import matchup_service
+
+router = APIRouter(prefix="/matchups", tags=["Matchups"])
+
+MAX_SIDE = 1000
+
+
+@router.post(
+    "/matrix",
+    response_model=MatchupMatrixResult,
+    summary="N×M matchup matrix between two lists of Pokémon",
+    description="Scores every Pokémon in `a` against every Pokémon in `b` in one vectorized pass over the type chart and stats. No AI.",
+    responses={
+        200: {
+            "description": "Matchup scores (rows = `a`, columns = `b`)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "a": [6, 9],
+                        "b": [3, 25],
+                        "unknown_ids": [],
+                        "scores": [[0.412, -0.051], [0.263, -0.338]],
+                        "outcomes": [[1, -1], [1, -1]]
+                    }
+                },
+                "application/x-ndjson": {
+                    "example": '{"a":[6,9],"b":[3,25],"unknown_ids":[]}\n'
+                               '{"id":6,"scores":[0.412,-0.051],"outcomes":[1,-1]}\n'
+                               '{"id":9,"scores":[0.263,-0.338],"outcomes":[1,-1]}\n'
+                }
+            }
+        },
+        400: {
+            "description": "Too many Pokémon on one side",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "At most 1000 Pokémon per side"}
+                }
+            }
+        },
+        503: {
+            "description": "Local Pokédex dataset not built",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Local Pokédex dataset not built (run: python -m app.infra.dex_store build)"}
+                }
+            }
+        }
+    }
+)
+def matrix(
+    req: MatchupMatrixRequest,
+    stream: bool = Query(False, description="Stream one NDJSON line per row of `a`."),
+):
+    """
+    Compute how every Pokémon in `a` fares against every Pokémon in `b`.
+
+    ### Request Body
+    ```json
+    { "a": [6, 9, 3], "b": [25, 143] }
+    ```
+    Up to 1000 IDs per side. Duplicates are ignored; unknown IDs are
+    dropped from the matrix and listed in `unknown_ids`.
+
+    ### Scores
+    Uses the same level-50 damage model as `/ai/compare`:
+    - `scores[i][j]` in (-1, 1): compares the hits each side needs to KO
+      the other. Positive favors `a[i]`, negative favors `b[j]`.
+    - `outcomes[i][j]`: `1` if `a[i]` wins the damage race, `-1` if `b[j]`
+      wins, `0` on a full tie (same hits and same speed).
+
+    ### Streaming
+    With `?stream=true` the response is `application/x-ndjson`: the first
+    line has `a`, `b` and `unknown_ids`, then one line per row of `a` with
+    `id`, `scores` and `outcomes`. Rows are computed in blocks, so large
+    matrices start arriving immediately and memory stays flat.
+    """
+    if len(req.a) > MAX_SIDE or len(req.b) > MAX_SIDE:
+        raise HTTPException(400, f"At most {MAX_SIDE} Pokémon per side")
+    if stream:
+        return StreamingResponse(
+            matchup_service.stream_matchup_matrix(req.a, req.b), media_type="application/x-ndjson"
+        )
+    return Response(content=matchup_service.matchup_matrix(req.a, req.b), media_type="application/json")
@@ -1,6 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query
-from app.domain.services import pokemon_service
-from app.domain.models.pokemon import PokemonDTO
+from typing import List, Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from app.core.http_cache import etag_matches, json_bytes_response, not_modified
+from app.domain.services import pokemon_service, dex_query_service, similar_service, stat_distribution_service
+from app.domain.models.pokemon import (
+    PokemonDTO,
+    PokemonQueryResult,
+    PokemonListPage,
+    PokemonBatchResult,
+    SimilarPokemonResult,
+    SimilarPokemonBatchResult,
+    StatDistributionResult,
+)
+
+LIST_CACHE_CONTROL = "public, max-age=3600"
+MAX_BATCH_SIZE = 500
 
 router = APIRouter(prefix="/pokedex", tags=["Pokedex"])
 
@@ -26,6 +40,12 @@ router = APIRouter(prefix="/pokedex", tags=["Pokedex"])
                             "special_attack": 50,
                             "special_defense": 50,
                             "speed": 90
+                        },
+                        "role": "special sweeper",
+                        "percentiles": {
+                            "hp": 4.9, "attack": 20.1, "defense": 7.2,
+                            "special_attack": 33.0, "special_defense": 17.6,
+                            "speed": 83.4, "bst": 9.8
                         }
                     }
                 }
@@ -34,7 +54,10 @@ router = APIRouter(prefix="/pokedex", tags=["Pokedex"])
         404: {"description": "Pokémon not found"},
     },
 )
-def get_pokemon(id_or_name: str):
+def get_pokemon(
+    id_or_name: str,
+    percentiles: bool = Query(False, description="Include dex-wide percentile ranks for each stat and the BST."),
+):
     """
     Fetch detailed information about a Pokémon.
 
@@ -63,14 +86,25 @@ def get_pokemon(id_or_name: str):
         - `special_attack`
         - `special_defense`
         - `speed`
+    - **role**: `str | null`  
+      Stat role from k-means clustering over the whole dex (e.g.
+      `"physical sweeper"`, `"special wall"`). `null` when the Pokémon is
+      not served from the local Pokédex dataset.
+    - **percentiles**: `dict | null`  
+      Only with `?percentiles=true`: percentile rank (0–100) of each base
+      stat and of the BST among every Pokémon in the local dataset
+      (ties count half). `null` without the local dataset.
 
     ## Error Handling
     - **404 Not Found**: Returned if the Pokémon does not exist.
     """
     try:
-        return pokemon_service.get_pokemon(id_or_name)
+        pokemon = pokemon_service.get_pokemon(id_or_name)
     except Exception as e:
         raise HTTPException(status_code=404, detail="Pokémon not found") from e
+    if percentiles:
+        pokemon.percentiles = stat_distribution_service.stat_percentiles(pokemon.stats.model_dump())
+    return pokemon
 
 @router.get(
     "/random",
@@ -197,4 +231,368 @@ def search(
     - Useful for autocomplete, suggestions, and fast lookup.
     - Does not return full Pokémon details—only lightweight identifiers.
     """
-    return {"items": pokemon_service.search_pokemon(query, limit=limit)}
\ No newline at end of file
+    return {"items": pokemon_service.search_pokemon(query, limit=limit)}
+
+@router.get(
+    "/query",
+    response_model=PokemonQueryResult,
+    summary="Filter and sort the Pokédex by type, generation and stats",
+    description="Evaluates type/generation/form filters and stat ranges over the local Pokédex dataset, sorts by any stat or BST and paginates.",
+    responses={
+        200: {
+            "description": "Matching Pokémon (paginated)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "total": 2,
+                        "offset": 0,
+                        "limit": 20,
+                        "items": [
+                            {
+                                "id": 150,
+                                "name": "mewtwo",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/150.png",
+                                "types": ["psychic"],
+                                "stats": {
+                                    "hp": 106,
+                                    "attack": 110,
+                                    "defense": 90,
+                                    "special_attack": 154,
+                                    "special_defense": 90,
+                                    "speed": 130
+                                }
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        400: {"description": "Invalid stat filter, type or sort field"},
+        503: {"description": "Local Pokédex dataset not built"},
+    },
+)
+def query(
+    types: List[str] = Query([], alias="type", description="Types the Pokémon must have (all of them). Repeatable."),
+    generation: int | None = Query(None, ge=1, le=9, description="Generation (1–9)."),
+    forms: Literal["all", "default", "alternate"] = Query("all", description="Default forms, alternate forms, or both."),
+    where: List[str] = Query([], description="Stat conditions like `speed>=100`. Repeatable."),
+    sort: str = Query("id", description="`id`, any stat or `bst`. Prefix with `-` for descending."),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """
+    Filter and sort the whole Pokédex in one call.
+
+    Filters are evaluated as NumPy masks over the columnar stats matrix of the
+    local dataset (`python -m app.infra.dex_store build`), so the cost does not
+    depend on PokeAPI or the cache.
+
+    ## Query Parameters
+    - **type** (`str`, repeatable): e.g. `type=fire&type=flying` → fire/flying only.
+    - **generation** (`int`): 1–9.
+    - **forms**: `all` (default), `default` or `alternate` (megas, regional forms…).
+    - **where** (`str`, repeatable): `<stat><op><value>` with `op` in
+      `>=, <=, >, <, =`. Stats: `hp`, `attack`, `defense`, `special_attack`,
+      `special_defense`, `speed`, `bst`.
+      e.g. `where=speed>=100&where=special_attack>=120`
+    - **sort**: `id` (default), any stat or `bst`; `-bst` sorts descending.
+      Ties keep Pokédex order.
+    - **offset** / **limit**: pagination (limit 1–200).
+
+    ## Returns
+    `total` matches plus the requested page of `PokemonDTO` items.
+
+    ## Error Handling
+    - **400**: malformed `where`, unknown type or sort field.
+    - **503**: the local Pokédex dataset has not been built.
+    """
+    return dex_query_service.query_pokemon(
+        types=types,
+        generation=generation,
+        forms=forms,
+        where=where,
+        sort=sort,
+        offset=offset,
+        limit=limit,
+    )
+
+
+@router.get(
+    "/list",
+    response_model=PokemonListPage,
+    summary="Browse the Pokédex page by page",
+    description="Returns compact summaries (id, name, sprite, types) from the local Pokédex dataset using keyset pagination. Pages carry an ETag and honour If-None-Match.",
+    responses={
+        200: {
+            "description": "One page of Pokémon summaries",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "total": 1302,
+                        "limit": 2,
+                        "next_after": 2,
+                        "items": [
+                            {
+                                "id": 1,
+                                "name": "bulbasaur",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/1.png",
+                                "types": ["grass", "poison"]
+                            },
+                            {
+                                "id": 2,
+                                "name": "ivysaur",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/2.png",
+                                "types": ["grass", "poison"]
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        304: {"description": "Page unchanged (If-None-Match matched the ETag)"},
+        503: {"description": "Local Pokédex dataset not built"},
+    },
+)
+def list_pokedex(
+    request: Request,
+    after: int | None = Query(None, ge=0, description="Keyset cursor: return Pokémon with id greater than this one."),
+    offset: int = Query(0, ge=0, description="Row offset, used only when `after` is not given."),
+    limit: int = Query(50, ge=1, le=200, description="Page size (1–200)."),
+):
+    """
+    Browse the Pokédex in Pokédex order, one page per request.
+
+    ## Query Parameters
+    - **after** (`int`): keyset cursor. Pass the `next_after` value of the
+      previous page to get the next one. Stable even across forms with
+      large IDs (10001+).
+    - **offset** (`int`): plain offset, only used for the first jump when no
+      cursor is available.
+    - **limit** (`int`, default=50): page size (1–200).
+
+    ## Returns
+    - **total**: number of Pokémon in the dataset
+    - **next_after**: cursor for the next page, or `null` on the last page
+    - **items**: `{id, name, sprite, types}` summaries
+
+    ## Caching
+    Every page has an `ETag` derived from the dataset fingerprint and the
+    page parameters. Send it back in `If-None-Match` to get **304 Not Modified**
+    without a body.
+    """
+    etag = pokemon_service.list_page_etag(after, offset, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag, LIST_CACHE_CONTROL)
+    body = pokemon_service.list_pokemon_page(after, offset, limit)
+    return json_bytes_response(body, etag, LIST_CACHE_CONTROL)
+
+
+@router.get(
+    "/stats/distribution",
+    response_model=StatDistributionResult,
+    summary="Dex-wide distribution of a base stat",
+    description="Histogram and summary quantiles of one base stat (or the BST) across the local Pokédex dataset. Responses carry an ETag and honour If-None-Match.",
+    responses={
+        200: {
+            "description": "Histogram buckets for the requested stat",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "stat": "speed",
+                        "total": 1302,
+                        "summary": {"min": 5, "max": 200, "mean": 70.4, "p10": 35, "p25": 50, "p50": 70, "p75": 90, "p90": 108},
+                        "buckets": [
+                            {"min": 5, "max": 44, "count": 251},
+                            {"min": 45, "max": 84, "count": 589},
+                            {"min": 85, "max": 124, "count": 414},
+                            {"min": 125, "max": 164, "count": 44},
+                            {"min": 165, "max": 204, "count": 4}
+                        ]
+                    }
+                }
+            }
+        },
+        304: {"description": "Distribution unchanged (If-None-Match matched the ETag)"},
+        400: {"description": "Unknown stat"},
+        503: {"description": "Local Pokédex dataset not built"},
+    },
+)
+def stat_distribution(
+    request: Request,
+    stat: str = Query("bst", description="One of `hp, attack, defense, special_attack, special_defense, speed, bst`."),
+    buckets: int = Query(20, ge=1, le=100, description="Number of histogram buckets (1–100)."),
+):
+    """
+    Distribution of a base stat over the whole local Pokédex.
+
+    ## Query Parameters
+    - **stat** (`str`, default=`bst`): base stat key or `bst`.
+    - **buckets** (`int`, default=20): number of equal-width buckets between
+      the minimum and the maximum value. Trailing empty buckets past the
+      maximum are dropped.
+
+    ## Returns
+    - **total**: number of Pokémon in the dataset
+    - **summary**: `min`, `max`, `mean` and the 10/25/50/75/90th percentiles
+    - **buckets**: `{min, max, count}` with inclusive bounds
+
+    ## Caching
+    Computed from presorted per-stat arrays (no scan per request) and
+    cached per dataset. The `ETag` changes only when the dataset is rebuilt.
+    """
+    etag = stat_distribution_service.distribution_etag(stat, buckets)
+    if etag_matches(request, etag):
+        return not_modified(etag, LIST_CACHE_CONTROL)
+    body = stat_distribution_service.stat_distribution(stat, buckets)
+    return json_bytes_response(body, etag, LIST_CACHE_CONTROL)
+
+
+@router.get(
+    "/batch",
+    response_model=PokemonBatchResult,
+    summary="Get many Pokémon in one request",
+    description="Resolves a comma-separated list of IDs or names, in order, with per-item errors and optional sparse fields.",
+    responses={
+        200: {
+            "description": "One entry per requested key, in request order",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "items": [
+                            {
+                                "key": "25",
+                                "data": {
+                                    "id": 25,
+                                    "name": "pikachu",
+                                    "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/25.png"
+                                },
+                                "error": None
+                            },
+                            {"key": "missingno", "data": None, "error": "Pokémon not found"}
+                        ]
+                    }
+                }
+            }
+        },
+        400: {"description": "Too many keys or unknown field"},
+    },
+)
+def batch(
+    ids: str = Query(..., min_length=1, description="Comma-separated IDs or names, e.g. `1,4,pikachu`."),
+    fields: str | None = Query(None, description="Comma-separated subset of `id,name,sprite,types,stats,role`."),
+):
+    """
+    Fetch up to 500 Pokémon in a single round trip.
+
+    ## Query Parameters
+    - **ids** (`str`, required): comma-separated IDs and/or names. Order and
+      duplicates are preserved in the response.
+    - **fields** (`str`, optional): sparse fieldset, e.g. `fields=id,name,sprite`.
+      All fields are returned when omitted.
+
+    ## Returns
+    `items`: one entry per key with:
+    - **key**: the key as requested
+    - **data**: the Pokémon (restricted to `fields`), or `null`
+    - **error**: `null`, or the reason the key could not be resolved
+
+    ## Notes
+    - Keys are resolved from the local Pokédex dataset and the cache first;
+      only the misses go to PokeAPI, concurrently.
+    - A missing Pokémon does not fail the whole request.
+    """
+    keys = [k.strip() for k in ids.split(",") if k.strip()]
+    if len(keys) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Too many ids (max {MAX_BATCH_SIZE})")
+
+    field_list = None
+    if fields:
+        field_list = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in field_list if f not in PokemonDTO.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    return {"items": pokemon_service.get_pokemon_batch(keys, field_list)}
+
+
+@router.get(
+    "/similar",
+    response_model=SimilarPokemonBatchResult,
+    summary="Similar Pokémon for many Pokémon at once",
+    description="Batch variant of `/pokedex/{id_or_name}/similar`: one vectorized pass for all requested Pokémon.",
+    responses={
+        400: {"description": "Too many ids or invalid metric"},
+        503: {"description": "Local Pokédex dataset not built"},
+    },
+)
+def similar_batch(
+    ids: str = Query(..., min_length=1, description="Comma-separated IDs or names."),
+    k: int = Query(10, ge=1, le=100, description="Neighbours per Pokémon (1–100)."),
+    metric: Literal["cosine", "euclidean"] = Query("cosine"),
+    type_weight: float = Query(similar_service.DEFAULT_TYPE_WEIGHT, ge=0.0, le=1.0, description="Weight of type overlap in the blended score."),
+):
+    """
+    Compute "Pokémon like this one" for a list of Pokémon in a single request.
+
+    Returns one `{key, data, error}` entry per requested key, in order; `data`
+    has the same shape as `/pokedex/{id_or_name}/similar`.
+    """
+    keys = [key.strip() for key in ids.split(",") if key.strip()]
+    if len(keys) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Too many ids (max {MAX_BATCH_SIZE})")
+    return {"items": similar_service.similar_pokemon_batch(keys, k, metric, type_weight)}
+
+
+@router.get(
+    "/{id_or_name}/similar",
+    response_model=SimilarPokemonResult,
+    summary="Find Pokémon similar to this one",
+    description="Ranks the whole Pokédex by base-stat similarity (cosine or Euclidean over standardized stats) blended with type overlap.",
+    responses={
+        200: {
+            "description": "Nearest neighbours, best first",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "pokemon": {"id": 6, "name": "charizard", "sprite": "...", "types": ["fire", "flying"]},
+                        "metric": "cosine",
+                        "items": [
+                            {
+                                "id": 146,
+                                "name": "moltres",
+                                "sprite": "...",
+                                "types": ["fire", "flying"],
+                                "score": 0.9512,
+                                "stat_similarity": 0.935,
+                                "type_overlap": 1.0
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        404: {"description": "Pokémon not found"},
+        503: {"description": "Local Pokédex dataset not built"},
+    },
+)
+def similar(
+    id_or_name: str,
+    k: int = Query(10, ge=1, le=100, description="Number of neighbours (1–100)."),
+    metric: Literal["cosine", "euclidean"] = Query("cosine"),
+    type_weight: float = Query(similar_service.DEFAULT_TYPE_WEIGHT, ge=0.0, le=1.0, description="Weight of type overlap in the blended score."),
+):
+    """
+    "Pokémon like this one", without an LLM round trip.
+
+    ## Scoring
+    - Base stats are standardized per stat (z-score over the whole dex).
+    - **cosine** compares the *shape* of the stat spread; **euclidean**
+      also penalizes differences in overall power. Both are mapped to `[0, 1]`.
+    - **type_overlap** is the Jaccard index of both type sets.
+    - `score = (1 - type_weight) * stat_similarity + type_weight * type_overlap`
+
+    ## Notes
+    - With the default `type_weight` and `k <= 50` the answer comes from a
+      precomputed top-k table; otherwise it is computed on the fly.
+    """
+    return similar_service.similar_pokemon(id_or_name, k, metric, type_weight)
@@ -1,22 +1,33 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user
+from app.core.http_cache import etag_matches, json_bytes_response, not_modified
 from app.infra.db import get_db
 from app.infra.orm import User
-from app.domain.services import team_service
+from app.domain.services import team_service, team_transfer_service
 from app.domain.models.team import (
     TeamCreateDTO,
     TeamRenameDTO,
+    TeamMembersDTO,
+    TeamOrderDTO,
     TeamSummaryDTO,
     TeamDetailDTO,
+    TeamAnalysisDTO,
+    TournamentResultDTO,
+    TournamentScheduledDTO,
+    TeamImportResultDTO,
 )
 
 
 router = APIRouter(prefix="/teams", tags=["Teams"])
 
+# el detalle es privado; el cliente revalida siempre con If-None-Match
+TEAM_CACHE_CONTROL = "private, no-cache"
+
 @router.post(
     "",
     response_model=TeamDetailDTO,
@@ -138,6 +149,8 @@ def create_team(
     }
 )
 def list_my_teams(
+    after: int | None = Query(None, ge=1, description="Keyset cursor: return Teams older than the Team with this id."),
+    limit: int | None = Query(None, ge=1, le=200, description="Page size. Omit to get every Team."),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -156,6 +169,13 @@ def list_my_teams(
     Requires a valid Bearer token.  
     If missing or invalid → **401 Unauthorized**
 
+    ## Query Parameters
+    - **limit** (`int`, 1–200, optional): page size. Without it every Team
+      is returned, as before.
+    - **after** (`int`, optional): keyset cursor. Pass the `id` of the last
+      Team of the previous page to get the next one. An empty list means
+      there are no more Teams.
+
     ## Response Example
 
     ```json
@@ -183,9 +203,248 @@ def list_my_teams(
 
     ## Notes
     - Teams are sorted by creation date descending (newest first).
+    - Member counts come from a single grouped query, so the cost does not
+      grow with the number of Teams.
     - Useful for displaying all existing teams in the frontend.
     """
-    return team_service.list_teams(db, current_user.id)
+    return team_service.list_teams(db, current_user.id, after=after, limit=limit)
+
+
+@router.get(
+    "/tournament",
+    response_model=TournamentResultDTO,
+    summary="Round-robin tournament between my Teams",
+    responses={
+        200: {
+            "description": "Standings after every team played every other team",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "teams": 3,
+                        "matches": 3,
+                        "computed": 2,
+                        "cached": 1,
+                        "skipped": [12],
+                        "standings": [
+                            {"team_id": 5, "name": "Rain Team", "played": 2, "wins": 2, "draws": 0, "losses": 0, "points": 6, "margin": 0.4123},
+                            {"team_id": 7, "name": "Sun Team", "played": 2, "wins": 1, "draws": 0, "losses": 1, "points": 3, "margin": -0.0511},
+                            {"team_id": 9, "name": "Trick Room", "played": 2, "wins": 0, "draws": 0, "losses": 2, "points": 0, "margin": -0.3612}
+                        ]
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - Invalid or missing token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        }
+    }
+)
+def tournament(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Simulate every one of my Teams against every other one.
+
+    ## Model
+    Uses the local level-50 damage model (no AI). For team A vs team B,
+    each side's "answer" is the average, over the opposing members, of its
+    best member's matchup score against that member. The match value is
+    `(answer A - answer B) / 2`, in (-1, 1): positive means A wins.
+
+    ## Standings
+    - Win = 3 points, draw = 1, loss = 0
+    - `margin` is the sum of match values (tie-breaker)
+    - Teams with no members in the local Pokédex are listed in `skipped`
+
+    ## Caching
+    Every match is stored in the database by the roster hash of both teams,
+    so results are shared by all server workers (and by users with the same
+    rosters). When a team changes, only its matches are recomputed;
+    `computed` and `cached` tell how many matches were played now and how
+    many were already stored. Use `POST /teams/tournament` to compute them
+    in the background.
+    """
+    return team_service.get_tournament(db, current_user.id)
+
+
+@router.post(
+    "/tournament",
+    response_model=TournamentScheduledDTO,
+    status_code=202,
+    summary="Recompute the tournament in the background",
+    responses={
+        202: {
+            "description": "Tournament scheduled",
+            "content": {
+                "application/json": {
+                    "example": {"scheduled": True, "teams": 3}
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - Invalid or missing token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        }
+    }
+)
+def schedule_tournament(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Schedule a tournament run after the response is sent.
+
+    Only matches whose rosters changed are recomputed, and the results are
+    saved to the database. Call this after editing teams; a later
+    `GET /teams/tournament` on any server worker then reads them instead of
+    playing the matches again.
+    """
+    return team_service.schedule_tournament(db, current_user.id, background_tasks)
+
+
+@router.get(
+    "/export",
+    summary="Export all my Teams (Showdown text or NDJSON)",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Every Team of the user, streamed in batches",
+            "content": {
+                "text/plain": {
+                    "example": "=== MightyTeam ===\n\nDragonite\n\nPikachu\n\n"
+                },
+                "application/x-ndjson": {
+                    "example": '{"id":1,"name":"MightyTeam","members":[{"id":149,"name":"dragonite","slot":1}]}\n'
+                }
+            }
+        },
+        400: {
+            "description": "Unknown format",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Unknown format (use one of: showdown, ndjson)"}
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - Invalid or missing token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        }
+    }
+)
+def export_teams(
+    format: str = Query("showdown", description="`showdown` (teambuilder text) or `ndjson` (one Team per line)."),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export every Team of the authenticated user.
+
+    ## Formats
+    - **showdown** (default, `text/plain`): the Pokémon Showdown teambuilder
+      export. One `=== Name ===` header per Team and one species per block,
+      ready to paste into Showdown.
+    - **ndjson** (`application/x-ndjson`): one JSON object per line with
+      `id`, `name` and `members` (`id`, `name`, `slot`), in slot order.
+
+    ## Notes
+    - Teams are streamed in batches of 200, oldest first, so accounts with
+      hundreds of Teams do not need to be loaded in memory at once.
+    - The output of either format can be sent back to `POST /teams/import`.
+    """
+    chunks = team_transfer_service.stream_export(db, current_user.id, format)
+    media_type = "text/plain; charset=utf-8" if format == "showdown" else "application/x-ndjson"
+    return StreamingResponse(chunks, media_type=media_type)
+
+
+@router.post(
+    "/import",
+    response_model=TeamImportResultDTO,
+    summary="Import many Teams at once (Showdown text or NDJSON)",
+    responses={
+        200: {
+            "description": "Teams created; per-Team notes about names that were not imported",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "created": 2,
+                        "teams": [
+                            {"id": 7, "name": "MightyTeam", "count": 6, "unresolved": [], "skipped": []},
+                            {"id": 8, "name": "Rain", "count": 2, "unresolved": ["missingno"], "skipped": ["kyogre"]}
+                        ]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Nothing to import, malformed NDJSON or too many Teams",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid NDJSON on line 3"}
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - Invalid or missing token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        },
+        503: {
+            "description": "Local Pokédex dataset not built (names are resolved locally)",
+        }
+    }
+)
+def import_teams(
+    body: str = Body(..., media_type="text/plain", description="Showdown export text or NDJSON lines."),
+    format: str = Query("showdown", description="`showdown` or `ndjson`."),
+    add_to_collection: bool = Query(False, description="Add imported Pokémon missing from the collection instead of skipping them."),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create many Teams from a single request.
+
+    ## Body (`text/plain`)
+    - **showdown**: the teambuilder export text. Each `=== [format] Name ===`
+      header starts a Team; only the species of each set is used (nickname,
+      gender, item, moves and EVs are ignored). Text without headers is
+      imported as one Team.
+    - **ndjson**: one object per line,
+      `{"name": "Rain", "members": ["pelipper", 186, {"id": 134}]}`.
+      The NDJSON export of `GET /teams/export` is accepted as-is.
+
+    ## Behavior
+    - Names are resolved against the local Pokédex (`Mr. Mime` → `mr-mime`).
+    - Each Team keeps up to **6** distinct Pokémon; extras go to `skipped`.
+    - Pokémon missing from the user's collection are skipped, unless
+      `add_to_collection=true`, which adds them to the collection first.
+    - Everything is written in one transaction with one batched `INSERT`
+      per table, up to 1000 Teams per request.
+
+    ## Response
+    - **created**: number of Teams created.
+    - **teams[]**: `id`, `name`, `count` of members imported, `unresolved`
+      names and `skipped` Pokémon.
+    """
+    return team_transfer_service.import_teams(db, current_user.id, body, format, add_to_collection)
 
 
 @router.get(
@@ -243,6 +502,9 @@ def list_my_teams(
                 }
             }
         },
+        304: {
+            "description": "Not modified — `If-None-Match` matches the current ETag",
+        },
         401: {
             "description": "Unauthorized - Invalid or missing token",
             "content": {
@@ -262,6 +524,7 @@ def list_my_teams(
     }
 )
 def get_team(
+    request: Request,
     team_id: int = Path(..., description="ID of the Team to retrieve"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -292,11 +555,112 @@ def get_team(
     }
     ```
 
+    ### Caching
+    - The response carries an `ETag` built from the Team's version, which is
+      bumped by every rename and roster change.
+    - Send it back in `If-None-Match` to get **304 Not Modified** without a
+      body; the check only reads the version, not the members.
+    - The serialized detail is cached per version, so unchanged Teams are
+      served without rebuilding it.
+
     ### Errors
     - **401 Unauthorized:** Missing or invalid token.
     - **404 Not Found:** Team does not exist or belongs to another user.
     """
-    return team_service.get_team(db, current_user.id, team_id)
+    etag = team_service.team_etag(db, current_user.id, team_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, TEAM_CACHE_CONTROL)
+    body = team_service.team_detail_bytes(db, current_user.id, team_id, etag)
+    return json_bytes_response(body, etag, TEAM_CACHE_CONTROL)
+
+
+@router.get(
+    "/{team_id}/analysis",
+    response_model=TeamAnalysisDTO,
+    summary="Analyze a Team's type coverage and stats",
+    responses={
+        200: {
+            "description": "Deterministic team analysis",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "team_id": 1,
+                        "members": [143, 144, 145],
+                        "unknown_ids": [],
+                        "offense": {
+                            "best_multiplier": {"normal": 1.0, "fire": 1.0, "water": 2.0, "grass": 2.0},
+                            "super_effective": ["water", "grass", "ground", "flying", "bug", "dragon"],
+                            "not_covered": ["normal", "fire", "electric"]
+                        },
+                        "defense": {
+                            "weak": {"electric": 2, "rock": 3, "ice": 1},
+                            "resist": {"grass": 2, "bug": 2},
+                            "immune": {"ground": 2, "ghost": 1},
+                            "shared_weaknesses": ["electric", "rock"],
+                            "unresisted": ["fire", "water", "ice"]
+                        },
+                        "stats": {
+                            "total": {"hp": 320, "attack": 285, "defense": 250, "special_attack": 285, "special_defense": 305, "speed": 215},
+                            "average": {"hp": 106.7, "attack": 95.0, "defense": 83.3, "special_attack": 95.0, "special_defense": 101.7, "speed": 71.7},
+                            "min": {"hp": 90, "attack": 85, "defense": 65, "special_attack": 65, "special_defense": 85, "speed": 30},
+                            "max": {"hp": 160, "attack": 110, "defense": 100, "special_attack": 125, "special_defense": 125, "speed": 100},
+                            "average_bst": 553.3
+                        },
+                        "roles": {"physical sweeper": 2, "special sweeper": 1, "physical wall": 1, "bulky attacker": 2}
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - Invalid or missing token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        },
+        404: {
+            "description": "Team not found or does not belong to the current user",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Team not found"}
+                }
+            }
+        },
+        503: {"description": "Local Pokédex dataset not built"},
+    }
+)
+def get_team_analysis(
+    team_id: int = Path(..., description="ID of the Team to analyze"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Deterministic analysis of a Team, computed locally (no AI involved).
+
+    ### Behavior
+    - Only the owner of the team can request its analysis.
+    - Uses the local Pokédex dataset and the bundled type chart.
+    - Results are cached per roster: adding or removing a member produces a
+      new roster hash, so the next call recomputes it.
+
+    ### Returns
+    - **offense**: best STAB multiplier the team reaches against each type,
+      which types it hits super-effectively and which it does not cover.
+    - **defense**: how many members are weak to / resist / are immune to each
+      attacking type, the weaknesses shared by 2+ members and the attacking
+      types no member resists.
+    - **stats**: total, average, min and max of each base stat, plus the
+      average BST.
+    - **roles**: how many members fall in each stat role (k-means over the
+      whole dex; see `role` in `/pokedex/look`).
+
+    ### Errors
+    - **401 Unauthorized:** Missing or invalid token.
+    - **404 Not Found:** Team does not exist or belongs to another user.
+    - **503:** The local Pokédex dataset has not been built.
+    """
+    return team_service.get_team_analysis(db, current_user.id, team_id)
 
 
 @router.patch(
@@ -475,6 +839,7 @@ def add_member(
     ### Behavior
     - Only the owner of the team can add Pokémon.
     - Teams can contain up to **6 Pokémon**.
+    - The new member takes the lowest free slot (1–6).
     - Adding a Pokémon returns the full updated team structure.
     - Pokémon are validated to ensure they exist in the Pokédex.
 
@@ -503,10 +868,207 @@ def add_member(
     - **400 Team full** — Teams cannot exceed 6 members.
     - **401 Unauthorized** — Token invalid or missing.
     - **404 Team not found** — The team doesn't exist or doesn't belong to the user.
+    - **409** — The Pokémon is already in the team, or another request took the
+      same free slot at the same time (retry).
     """
     return team_service.add_member(db, current_user.id, team_id, pokemon_id)
 
 
+@router.put(
+    "/{team_id}/members",
+    response_model=TeamDetailDTO,
+    summary="Replace the whole roster of a Team",
+    responses={
+        200: {
+            "description": "Roster replaced successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 5,
+                        "name": "AI Squad",
+                        "count": 2,
+                        "members": [
+                            {
+                                "id": 149,
+                                "name": "dragonite",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/149.png",
+                                "types": ["dragon", "flying"]
+                            },
+                            {
+                                "id": 25,
+                                "name": "pikachu",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/25.png",
+                                "types": ["electric"]
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Duplicate IDs or Pokémon missing from the collection",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "You must have these Pokémon in your collection first: 25"}
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - missing or invalid token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        },
+        404: {
+            "description": "Team not found or not owned by user",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Team not found"}
+                }
+            }
+        },
+        422: {
+            "description": "More than 6 Pokémon in the body",
+        }
+    }
+)
+def set_members(
+    team_id: int,
+    data: TeamMembersDTO,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Replace every member of a team in one request.
+
+    ### Behavior
+    - The body lists **0 to 6** Pokémon IDs; the order is the slot order.
+    - All IDs are validated together (ownership, collection, duplicates)
+      before anything is written.
+    - The old roster is removed and the new one written in a single
+      transaction: either every member is applied or none is.
+    - Returns the full updated team, once, instead of one response per
+      member as with repeated `POST /teams/{team_id}/add/{pokemon_id}`.
+    - An empty list clears the team.
+
+    ### Request Body
+    ```json
+    {
+        "pokemon_ids": [149, 25]
+    }
+    ```
+
+    ### Errors
+    - **400** — Duplicate IDs, or Pokémon that are not in the user's
+      collection (all of them are listed in the message).
+    - **401 Unauthorized** — Token invalid or missing.
+    - **404 Team not found** — The team doesn't exist or doesn't belong to the user.
+    - **422** — More than 6 IDs.
+    """
+    return team_service.set_members(db, current_user.id, team_id, data.pokemon_ids)
+
+
+@router.patch(
+    "/{team_id}/order",
+    response_model=TeamDetailDTO,
+    summary="Reorder the members of a Team",
+    responses={
+        200: {
+            "description": "Slots updated; members are returned in slot order",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 5,
+                        "name": "AI Squad",
+                        "count": 2,
+                        "members": [
+                            {
+                                "id": 25,
+                                "name": "pikachu",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/25.png",
+                                "types": ["electric"],
+                                "slot": 1
+                            },
+                            {
+                                "id": 149,
+                                "name": "dragonite",
+                                "sprite": "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/149.png",
+                                "types": ["dragon", "flying"],
+                                "slot": 2
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "The same Pokémon or slot appears twice in the request, or a target slot is taken",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Duplicate slot in order"}
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - missing or invalid token",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid token"}
+                }
+            }
+        },
+        404: {
+            "description": "Team not found, or a Pokémon is not in the Team",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Pokemon not in this team"}
+                }
+            }
+        }
+    }
+)
+def reorder_members(
+    team_id: int,
+    data: TeamOrderDTO,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Move members of a team to new slots without removing and re-adding them.
+
+    ### Behavior
+    - The body is a small diff: only the members that move need to be sent.
+      Members not listed keep their current slot.
+    - Slots go from **1 to 6** and hold one member each. Moving into a slot
+      that is taken is only allowed if its current member is moved in the
+      same request (e.g. a swap sends both moves).
+    - All moves are applied in one transaction: if any Pokémon is not in
+      the team or a target slot stays taken, nothing changes.
+
+    ### Request Body
+    Swap the first two members:
+    ```json
+    {
+        "moves": [
+            {"pokemon_id": 25, "slot": 1},
+            {"pokemon_id": 149, "slot": 2}
+        ]
+    }
+    ```
+
+    ### Errors
+    - **400** — The same Pokémon or the same slot appears twice in `moves`,
+      or a target slot is taken by a member that is not moved.
+    - **401 Unauthorized** — Token invalid or missing.
+    - **404** — The team doesn't exist, doesn't belong to the user, or one of
+      the Pokémon is not in it.
+    """
+    moves = [(m.pokemon_id, m.slot) for m in data.moves]
+    return team_service.reorder_members(db, current_user.id, team_id, moves)
+
+
 @router.delete(
     "/{team_id}/remove/{pokemon_id}",
     response_model=TeamDetailDTO,
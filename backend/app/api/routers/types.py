@@ -0,0 +1,64 @@
+from typing import List
+
+from fastapi import APIRouter, Query
+
+from app.domain.models.types import TypeMatchupResult
+from app.domain.services import type_chart_service
+
+router = APIRouter(prefix="/types", tags=["Types"])
+
+
+@router.get(
+    "/matchup",
+    response_model=TypeMatchupResult,
+    summary="Type effectiveness against a single or dual type",
+    description="Computes damage multipliers from the bundled type chart (Gen 6+). No network calls, no AI.",
+    responses={
+        200: {
+            "description": "Multipliers for each attacking type",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "defender": ["water", "ground"],
+                        "multipliers": {"electric": 0.0, "grass": 4.0, "fire": 0.5},
+                        "weaknesses": ["grass"],
+                        "resistances": ["fire"],
+                        "immunities": ["electric"]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Unknown type, or more than two defender types",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Unknown type: 'plasma'"}
+                }
+            }
+        },
+    },
+)
+def type_matchup(
+    defender: List[str] = Query(..., description="One or two defending types. Repeatable: `defender=water&defender=ground`."),
+    attacker: List[str] = Query([], description="Attacking types to evaluate. All 18 types when omitted."),
+):
+    """
+    Look up how effective attacking types are against a type combination.
+
+    ## Query Parameters
+    - **defender** (`str`, repeatable, required): one or two types.
+    - **attacker** (`str`, repeatable, optional): restrict the answer to these
+      attacking types.
+
+    ## Returns
+    - **defender**: the normalized defending types
+    - **multipliers**: `{attacking_type: multiplier}` (0, 0.25, 0.5, 1, 2 or 4)
+    - **weaknesses**: attacking types with multiplier > 1
+    - **resistances**: attacking types with 0 < multiplier < 1
+    - **immunities**: attacking types with multiplier 0
+
+    ## Notes
+    - The chart is bundled with the backend (`app/data/type_chart.json`) and
+      loaded once per process; dual types come from a precomputed table.
+    """
+    return type_chart_service.matchup(defender, attacker)
@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     POKEAPI_RETRIES: int = 2
     
     CACHE_TTL_SECONDS: int = 60 * 60 * 12  # 12h
+
+    DEX_DATA_DIR: str | None = None  # por defecto app/data/dex
     
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL: str = "gpt-4o-mini"
@@ -10,14 +10,3 @@ class AutoTeamAIItem(BaseModel):
 class AutoTeamAIResponse(BaseModel):
     summary: str
     team: List[AutoTeamAIItem]
-
-
-# --- Final enriched models returned to frontend ---
-class AutoTeamMember(BaseModel):
-    id: int
-    reason: str
-
-
-class AutoTeamResult(BaseModel):
-    summary: str
-    team: List[AutoTeamMember]
\ No newline at end of file
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class BattleSimulation(BaseModel):
+    trials: int
+    a_win_probability: float
+    b_win_probability: float
+    draw_probability: float
+    confidence: float
+    a_win_interval: List[float]  # intervalo de Wilson para a_win_probability
+
+
+class BattlePair(BaseModel):
+    pokemon_a: str
+    pokemon_b: str
+
+
+class BattleSimBatchRequest(BaseModel):
+    pairs: List[BattlePair] = Field(..., min_length=1)
+    trials: int = Field(1000, ge=1, le=100_000)
+    seed: int | None = None
+
+
+class BattleSimBatchItem(BaseModel):
+    pokemon_a: str
+    pokemon_b: str
+    winner: str | None = None
+    simulation: BattleSimulation | None = None
+    error: str | None = None
+
+
+class BattleSimBatchResult(BaseModel):
+    trials: int
+    results: List[BattleSimBatchItem]
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+from app.domain.models.pokemon import PokemonSummaryDTO
+
+
+class CounterPick(PokemonSummaryDTO):
+    score: float
+    outcome: int          # 1 gana, 0 empate, -1 pierde (carrera de daño)
+    offense: float        # mejor multiplicador de tipo contra el rival
+    defense: float        # mejor multiplicador del rival contra este Pokémon
+    faster: bool | None   # None si empatan en velocidad
+
+
+class CounterResult(BaseModel):
+    opponent: PokemonSummaryDTO
+    total: int
+    items: List[CounterPick]
+
+
+class CollectionBulkRequest(BaseModel):
+    add: List[int] = Field([], max_length=1000)
+    remove: List[int] = Field([], max_length=1000)
+
+
+class CollectionBulkItem(BaseModel):
+    pokemon_id: int
+    action: Literal["add", "remove"]
+    status: Literal["added", "already_present", "removed", "not_found"]
+
+
+class CollectionBulkResult(BaseModel):
+    added: int
+    removed: int
+    items: List[CollectionBulkItem]
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from app.domain.models.battle import BattleSimulation
+
 class CompareRequest(BaseModel):
     pokemon_a: str
     pokemon_b: str
@@ -13,8 +15,28 @@ class ComparedPokemon(BaseModel):
     stats: dict
 
 
+class SpeedComparison(BaseModel):
+    a: int
+    b: int
+    a_tier: str
+    b_tier: str
+    faster: str | None  # nombre del más rápido, None si empatan
+
+
+class BattleEstimate(BaseModel):
+    a_damage_pct: float  # % de HP de B que quita cada golpe de A
+    b_damage_pct: float
+    a_hits_to_ko: int
+    b_hits_to_ko: int
+
+
 class CompareResponse(BaseModel):
     summary: str
     winner: str | None
     a: ComparedPokemon
-    b: ComparedPokemon
\ No newline at end of file
+    b: ComparedPokemon
+    stat_deltas: dict[str, int] = {}
+    type_effectiveness: dict[str, dict[str, float]] = {}
+    speed: SpeedComparison | None = None
+    battle: BattleEstimate | None = None
+    simulation: BattleSimulation | None = None
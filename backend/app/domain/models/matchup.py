@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class MatchupMatrixRequest(BaseModel):
+    a: List[int] = Field(..., min_length=1)
+    b: List[int] = Field(..., min_length=1)
+
+
+class MatchupMatrixResult(BaseModel):
+    a: List[int]
+    b: List[int]
+    unknown_ids: List[int]
+    scores: List[List[float]]
+    outcomes: List[List[int]]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, Dict, List
 
 class PokemonStats(BaseModel):
     hp: int = 0
@@ -14,4 +14,71 @@ class PokemonDTO(BaseModel):
     name: str
     sprite: str | None = None
     types: List[str]
-    stats: PokemonStats
\ No newline at end of file
+    stats: PokemonStats
+    role: str | None = None  # rol por stats (k-means), solo con el dex local
+    percentiles: Dict[str, float] | None = None  # solo con ?percentiles=true
+
+class PokemonQueryResult(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    items: List[PokemonDTO]
+
+
+class PokemonSummaryDTO(BaseModel):
+    id: int
+    name: str
+    sprite: str | None = None
+    types: List[str]
+
+
+class PokemonListPage(BaseModel):
+    total: int
+    limit: int
+    next_after: int | None
+    items: List[PokemonSummaryDTO]
+
+
+class PokemonBatchItem(BaseModel):
+    key: str
+    data: Dict[str, Any] | None = None
+    error: str | None = None
+
+
+class PokemonBatchResult(BaseModel):
+    items: List[PokemonBatchItem]
+
+
+class SimilarPokemonDTO(PokemonSummaryDTO):
+    score: float
+    stat_similarity: float
+    type_overlap: float
+
+
+class SimilarPokemonResult(BaseModel):
+    pokemon: PokemonSummaryDTO
+    metric: str
+    items: List[SimilarPokemonDTO]
+
+
+class SimilarPokemonBatchItem(BaseModel):
+    key: str
+    data: SimilarPokemonResult | None = None
+    error: str | None = None
+
+
+class SimilarPokemonBatchResult(BaseModel):
+    items: List[SimilarPokemonBatchItem]
+
+
+class StatBucket(BaseModel):
+    min: int
+    max: int
+    count: int
+
+
+class StatDistributionResult(BaseModel):
+    stat: str
+    total: int
+    summary: Dict[str, int | float]
+    buckets: List[StatBucket]
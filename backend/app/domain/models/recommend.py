@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List
+
+
+# --- AI structured output model (rerank de candidatos locales) ---
+class RecommendRerankItem(BaseModel):
+    name: str
+    reason: str
+
+
+class RecommendRerankResponse(BaseModel):
+    summary: str
+    recommendations: List[RecommendRerankItem]
@@ -1,5 +1,5 @@
-from typing import List
-from pydantic import BaseModel
+from typing import Dict, List
+from pydantic import BaseModel, Field
 
 class TeamCreateDTO(BaseModel):
     name: str
@@ -7,11 +7,22 @@ class TeamCreateDTO(BaseModel):
 class TeamRenameDTO(BaseModel):
     name: str
 
+class TeamMembersDTO(BaseModel):
+    pokemon_ids: List[int] = Field(..., max_length=6)
+
+class TeamSlotMoveDTO(BaseModel):
+    pokemon_id: int
+    slot: int = Field(..., ge=1, le=6)
+
+class TeamOrderDTO(BaseModel):
+    moves: List[TeamSlotMoveDTO] = Field(..., min_length=1, max_length=6)
+
 class TeamMemberDTO(BaseModel):
     id: int
     name: str
     sprite: str | None = None
     types: List[str] = []
+    slot: int | None = None
 
 class TeamSummaryDTO(BaseModel):
     id: int
@@ -23,4 +34,65 @@ class TeamDetailDTO(BaseModel):
     id: int
     name: str
     count: int
-    members: List[TeamMemberDTO]
\ No newline at end of file
+    members: List[TeamMemberDTO]
+
+class TeamOffenseDTO(BaseModel):
+    best_multiplier: Dict[str, float]
+    super_effective: List[str]
+    not_covered: List[str]
+
+class TeamDefenseDTO(BaseModel):
+    weak: Dict[str, int]
+    resist: Dict[str, int]
+    immune: Dict[str, int]
+    shared_weaknesses: List[str]
+    unresisted: List[str]
+
+class TeamStatsDTO(BaseModel):
+    total: Dict[str, int]
+    average: Dict[str, float]
+    min: Dict[str, int]
+    max: Dict[str, int]
+    average_bst: float
+
+class TeamAnalysisDTO(BaseModel):
+    team_id: int
+    members: List[int]
+    unknown_ids: List[int] = []
+    offense: TeamOffenseDTO
+    defense: TeamDefenseDTO
+    stats: TeamStatsDTO
+    roles: Dict[str, int] = {}
+
+class TournamentStandingDTO(BaseModel):
+    team_id: int
+    name: str
+    played: int
+    wins: int
+    draws: int
+    losses: int
+    points: int
+    margin: float
+
+class TournamentResultDTO(BaseModel):
+    teams: int
+    matches: int
+    computed: int
+    cached: int
+    skipped: List[int] = []
+    standings: List[TournamentStandingDTO]
+
+class TournamentScheduledDTO(BaseModel):
+    scheduled: bool
+    teams: int
+
+class TeamImportItemDTO(BaseModel):
+    id: int
+    name: str
+    count: int
+    unresolved: List[str] = []
+    skipped: List[str] = []
+
+class TeamImportResultDTO(BaseModel):
+    created: int
+    teams: List[TeamImportItemDTO]
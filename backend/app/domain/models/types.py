@@ -0,0 +1,9 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+class TypeMatchupResult(BaseModel):
+    defender: List[str]
+    multipliers: Dict[str, float]
+    weaknesses: List[str]
+    resistances: List[str]
+    immunities: List[str]
@@ -1,5 +1,7 @@
 from typing import List, Optional
 from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from app.infra.orm import CollectionItem
 
@@ -14,6 +16,24 @@ class CollectionRepository:
         self.db.refresh(item)
         return item
 
+    def _insert(self):
+        # INSERT ... ON CONFLICT solo existe en el insert de cada dialecto
+        if self.db.get_bind().dialect.name == "postgresql":
+            return pg_insert(CollectionItem)
+        return sqlite_insert(CollectionItem)
+
+    def add_many(self, user_id: int, pokemon_ids: List[int]) -> set[int]:
+        """Un INSERT ... ON CONFLICT DO NOTHING; devuelve los ids que sí se agregaron."""
+        if not pokemon_ids:
+            return set()
+        q = (
+            self._insert()
+            .values([{"user_id": user_id, "pokemon_id": pid} for pid in pokemon_ids])
+            .on_conflict_do_nothing(index_elements=["user_id", "pokemon_id"])
+            .returning(CollectionItem.pokemon_id)
+        )
+        return set(self.db.execute(q).scalars())
+
     def exists(self, user_id: int, pokemon_id: int) -> bool:
         q = select(CollectionItem.id).where(
             CollectionItem.user_id == user_id,
@@ -29,6 +49,26 @@ class CollectionRepository:
         res = self.db.execute(q)
         return res.rowcount or 0
 
+    def owned_among(self, user_id: int, pokemon_ids: List[int]) -> set[int]:
+        """Cuáles de `pokemon_ids` tiene el usuario, en una sola consulta."""
+        if not pokemon_ids:
+            return set()
+        q = select(CollectionItem.pokemon_id).where(
+            CollectionItem.user_id == user_id,
+            CollectionItem.pokemon_id.in_(pokemon_ids)
+        )
+        return set(self.db.execute(q).scalars())
+
+    def remove_many(self, user_id: int, pokemon_ids: List[int]) -> set[int]:
+        """Un solo DELETE ... IN; devuelve los ids que estaban y se borraron."""
+        if not pokemon_ids:
+            return set()
+        q = delete(CollectionItem).where(
+            CollectionItem.user_id == user_id,
+            CollectionItem.pokemon_id.in_(pokemon_ids)
+        ).returning(CollectionItem.pokemon_id)
+        return set(self.db.execute(q).scalars())
+
     def list_ids(self, user_id: int) -> List[int]:
         q = select(CollectionItem.pokemon_id).where(
             CollectionItem.user_id == user_id
@@ -1,6 +1,15 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
 
-from app.infra.orm import Team, TeamMember
+from sqlalchemy import case, delete, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+
+from app.infra.orm import CollectionItem, Team, TeamMember
+
+SNAPSHOT_COLUMNS = ("name", "sprite", "type_codes", "snapshot_fp")
+
+
+def _owned(team_id: int, user_id: int):
+    return exists().where(Team.id == team_id, Team.user_id == user_id)
 
 
 class TeamRepository:
@@ -20,51 +29,247 @@ class TeamRepository:
     def list_by_user(self, user_id: int) -> list[Team]:
         return (
             self.db.query(Team)
+            .options(selectinload(Team.members))
             .filter(Team.user_id == user_id)
-            .order_by(Team.created_at.desc())
+            .order_by(Team.id.desc())
             .all()
         )
 
+    def list_summaries(self, user_id: int, after: int | None = None, limit: int | None = None):
+        """(id, name, created_at, count) por team en una sola consulta, más nuevos primero."""
+        q = (
+            self.db.query(Team.id, Team.name, Team.created_at, func.count(TeamMember.id))
+            .outerjoin(TeamMember, TeamMember.team_id == Team.id)
+            .filter(Team.user_id == user_id)
+        )
+        # keyset: ids crecientes en el tiempo, así que id desc == created_at desc
+        if after is not None:
+            q = q.filter(Team.id < after)
+        q = q.group_by(Team.id).order_by(Team.id.desc())
+        if limit is not None:
+            q = q.limit(limit)
+        return q.all()
+
+    def iter_with_members(self, user_id: int, batch_size: int = 200):
+        """Teams del usuario con sus miembros, por lotes (keyset sobre id)."""
+        after = 0
+        while True:
+            batch = (
+                self.db.query(Team)
+                .options(selectinload(Team.members))
+                .filter(Team.user_id == user_id, Team.id > after)
+                .order_by(Team.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                return
+            yield batch
+            after = batch[-1].id
+            # lo ya emitido no se vuelve a usar
+            self.db.expunge_all()
+
+    def create_teams(self, user_id: int, names: list[str]) -> list[int]:
+        """Un INSERT en lote; devuelve los ids en el orden de `names`."""
+        if not names:
+            return []
+        now = datetime.utcnow()
+        rows = [{"user_id": user_id, "name": name, "created_at": now} for name in names]
+        if self.db.get_bind().dialect.name != "sqlite":
+            # PostgreSQL no garantiza que el RETURNING en lote siga el orden de
+            # VALUES: SQLAlchemy lo reordena con un sentinel
+            q = insert(Team).returning(Team.id, sort_by_parameter_order=True)
+            return list(self.db.execute(q, rows).scalars())
+        # SQLite asigna los rowid en el orden de VALUES; ordenarlos evita
+        # sort_by_parameter_order, que acá hace un INSERT por fila
+        ids = self.db.execute(insert(Team).returning(Team.id), rows).scalars()
+        return sorted(ids)
+
+    def version_of(self, user_id: int, team_id: int):
+        """(version, created_at) del team si es del usuario, sin tocar los miembros."""
+        q = select(Team.version, Team.created_at).where(Team.id == team_id, Team.user_id == user_id)
+        return self.db.execute(q).first()
+
+    def bump_version(self, team_id: int) -> None:
+        self.db.execute(
+            update(Team)
+            .where(Team.id == team_id)
+            .values(version=Team.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def is_owner(self, user_id: int, team_id: int) -> bool:
+        return bool(self.db.execute(select(_owned(team_id, user_id))).scalar())
+
     def get_team(self, team_id: int) -> Team | None:
         return (
             self.db.query(Team)
+            .options(joinedload(Team.members))
             .filter(Team.id == team_id)
-            .first()
+            .one_or_none()
+        )
+
+    # las mutaciones llevan el dueño dentro de la consulta: devuelven rowcount,
+    # 0 = no existe, no es del usuario o no cumple las reglas
+    def rename_team(self, user_id: int, team_id: int, name: str) -> int:
+        q = (
+            update(Team)
+            .where(Team.id == team_id, Team.user_id == user_id)
+            .values(name=name, version=Team.version + 1)
+            .execution_options(synchronize_session=False)
         )
+        return self.db.execute(q).rowcount
 
-    def delete_team(self, team_id: int) -> None:
-        self.db.query(Team).filter(Team.id == team_id).delete()
+    def delete_team(self, user_id: int, team_id: int) -> int:
+        # members explícito: SQLite no aplica ON DELETE CASCADE sin PRAGMA
+        self.db.execute(
+            delete(TeamMember)
+            .where(TeamMember.team_id == team_id, _owned(team_id, user_id))
+            .execution_options(synchronize_session=False)
+        )
+        q = (
+            delete(Team)
+            .where(Team.id == team_id, Team.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(q).rowcount
 
     # ----------------------------
     # Members
     # ----------------------------
-    def member_exists(self, team_id: int, pokemon_id: int) -> bool:
-        return (
-            self.db.query(TeamMember)
-            .filter(
+    def add_member(self, user_id: int, team_id: int, pokemon_id: int, max_size: int, **snapshot) -> int:
+        """
+        INSERT ... SELECT que solo inserta si el team es del usuario, el
+        Pokémon está en su colección y hay lugar. Duplicados los frena
+        uq_team_pokemon (IntegrityError).
+        """
+        snapshot_values = [snapshot.get(c) for c in SNAPSHOT_COLUMNS]
+        size = (
+            select(func.count(TeamMember.id))
+            .where(TeamMember.team_id == team_id)
+            .scalar_subquery()
+        )
+        in_collection = exists().where(
+            CollectionItem.user_id == user_id,
+            CollectionItem.pokemon_id == pokemon_id,
+        )
+        # primer slot libre: 1, o el menor slot+1 que nadie ocupa (con size < max
+        # nunca pasa de max_size)
+        taken = aliased(TeamMember)
+        first_gap = (
+            select(func.min(TeamMember.slot + 1))
+            .where(
                 TeamMember.team_id == team_id,
-                TeamMember.pokemon_id == pokemon_id,
+                ~exists().where(taken.team_id == team_id, taken.slot == TeamMember.slot + 1),
             )
-            .first()
-            is not None
+            .scalar_subquery()
+        )
+        next_slot = case(
+            (~exists().where(TeamMember.team_id == team_id, TeamMember.slot == 1), 1),
+            else_=first_gap,
         )
+        source = select(
+            literal(team_id),
+            literal(pokemon_id),
+            next_slot,
+            *(literal(v) for v in snapshot_values),
+            literal(datetime.utcnow()),
+        ).where(_owned(team_id, user_id), in_collection, size < max_size)
+        q = insert(TeamMember).from_select(
+            ["team_id", "pokemon_id", "slot", *SNAPSHOT_COLUMNS, "created_at"], source
+        )
+        return self.db.execute(q).rowcount
 
-    def add_member(self, team_id: int, pokemon_id: int) -> TeamMember:
-        m = TeamMember(team_id=team_id, pokemon_id=pokemon_id)
-        self.db.add(m)
-        self.db.flush()
-        self.db.refresh(m)
-        return m
+    def set_snapshot(self, team_id: int, pokemon_id: int, **snapshot) -> None:
+        q = (
+            update(TeamMember)
+            .where(TeamMember.team_id == team_id, TeamMember.pokemon_id == pokemon_id)
+            .values(**{c: snapshot.get(c) for c in SNAPSHOT_COLUMNS})
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(q)
+
+    def insert_members(self, members: list[dict]) -> None:
+        """Un solo INSERT (executemany) para dicts con team_id, pokemon_id, slot y snapshot."""
+        if not members:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {
+                "team_id": m["team_id"],
+                "pokemon_id": m["pokemon_id"],
+                "slot": m.get("slot"),
+                "created_at": now,
+                **{c: m.get(c) for c in SNAPSHOT_COLUMNS},
+            }
+            for m in members
+        ]
+        self.db.execute(insert(TeamMember), rows)
 
-    def remove_member(self, team_id: int, pokemon_id: int) -> bool:
+    def replace_members(self, team_id: int, members: list[dict]) -> None:
+        """Borra el roster y escribe `members` (dicts de columnas) en un solo INSERT."""
+        self.db.execute(
+            delete(TeamMember)
+            .where(TeamMember.team_id == team_id)
+            .execution_options(synchronize_session=False)
+        )
+        self.insert_members([{"team_id": team_id, **m} for m in members])
+
+    def reorder_members(self, user_id: int, team_id: int, slots: dict[int, int]) -> int:
+        """
+        Dos UPDATE: los movidos pasan a -slot destino (no chocan con nadie) y
+        después se cambia el signo. Si un destino sigue ocupado por un miembro
+        que no se movió, el segundo choca con ix_team_members_team_slot
+        (IntegrityError).
+        """
+        q = (
+            update(TeamMember)
+            .where(
+                TeamMember.team_id == team_id,
+                TeamMember.pokemon_id.in_(slots),
+                _owned(team_id, user_id),
+            )
+            .values(slot=-case(slots, value=TeamMember.pokemon_id))
+            .execution_options(synchronize_session=False)
+        )
+        moved = self.db.execute(q).rowcount
+        if moved == len(slots):
+            self.db.execute(
+                update(TeamMember)
+                .where(TeamMember.team_id == team_id, TeamMember.slot < 0)
+                .values(slot=-TeamMember.slot)
+                .execution_options(synchronize_session=False)
+            )
+        return moved
+
+    def remove_member(self, user_id: int, team_id: int, pokemon_id: int) -> int:
         q = (
-            self.db.query(TeamMember)
-            .filter(
+            delete(TeamMember)
+            .where(
                 TeamMember.team_id == team_id,
                 TeamMember.pokemon_id == pokemon_id,
+                _owned(team_id, user_id),
             )
+            .execution_options(synchronize_session=False)
         )
-        if q.first():
-            q.delete()
-            return True
-        return False
\ No newline at end of file
+        return self.db.execute(q).rowcount
+
+    def mutation_state(self, user_id: int, team_id: int, pokemon_id: int) -> dict:
+        """Por qué falló una mutación: una sola consulta, solo en el camino de error."""
+        row = self.db.execute(
+            select(
+                _owned(team_id, user_id),
+                exists().where(
+                    CollectionItem.user_id == user_id,
+                    CollectionItem.pokemon_id == pokemon_id,
+                ),
+                select(func.count(TeamMember.id)).where(TeamMember.team_id == team_id).scalar_subquery(),
+                exists().where(TeamMember.team_id == team_id, TeamMember.pokemon_id == pokemon_id),
+            )
+        ).one()
+        return {
+            "owned": bool(row[0]),
+            "in_collection": bool(row[1]),
+            "size": int(row[2]),
+            "is_member": bool(row[3]),
+        }
@@ -0,0 +1,51 @@
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.infra.orm import TournamentMatch
+
+_matches = TournamentMatch.__table__
+
+
+class TournamentRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _insert(self):
+        # INSERT ... ON CONFLICT solo existe en el insert de cada dialecto
+        if self.db.get_bind().dialect.name == "postgresql":
+            return pg_insert(_matches)
+        return sqlite_insert(_matches)
+
+    def values_of(self, fingerprint: str, pairs: list[tuple[str, str]]) -> dict[tuple[str, str], float]:
+        """Cruces ya guardados de `pairs` ((hash_a, hash_b) en orden): {par: valor}."""
+        if not pairs:
+            return {}
+        # hash_a IN / hash_b IN usan toda la PK (un (a, b) IN VALUES no); trae
+        # de más entre rosters que no se pidieron y se filtra acá
+        q = select(TournamentMatch.hash_a, TournamentMatch.hash_b, TournamentMatch.value).where(
+            TournamentMatch.fingerprint == fingerprint,
+            TournamentMatch.hash_a.in_({a for a, _ in pairs}),
+            TournamentMatch.hash_b.in_({b for _, b in pairs}),
+        )
+        wanted = set(pairs)
+        return {(a, b): value for a, b, value in self.db.connection().execute(q) if (a, b) in wanted}
+
+    def save_values(self, fingerprint: str, values: dict[tuple[str, str], float]) -> None:
+        """Un INSERT en lote; si otro worker ya guardó el cruce, queda el suyo (es el mismo)."""
+        if not values:
+            return
+        # los de otro dex ya no se pueden volver a pedir (< / > en vez de != para
+        # que SQLite use la PK)
+        self.db.execute(
+            delete(TournamentMatch)
+            .where(or_(TournamentMatch.fingerprint < fingerprint, TournamentMatch.fingerprint > fingerprint))
+            .execution_options(synchronize_session=False)
+        )
+        rows = [
+            {"fingerprint": fingerprint, "hash_a": a, "hash_b": b, "value": value}
+            for (a, b), value in values.items()
+        ]
+        # Core (executemany) en vez del bulk del ORM: son decenas de miles de filas
+        self.db.connection().execute(self._insert().on_conflict_do_nothing(), rows)
@@ -3,8 +3,10 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.domain.repositories.collection_repository import CollectionRepository
-from app.domain.services.pokemon_service import get_pokemon
-from app.domain.models.auto_team import AutoTeamResult
+from app.domain.services.dex_features import get_dex_features, mask_types
+from app.domain.services.team_analysis_service import analyze_roster
+from app.domain.services.team_optimizer import optimize_team
+from app.infra.dex_store import TYPE_NAMES
 
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
@@ -12,72 +14,86 @@ client = OpenAI(api_key=settings.OPENAI_API_KEY)
 SYSTEM_PROMPT = """
 You are a Pokémon team-building expert.
 
-You will receive a list of Pokémon IDs the user owns.
-
-Your goal:
-- Select the best 6 Pokémon from the owned list.
-- Return only valid Pokémon IDs.
-- The team must contain exactly 6 distinct Pokémon.
-- IDs must be from the list the user owns.
-
-Return only structured JSON:
-{
-  "summary": "...",
-  "team": [
-    {"id": 445, "reason": "..."},
-    {"id": 130, "reason": "..."},
-    {"id": 6,   "reason": "..."},
-    {"id": 25,  "reason": "..."},
-    {"id": 143, "reason": "..."},
-    {"id": 65,  "reason": "..."}
-  ]
-}
+You will receive a team of 6 Pokémon that has already been selected, plus a
+deterministic analysis of its type coverage, shared weaknesses and stats.
+
+Write a short summary (3–5 sentences) of the team's strategy, its strengths
+and what to watch out for. Do not change the team. Return plain text only.
 """
 
 
-def build_auto_team(db: Session, user_id: int):
+def _type_list(mask: int, limit: int = 4) -> str:
+    return ", ".join(TYPE_NAMES[t] for t in mask_types(mask)[:limit])
+
+
+def _member_reason(features, row: int) -> str:
+    parts = []
+    offense = int(features.offense_mask[row])
+    resist = int(features.resist_mask[row])
+    if offense:
+        parts.append(f"Super-effective STAB vs {_type_list(offense)}")
+    if resist:
+        parts.append(f"resists {_type_list(resist)}")
+    parts.append(f"BST {int(features.bst[row])}")
+    return "; ".join(parts)
+
+
+def _summary(analysis: dict) -> str:
+    covered = len(analysis["offense"]["super_effective"])
+    shared = analysis["defense"]["shared_weaknesses"]
+    unresisted = analysis["defense"]["unresisted"]
+    text = f"Hits {covered}/{len(TYPE_NAMES)} types super-effectively"
+    text += f"; shared weaknesses: {', '.join(shared)}" if shared else "; no shared weaknesses"
+    if unresisted:
+        text += f"; nobody resists {', '.join(unresisted)}"
+    return text + f". Average BST {analysis['stats']['average_bst']}."
+
+
+def _ai_summary(team: list[dict], analysis: dict) -> str | None:
+    if not settings.OPENAI_API_KEY:
+        return None
+    payload = {
+        "team": [{"name": m["name"], "types": m["types"], "stats": m["stats"]} for m in team],
+        "analysis": {"offense": analysis["offense"], "defense": analysis["defense"], "stats": analysis["stats"]},
+    }
+    try:
+        response = client.responses.create(
+            model="gpt-4o-2024-08-06",
+            input=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": str(payload)}
+            ],
+        )
+        return response.output_text.strip() or None
+    except Exception:
+        return None  # el resumen determinístico alcanza
+
+
+def build_auto_team(db: Session, user_id: int, ai_summary: bool = False):
     repo = CollectionRepository(db)
     collection_ids = repo.list_ids(user_id)
 
     if not collection_ids:
         raise HTTPException(400, "Collection is empty. Cannot build a team.")
 
-    # content sent to AI
-    payload = {"owned_ids": collection_ids}
-
-    # parse structured output directly
-    response = client.responses.parse(
-        model="gpt-4o-2024-08-06",
-        input=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": str(payload)}
-        ],
-        text_format=AutoTeamResult
-    )
-
-    ai_result = response.output_parsed  # ✅ validated AutoTeamResult object
-
-    # Post-process to fetch full Pokémon data
-    full_team = []
-
-    for member in ai_result.team:
-        if member.id not in collection_ids:
-            continue  # never trust 100% the model
-
-        try:
-            p = get_pokemon(member.id)
-            full_team.append({
-                "id": p.id,
-                "name": p.name,
-                "sprite": p.sprite,
-                "types": p.types,
-                "stats": p.stats,
-                "reason": member.reason
-            })
-        except Exception:
-            continue
+    features = get_dex_features()
+    store = features.store
+    rows = [r for r in (store.row_of_id(pid) for pid in collection_ids) if r is not None]
+    if not rows:
+        raise HTTPException(400, "None of your Pokémon are in the local Pokédex. Cannot build a team.")
+
+    # selección local (beam search); la IA solo redacta el resumen si se pide
+    team = [
+        {**store.record(row), "reason": _member_reason(features, row)}
+        for row in optimize_team(features, rows)
+    ]
+    analysis = analyze_roster([m["id"] for m in team])
+
+    summary = _summary(analysis)
+    if ai_summary:
+        summary = _ai_summary(team, analysis) or summary
 
     return {
-        "summary": ai_result.summary,
-        "team": full_team
-    }
\ No newline at end of file
+        "summary": summary,
+        "team": team
+    }
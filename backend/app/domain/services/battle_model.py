@@ -0,0 +1,88 @@
+"""
+Modelo de daño simplificado compartido por las comparaciones y simulaciones.
+
+Supuestos (iguales para todos, así los resultados son comparables):
+- nivel 50, IV 31, 0 EV, naturaleza neutra
+- un solo movimiento de potencia MOVE_POWER: el mejor tipo propio con STAB o,
+  si eso es peor (p. ej. inmunidad), uno neutro sin STAB
+- cada atacante usa la categoría (física/especial) que más daño le hace
+
+Todas las funciones trabajan con arrays que hacen broadcasting, así sirven
+igual para un par de Pokémon que para matrices [M, N].
+"""
+import numpy as np
+
+from app.domain.services.type_chart_service import type_chart
+
+LEVEL = 50
+IV = 31
+MOVE_POWER = 80
+STAB = 1.5
+
+HP, ATK, DEF, SPA, SPD, SPE = range(6)
+
+
+def battle_stats(base: np.ndarray) -> np.ndarray:
+    """[..., 6] stats base -> stats reales a nivel LEVEL."""
+    stats = np.floor((2 * np.asarray(base, dtype=np.float32) + IV) * LEVEL / 100) + 5
+    stats[..., HP] += LEVEL + 5
+    return stats
+
+
+def move_multiplier(attacker_pairs: np.ndarray, defender_pairs: np.ndarray) -> np.ndarray:
+    """[M, N]: multiplicador del mejor movimiento (tipo x STAB, mínimo 1x neutro)."""
+    return np.maximum(type_chart.best_stab(attacker_pairs, defender_pairs) * STAB, 1.0)
+
+
+def pair_multiplier(attacker_pairs: np.ndarray, defender_pairs: np.ndarray) -> np.ndarray:
+    """[P]: como `move_multiplier` pero elemento a elemento (atacante i vs defensor i)."""
+    attacker_pairs = np.asarray(attacker_pairs, dtype=np.intp)
+    d1, d2 = type_chart.defender_index(defender_pairs)
+    a1 = attacker_pairs[..., 0]
+    a2 = np.where(attacker_pairs[..., 1] < 0, a1, attacker_pairs[..., 1])
+    best = np.maximum(type_chart.dual[a1, d1, d2], type_chart.dual[a2, d1, d2])
+    return np.maximum(best * STAB, 1.0)
+
+
+def expected_damage(attacker: np.ndarray, defender: np.ndarray, multiplier: np.ndarray) -> np.ndarray:
+    """Daño medio por golpe (sin aleatoriedad ni críticos)."""
+    ratio = np.maximum(
+        attacker[..., ATK] / defender[..., DEF],
+        attacker[..., SPA] / defender[..., SPD],
+    )
+    return ((2 * LEVEL / 5 + 2) * MOVE_POWER * ratio / 50 + 2) * multiplier
+
+
+def hits_to_ko(hp: np.ndarray, damage: np.ndarray) -> np.ndarray:
+    return np.ceil(hp / np.maximum(damage, 1e-6))
+
+
+def race_outcome(hits_a: np.ndarray, hits_b: np.ndarray, speed_a: np.ndarray, speed_b: np.ndarray) -> np.ndarray:
+    """1 si gana A, -1 si gana B, 0 empate. Con los mismos golpes gana el más rápido."""
+    a_wins = (hits_a < hits_b) | ((hits_a == hits_b) & (speed_a > speed_b))
+    b_wins = (hits_b < hits_a) | ((hits_a == hits_b) & (speed_b > speed_a))
+    return a_wins.astype(np.int8) - b_wins.astype(np.int8)
+
+
+def matchup_scores(stats_a: np.ndarray, pairs_a: np.ndarray, stats_b: np.ndarray, pairs_b: np.ndarray):
+    """Como `matchup_matrix` pero con stats reales ya calculadas (`battle_stats`)."""
+    stats_a = stats_a[:, None, :]
+    stats_b = stats_b[None, :, :]
+    mult_ab = move_multiplier(pairs_a, pairs_b)
+    mult_ba = move_multiplier(pairs_b, pairs_a).T
+    turns_a = stats_b[..., HP] / expected_damage(stats_a, stats_b, mult_ab)
+    turns_b = stats_a[..., HP] / expected_damage(stats_b, stats_a, mult_ba)
+    score = (turns_b - turns_a) / (turns_a + turns_b)
+    outcome = race_outcome(np.ceil(turns_a), np.ceil(turns_b), stats_a[..., SPE], stats_b[..., SPE])
+    return score, outcome
+
+
+def matchup_matrix(base_a: np.ndarray, pairs_a: np.ndarray, base_b: np.ndarray, pairs_b: np.ndarray):
+    """
+    Todos contra todos: A [N] vs B [M] en una pasada.
+
+    Devuelve (score, outcome), ambos [N, M]. `score` en (-1, 1) compara los
+    golpes (continuos) que necesita cada lado: > 0 favorece a A. `outcome`
+    es el resultado de `race_outcome` (1 / 0 / -1).
+    """
+    return matchup_scores(battle_stats(base_a), pairs_a, battle_stats(base_b), pairs_b)
@@ -0,0 +1,182 @@
+"""
+Simulador Monte Carlo de combates 1 vs 1 sobre `battle_model`.
+
+Cada ensayo repite el intercambio de golpes con una tirada de daño uniforme
+en [ROLL_MIN, 1] y críticos (CRIT_CHANCE, x CRIT_MULT); con igual velocidad
+se sortea quién pega primero. Los ensayos de todos los pares van en un solo
+array [pares, ensayos, turnos]: sin bucles en Python por ensayo ni por turno.
+Para lotes grandes los bloques de pares se reparten en el pool de procesos
+compartido (`app.infra.workers`).
+"""
+import numpy as np
+
+from app.domain.services import battle_model
+from app.domain.services.battle_model import HP, SPE
+from app.domain.services.pokemon_service import get_pokemon_batch
+from app.domain.services.type_chart_service import type_pair
+from app.infra.dex_store import STAT_KEYS
+from app.infra.workers import cpu_workers, process_pool
+
+ROLL_MIN = 0.85
+CRIT_CHANCE = 1 / 24
+CRIT_MULT = 1.5
+MAX_TURNS = 64  # sin KO en MAX_TURNS golpes -> empate
+
+DEFAULT_TRIALS = 1000
+CONFIDENCE = 0.95
+_Z = 1.959964  # cuantil normal para CONFIDENCE
+
+# elementos float32 por bloque [pares, ensayos, turnos] (~16 MB)
+CHUNK_ELEMENTS = 4_000_000
+# desde acá (pares x ensayos) el pool compensa el pickle de los bloques; muy
+# por debajo del tope por request de /battles/simulate (5M)
+POOL_MIN_SIMULATIONS = 1_000_000
+
+
+def wilson_interval(successes: np.ndarray, trials: int, z: float = _Z) -> tuple[np.ndarray, np.ndarray]:
+    p = np.asarray(successes, dtype=np.float64) / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return np.clip(center - half, 0.0, 1.0), np.clip(center + half, 0.0, 1.0)
+
+
+def _hits_needed(rng: np.random.Generator, hp: np.ndarray, damage: np.ndarray, trials: int, turns: int) -> np.ndarray:
+    """[P, trials]: golpes hasta el KO (turns + 1 si no llega)."""
+    shape = (hp.shape[0], trials, turns)
+    per_hit = rng.random(shape, dtype=np.float32)
+    per_hit *= 1 - ROLL_MIN
+    per_hit += ROLL_MIN
+    crit = rng.random(shape, dtype=np.float32) < CRIT_CHANCE
+    per_hit[crit] *= CRIT_MULT
+    per_hit *= damage[:, None, None]
+    dealt = np.cumsum(per_hit, axis=2, out=per_hit)
+    ko = dealt >= hp[:, None, None]
+    return np.where(ko.any(axis=2), ko.argmax(axis=2) + 1, turns + 1)
+
+
+def _simulate_chunk(args) -> tuple[np.ndarray, np.ndarray]:
+    stats_a, stats_b, mult_ab, mult_ba, trials, turns, seed = args
+    rng = np.random.default_rng(seed)
+    dmg_ab = battle_model.expected_damage(stats_a, stats_b, mult_ab).astype(np.float32)
+    dmg_ba = battle_model.expected_damage(stats_b, stats_a, mult_ba).astype(np.float32)
+    hits_a = _hits_needed(rng, stats_b[:, HP], dmg_ab, trials, turns)
+    hits_b = _hits_needed(rng, stats_a[:, HP], dmg_ba, trials, turns)
+
+    speed_a, speed_b = stats_a[:, SPE, None], stats_b[:, SPE, None]
+    a_first = (speed_a > speed_b) | ((speed_a == speed_b) & (rng.random(hits_a.shape) < 0.5))
+    finished = np.minimum(hits_a, hits_b) <= turns
+    a_wins = finished & ((hits_a < hits_b) | ((hits_a == hits_b) & a_first))
+    b_wins = finished & ~a_wins
+    return a_wins.sum(axis=1), b_wins.sum(axis=1)
+
+
+def simulate_pairs(
+    base_a: np.ndarray,
+    pairs_a: np.ndarray,
+    base_b: np.ndarray,
+    pairs_b: np.ndarray,
+    trials: int = DEFAULT_TRIALS,
+    seed: int | None = None,
+    workers: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simula P combates (A[i] vs B[i]) con `trials` ensayos cada uno.
+    `base_*`: [P, 6] stats base; `pairs_*`: [P, 2] tipos como en el dex.
+    Devuelve victorias de A y de B ([P] cada una); el resto son empates.
+    """
+    stats_a = battle_model.battle_stats(base_a)
+    stats_b = battle_model.battle_stats(base_b)
+    mult_ab = battle_model.pair_multiplier(pairs_a, pairs_b)
+    mult_ba = battle_model.pair_multiplier(pairs_b, pairs_a)
+
+    # turnos del peor caso (tirada mínima, sin críticos) para dimensionar el array
+    worst_a = battle_model.hits_to_ko(stats_b[:, HP], ROLL_MIN * battle_model.expected_damage(stats_a, stats_b, mult_ab))
+    worst_b = battle_model.hits_to_ko(stats_a[:, HP], ROLL_MIN * battle_model.expected_damage(stats_b, stats_a, mult_ba))
+    turns = int(min(max(np.minimum(worst_a, worst_b).max(initial=1), 1), MAX_TURNS))
+
+    n = stats_a.shape[0]
+    step = max(1, CHUNK_ELEMENTS // (trials * turns))
+    bounds = [(lo, min(lo + step, n)) for lo in range(0, n, step)]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+    jobs = [
+        (stats_a[lo:hi], stats_b[lo:hi], mult_ab[lo:hi], mult_ba[lo:hi], trials, turns, s)
+        for (lo, hi), s in zip(bounds, seeds)
+    ]
+
+    if workers > 1 and len(jobs) > 1:
+        parts = list(process_pool().map(_simulate_chunk, jobs))
+    else:
+        parts = [_simulate_chunk(job) for job in jobs]
+
+    a_wins = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, dtype=np.int64)
+    b_wins = np.concatenate([p[1] for p in parts]) if parts else np.zeros(0, dtype=np.int64)
+    return a_wins, b_wins
+
+
+def summarize(a_wins: int, b_wins: int, trials: int) -> dict:
+    lo, hi = wilson_interval(a_wins, trials)
+    return {
+        "trials": trials,
+        "a_win_probability": round(a_wins / trials, 4),
+        "b_win_probability": round(b_wins / trials, 4),
+        "draw_probability": round((trials - a_wins - b_wins) / trials, 4),
+        "confidence": CONFIDENCE,
+        "a_win_interval": [round(float(lo), 4), round(float(hi), 4)],
+    }
+
+
+def _arrays(pokemon: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    base = np.array([[p["stats"][k] for k in STAT_KEYS] for p in pokemon], dtype=np.float32)
+    pairs = np.stack([type_pair(p["types"]) for p in pokemon])
+    return base, pairs
+
+
+def simulate_matchup(a: dict, b: dict, trials: int = DEFAULT_TRIALS, seed: int | None = None) -> dict:
+    """Un combate; `a`/`b` con la forma de `normalize_pokemon` (types + stats)."""
+    return simulate_many([(a, b)], trials, seed)[0]
+
+
+def simulate_many(matchups: list[tuple[dict, dict]], trials: int = DEFAULT_TRIALS, seed: int | None = None,
+                  workers: int | None = None) -> list[dict]:
+    if not matchups:
+        return []
+    base_a, pairs_a = _arrays([a for a, _ in matchups])
+    base_b, pairs_b = _arrays([b for _, b in matchups])
+    if workers is None:
+        # el pool solo compensa con lotes grandes (pickle de los bloques)
+        workers = cpu_workers() if len(matchups) * trials >= POOL_MIN_SIMULATIONS else 1
+    a_wins, b_wins = simulate_pairs(base_a, pairs_a, base_b, pairs_b, trials, seed, workers)
+    return [summarize(int(wa), int(wb), trials) for wa, wb in zip(a_wins.tolist(), b_wins.tolist())]
+
+
+def simulate_batch(pairs: list[tuple[str, str]], trials: int = DEFAULT_TRIALS, seed: int | None = None) -> list[dict]:
+    """Pares por nombre o id; cada item lleva `simulation` o `error`."""
+    keys = [k for pair in pairs for k in pair]
+    resolved = {}
+    for item in get_pokemon_batch(keys):
+        resolved[item["key"].strip().lower()] = item["data"]
+
+    valid, results = [], []
+    for key_a, key_b in pairs:
+        a, b = resolved.get(key_a.strip().lower()), resolved.get(key_b.strip().lower())
+        item = {"pokemon_a": key_a, "pokemon_b": key_b}
+        if a is None or b is None:
+            item["error"] = "Pokémon not found"
+        else:
+            valid.append((len(results), a, b))
+        results.append(item)
+
+    sims = simulate_many([(a, b) for _, a, b in valid], trials, seed)
+    for (idx, a, b), sim in zip(valid, sims):
+        results[idx]["simulation"] = sim
+        results[idx]["winner"] = _winner(a, b, sim)
+    return results
+
+
+def _winner(a: dict, b: dict, sim: dict) -> str | None:
+    if sim["a_win_probability"] > sim["b_win_probability"]:
+        return a["name"]
+    if sim["b_win_probability"] > sim["a_win_probability"]:
+        return b["name"]
+    return None
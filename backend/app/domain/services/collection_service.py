@@ -24,6 +24,33 @@ def remove_from_collection(db: Session, user_id: int, pokemon_id: int) -> dict:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not in collection")
     return {"removed": True, "pokemon_id": pokemon_id}
 
+def bulk_update_collection(db: Session, user_id: int, add: list[int], remove: list[int]) -> dict:
+    """Altas y bajas en una transacción: un INSERT y un DELETE, con resultado por id."""
+    add = list(dict.fromkeys(add))
+    remove = list(dict.fromkeys(remove))
+    if any(pid < 1 for pid in add + remove):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pokémon IDs must be positive")
+    both = set(add) & set(remove)
+    if both:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="IDs in both add and remove: " + ", ".join(str(pid) for pid in sorted(both)),
+        )
+
+    repo = CollectionRepository(db)
+    added = repo.add_many(user_id, add)
+    removed = repo.remove_many(user_id, remove)
+    db.commit()
+
+    items = [
+        {"pokemon_id": pid, "action": "add", "status": "added" if pid in added else "already_present"}
+        for pid in add
+    ] + [
+        {"pokemon_id": pid, "action": "remove", "status": "removed" if pid in removed else "not_found"}
+        for pid in remove
+    ]
+    return {"added": len(added), "removed": len(removed), "items": items}
+
 def list_collection_ids(db: Session, user_id: int) -> list[int]:
     repo = CollectionRepository(db)
     return repo.list_ids(user_id)
\ No newline at end of file
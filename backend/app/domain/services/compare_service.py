@@ -1,8 +1,19 @@
 from openai import OpenAI
 from fastapi import HTTPException
+import numpy as np
+
 from app.core.config import settings
-from app.domain.models.compare import CompareRequest, CompareResponse, ComparedPokemon
-from app.domain.services.pokemon_service import get_pokemon
+from app.domain.models.compare import (
+    BattleEstimate,
+    CompareRequest,
+    CompareResponse,
+    ComparedPokemon,
+    SpeedComparison,
+)
+from app.domain.services import battle_model, battle_sim_service
+from app.domain.services.pokemon_service import get_pokemon_batch
+from app.domain.services.type_chart_service import type_chart, type_pair
+from app.infra.dex_store import STAT_KEYS, TYPE_CODES
 
 
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
@@ -14,86 +25,200 @@ You are a Pokémon analyst. You compare two Pokémon and explain:
 - stat differences
 - type matchups
 - strategic advantage
-- which one would likely win a fair battle
 
-Return the winner's NAME only (not ID), or "tie" if no clear winner.
-The main response should be a detailed summary.
+You will receive both Pokémon and a numeric comparison that already
+includes the predicted winner. Do not contradict the numbers.
+Return a detailed Markdown summary.
 """
 
+# cierre del stream si la IA falla a mitad de respuesta
+STREAM_ERROR_LINE = "\n\n**Error:** the AI summary was interrupted, try again later.\n"
+
+# (velocidad base mínima, etiqueta), de mayor a menor
+SPEED_TIERS = (
+    (110, "very fast"),
+    (90, "fast"),
+    (70, "average"),
+    (50, "slow"),
+    (0, "very slow"),
+)
 
-def compare_pokemon(req: CompareRequest) -> CompareResponse:
-    # Fetch Pokémon data
-    try:
-        poke_a = get_pokemon(req.pokemon_a)
-        poke_b = get_pokemon(req.pokemon_b)
-    except Exception:
-        raise HTTPException(404, "One of the Pokémon could not be found")
 
-    # Build structured input text
-    content = f"""
+def speed_tier(base_speed: int) -> str:
+    for floor, label in SPEED_TIERS:
+        if base_speed >= floor:
+            return label
+    return SPEED_TIERS[-1][1]
+
+
+def _fetch_pair(req: CompareRequest) -> tuple[dict, dict]:
+    # ambos en una sola pasada (dex/cache; PokeAPI en paralelo si falta alguno)
+    items = get_pokemon_batch([str(req.pokemon_a), str(req.pokemon_b)])
+    if any(item["data"] is None for item in items):
+        raise HTTPException(404, "One of the Pokémon could not be found")
+    return items[0]["data"], items[1]["data"]
+
+
+def _type_multipliers(attacker: dict, defender_pair: np.ndarray) -> dict[str, float]:
+    codes = np.array([TYPE_CODES[t] for t in attacker["types"]])
+    multipliers = type_chart.attack(codes, defender_pair[None, :])[:, 0]
+    return {t: float(m) for t, m in zip(attacker["types"], multipliers.tolist())}
+
+
+def _summary(a: dict, b: dict, numbers: dict) -> str:
+    type_effectiveness, speed, battle = numbers["type_effectiveness"], numbers["speed"], numbers["battle"]
+    winner = numbers["winner"]
+    best_a = max(type_effectiveness["a_vs_b"].values())
+    best_b = max(type_effectiveness["b_vs_a"].values())
+    lines = [
+        f"**{a['name']}** hits for {best_a:g}x and needs {battle.a_hits_to_ko} hit(s) "
+        f"(~{battle.a_damage_pct:.0f}% per hit).",
+        f"**{b['name']}** hits for {best_b:g}x and needs {battle.b_hits_to_ko} hit(s) "
+        f"(~{battle.b_damage_pct:.0f}% per hit).",
+        f"Speed: {speed.a} ({speed.a_tier}) vs {speed.b} ({speed.b_tier})"
+        + (f", {speed.faster} moves first." if speed.faster else ", speed tie."),
+        f"Predicted winner: **{winner}**." if winner else "Predicted result: tie.",
+    ]
+    sim = numbers.get("simulation")
+    if sim:
+        lo, hi = sim["a_win_interval"]
+        lines.append(
+            f"Simulated: {a['name']} wins {sim['a_win_probability']:.1%} of {sim['trials']} battles "
+            f"({sim['confidence']:.0%} CI {lo:.1%}–{hi:.1%})."
+        )
+    return "\n\n".join(lines)
+
+
+def compare_stats(a: dict, b: dict) -> dict:
+    """Comparación numérica local (sin IA)."""
+    base_a = np.array([a["stats"][k] for k in STAT_KEYS], dtype=np.float32)
+    base_b = np.array([b["stats"][k] for k in STAT_KEYS], dtype=np.float32)
+    pair_a, pair_b = type_pair(a["types"]), type_pair(b["types"])
+
+    stat_deltas = {k: a["stats"][k] - b["stats"][k] for k in STAT_KEYS}
+    stat_deltas["bst"] = sum(a["stats"].values()) - sum(b["stats"].values())
+
+    type_effectiveness = {
+        "a_vs_b": _type_multipliers(a, pair_b),
+        "b_vs_a": _type_multipliers(b, pair_a),
+    }
+
+    stats_a, stats_b = battle_model.battle_stats(base_a), battle_model.battle_stats(base_b)
+    mult_ab = battle_model.move_multiplier(pair_a[None, :], pair_b[None, :])[0, 0]
+    mult_ba = battle_model.move_multiplier(pair_b[None, :], pair_a[None, :])[0, 0]
+    dmg_ab = battle_model.expected_damage(stats_a, stats_b, mult_ab)
+    dmg_ba = battle_model.expected_damage(stats_b, stats_a, mult_ba)
+    hits_a = battle_model.hits_to_ko(stats_b[battle_model.HP], dmg_ab)
+    hits_b = battle_model.hits_to_ko(stats_a[battle_model.HP], dmg_ba)
+    outcome = int(battle_model.race_outcome(hits_a, hits_b, base_a[5], base_b[5]))
+
+    speed_a, speed_b = a["stats"]["speed"], b["stats"]["speed"]
+    faster = a["name"] if speed_a > speed_b else b["name"] if speed_b > speed_a else None
+    speed = SpeedComparison(
+        a=speed_a, b=speed_b, a_tier=speed_tier(speed_a), b_tier=speed_tier(speed_b), faster=faster
+    )
+    battle = BattleEstimate(
+        a_damage_pct=round(float(min(dmg_ab / stats_b[battle_model.HP], 1.0)) * 100, 1),
+        b_damage_pct=round(float(min(dmg_ba / stats_a[battle_model.HP], 1.0)) * 100, 1),
+        a_hits_to_ko=int(hits_a),
+        b_hits_to_ko=int(hits_b),
+    )
+    winner = {1: a["name"], -1: b["name"]}.get(outcome)
+    return {
+        "winner": winner,
+        "stat_deltas": stat_deltas,
+        "type_effectiveness": type_effectiveness,
+        "speed": speed,
+        "battle": battle,
+    }
+
+
+def _ai_prompt(a: dict, b: dict, numbers: dict) -> str:
+    return f"""
 Compare Pokémon A and B.
 
 ### Pokémon A
-Name: {poke_a.name}
-Types: {poke_a.types}
-Stats: {poke_a.stats}
+Name: {a['name']}
+Types: {a['types']}
+Stats: {a['stats']}
 
 ### Pokémon B
-Name: {poke_b.name}
-Types: {poke_b.types}
-Stats: {poke_b.stats}
-
-Provide:
-- A detailed comparison summary
-- The predicted winner by NAME only (or "tie")
+Name: {b['name']}
+Types: {b['types']}
+Stats: {b['stats']}
+
+### Numeric comparison
+Stat deltas (A - B): {numbers['stat_deltas']}
+Type effectiveness: {numbers['type_effectiveness']}
+Speed: {numbers['speed'].model_dump()}
+Damage race: {numbers['battle'].model_dump()}
+Predicted winner: {numbers['winner'] or 'tie'}
+Monte Carlo simulation: {numbers.get('simulation') or 'not requested'}
 """
 
-    response = client.responses.create(
-        model="gpt-4.1",
-        input=[
-            {
-                "role": "system",
-                "content": SYSTEM_PROMPT
-            },
-            {
-                "role": "user",
-                "content": content
-            },
-        ]
-    )
 
-    output = response.output_text.strip()
+def _ai_summary(a: dict, b: dict, numbers: dict) -> str | None:
+    try:
+        response = client.responses.create(
+            model="gpt-4.1",
+            input=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": _ai_prompt(a, b, numbers)},
+            ]
+        )
+        return response.output_text.strip() or None
+    except Exception:
+        return None  # queda el resumen numérico
 
-    # Split into summary + winner
-    # Expect format: "summary...\nWINNER: Pikachu"
-    lines = output.split("\n")
-    winner = None
-    summary = output
 
-    for line in lines:
-        if line.lower().startswith("winner"):
-            winner = line.split(":")[-1].strip()
-            break
+def compare_pokemon(req: CompareRequest, ai_summary: bool = False, trials: int = 0) -> CompareResponse:
+    a, b = _fetch_pair(req)
+    numbers = compare_stats(a, b)
+    if trials:
+        numbers["simulation"] = battle_sim_service.simulate_matchup(a, b, trials)
 
-    if winner is None:
-        # fallback
-        winner = poke_a.name
+    summary = _summary(a, b, numbers)
+    if ai_summary and settings.OPENAI_API_KEY:
+        summary = _ai_summary(a, b, numbers) or summary
 
     return CompareResponse(
         summary=summary,
-        winner=winner,
-        a=ComparedPokemon(
-            id=poke_a.id,
-            name=poke_a.name,
-            sprite=poke_a.sprite,
-            types=poke_a.types,
-            stats=poke_a.stats.model_dump(),
-        ),
-        b=ComparedPokemon(
-            id=poke_b.id,
-            name=poke_b.name,
-            sprite=poke_b.sprite,
-            types=poke_b.types,
-            stats=poke_b.stats.model_dump(),
-        ),
-    )
\ No newline at end of file
+        a=ComparedPokemon(**a),
+        b=ComparedPokemon(**b),
+        **numbers,
+    )
+
+
+def stream_compare_summary(req: CompareRequest):
+    """Prosa de la IA en streaming (texto plano), para pedirla después de los números."""
+    if not settings.OPENAI_API_KEY:
+        raise HTTPException(503, "AI summary unavailable (OPENAI_API_KEY not configured)")
+    a, b = _fetch_pair(req)
+    prompt = _ai_prompt(a, b, compare_stats(a, b))
+
+    # el request se abre acá: si falla todavía se puede responder con un status
+    try:
+        stream = client.responses.create(
+            model="gpt-4.1",
+            input=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            stream=True,
+        )
+    except Exception:
+        raise HTTPException(502, "AI summary unavailable, try again later")
+
+    def chunks():
+        # con los headers ya enviados, un error corta el texto con una línea explícita
+        try:
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
+                elif event.type in ("error", "response.failed"):
+                    yield STREAM_ERROR_LINE
+                    return
+        except Exception:
+            yield STREAM_ERROR_LINE
+
+    return chunks()
@@ -0,0 +1,71 @@
+"""
+Counters para un rival dentro de la colección del usuario.
+
+Usa las stats de combate precalculadas de todo el dex (`DexFeatures`) y
+`battle_model.matchup_scores` con el rival como única columna, así una
+colección de 1000 Pokémon se ordena en una sola pasada vectorizada.
+"""
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.domain.repositories.collection_repository import CollectionRepository
+from app.domain.services import battle_model
+from app.domain.services.battle_model import SPE
+from app.domain.services.dex_features import get_dex_features
+from app.domain.services.type_chart_service import type_chart
+
+# cuánto pesa pegar primero frente al score de la carrera de daño
+SPEED_WEIGHT = 0.1
+
+
+def rank_counters(features, rows: np.ndarray, opponent: int) -> dict:
+    """Arrays [len(rows)] ya ordenados de mejor a peor counter."""
+    store = features.store
+    opp = np.array([opponent])
+    score, outcome = battle_model.matchup_scores(
+        features.battle_stats[rows], store.types[rows],
+        features.battle_stats[opp], store.types[opp],
+    )
+    score, outcome = score[:, 0], outcome[:, 0]
+    speed_edge = np.sign(features.battle_stats[rows, SPE] - features.battle_stats[opponent, SPE])
+    rank = score + SPEED_WEIGHT * speed_edge
+    order = np.argsort(-rank, kind="stable")
+    return {
+        "rows": rows[order],
+        "score": rank[order],
+        "outcome": outcome[order],
+        "offense": type_chart.best_stab(store.types[rows[order]], store.types[opp])[:, 0],
+        "defense": type_chart.best_stab(store.types[opp], store.types[rows[order]])[0],
+        "speed_edge": speed_edge[order],
+    }
+
+
+def find_counters(db: Session, user_id: int, opponent_id: int, limit: int = 10) -> dict:
+    features = get_dex_features()
+    store = features.store
+    opponent = store.row_of_id(opponent_id)
+    if opponent is None:
+        raise HTTPException(404, f"Pokemon '{opponent_id}' not found")
+
+    repo = CollectionRepository(db)
+    rows = np.array(
+        [r for r in dict.fromkeys(store.row_of_id(pid) for pid in repo.list_ids(user_id)) if r is not None],
+        dtype=np.intp,
+    )
+    if rows.size == 0:
+        return {"opponent": store.summary(opponent), "total": 0, "items": []}
+
+    ranked = rank_counters(features, rows, opponent)
+    items = []
+    for i, row in enumerate(ranked["rows"][:limit].tolist()):
+        edge = int(ranked["speed_edge"][i])
+        items.append({
+            **store.summary(row),
+            "score": round(float(ranked["score"][i]), 3),
+            "outcome": int(ranked["outcome"][i]),
+            "offense": float(ranked["offense"][i]),
+            "defense": float(ranked["defense"][i]),
+            "faster": None if edge == 0 else edge > 0,
+        })
+    return {"opponent": store.summary(opponent), "total": int(rows.size), "items": items}
@@ -0,0 +1,65 @@
+"""
+Features por Pokémon precalculadas sobre todo el dex (una vez por proceso):
+
+- `offense_mask`: bits de los tipos (defensor de un solo tipo) a los que el
+  Pokémon pega súper efectivo con STAB.
+- `weak_mask` / `resist_mask`: bits de los tipos atacantes que le hacen > 1x
+  o < 1x (incluye inmunidades).
+- `taken`: [N, 18] multiplicador recibido de cada tipo atacante.
+- `bst` y `stats_norm` (stats / máximo del dex) para equilibrar stats.
+- `battle_stats`: stats reales a nivel 50 (`battle_model`) para comparar
+  enfrentamientos sin recalcularlas.
+"""
+import threading
+
+import numpy as np
+
+from app.domain.services.battle_model import battle_stats
+from app.domain.services.pokemon_service import require_dex_store
+from app.domain.services.type_chart_service import N_TYPES, type_chart
+from app.infra.dex_store import DexStore
+
+_BITS = np.left_shift(np.uint32(1), np.arange(N_TYPES, dtype=np.uint32))
+_SINGLE_TYPES = np.stack([np.arange(N_TYPES), np.full(N_TYPES, -1)], axis=1)
+
+
+def to_mask(flags: np.ndarray) -> np.ndarray:
+    """[N, 18] bool -> [N] uint32"""
+    return (flags.astype(np.uint32) * _BITS).sum(axis=-1, dtype=np.uint32)
+
+
+def mask_types(mask: int) -> list[int]:
+    return [t for t in range(N_TYPES) if mask >> t & 1]
+
+
+def popcount(x) -> np.ndarray:
+    return np.bitwise_count(np.asarray(x, dtype=np.uint32))
+
+
+class DexFeatures:
+    def __init__(self, store: DexStore):
+        self.store = store
+        pairs = store.types
+        self.offense = type_chart.best_stab(pairs, _SINGLE_TYPES)  # [N, 18]
+        self.taken = type_chart.defensive(pairs)                   # [N, 18]
+        self.offense_mask = to_mask(self.offense > 1)
+        self.weak_mask = to_mask(self.taken > 1)
+        self.resist_mask = to_mask(self.taken < 1)
+        self.bst = store.bst.astype(np.float32)
+        stats = store.stats.astype(np.float32)
+        self.stats_norm = stats / np.maximum(stats.max(axis=0), 1.0)
+        self.battle_stats = battle_stats(store.stats)
+
+
+_features: DexFeatures | None = None
+_features_lock = threading.Lock()
+
+
+def get_dex_features() -> DexFeatures:
+    global _features
+    store = require_dex_store()
+    if _features is None or _features.store is not store:
+        with _features_lock:
+            if _features is None or _features.store is not store:
+                _features = DexFeatures(store)
+    return _features
@@ -0,0 +1,98 @@
+import re
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.domain.services.pokemon_service import require_dex_store
+from app.infra.dex_store import STAT_KEYS, TYPE_CODES
+
+FILTER_FIELDS = STAT_KEYS + ("bst",)
+SORT_FIELDS = ("id",) + FILTER_FIELDS
+
+_CONDITION = re.compile(r"^\s*([a-z_]+)\s*(>=|<=|==|=|>|<)\s*(\d+)\s*$")
+
+_OPS = {
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    ">": np.greater,
+    "<": np.less,
+    "=": np.equal,
+    "==": np.equal,
+}
+
+
+def parse_condition(expr: str) -> tuple[str, str, int]:
+    """'speed>=100' -> ('speed', '>=', 100)"""
+    m = _CONDITION.match(expr.lower())
+    if not m or m.group(1) not in FILTER_FIELDS:
+        raise HTTPException(400, f"Invalid stat filter: {expr!r}")
+    return m.group(1), m.group(2), int(m.group(3))
+
+
+def type_bits(types: list[str]) -> int:
+    bits = 0
+    for t in types:
+        code = TYPE_CODES.get(t.strip().lower())
+        if code is None:
+            raise HTTPException(400, f"Unknown type: {t!r}")
+        bits |= 1 << code
+    return bits
+
+
+def query_rows(
+    types: list[str] | None = None,
+    generation: int | None = None,
+    forms: str = "all",
+    where: list[str] | None = None,
+    sort: str = "id",
+) -> np.ndarray:
+    """Filas del dex que cumplen todos los filtros, ya ordenadas (máscaras NumPy)."""
+    store = require_dex_store()
+    mask = np.ones(len(store), dtype=bool)
+
+    if types:
+        bits = np.uint32(type_bits(types))
+        mask &= (store.type_mask & bits) == bits
+    if generation is not None:
+        mask &= store.generation == generation
+    if forms == "default":
+        mask &= (store.flags & 1).astype(bool)
+    elif forms == "alternate":
+        mask &= ~(store.flags & 1).astype(bool)
+    for expr in where or []:
+        field, op, value = parse_condition(expr)
+        mask &= _OPS[op](store.stat_column(field), value)
+
+    rows = np.flatnonzero(mask)
+
+    descending = sort.startswith("-")
+    field = sort.lstrip("-+").lower()
+    if field not in SORT_FIELDS:
+        raise HTTPException(400, f"Invalid sort field: {field!r}")
+    if field != "id":
+        # stable: los empates quedan por id ascendente
+        key = store.stat_column(field)[rows].astype(np.int32)
+        rows = rows[np.argsort(-key if descending else key, kind="stable")]
+    elif descending:
+        rows = rows[::-1]
+    return rows
+
+
+def query_pokemon(
+    types: list[str] | None = None,
+    generation: int | None = None,
+    forms: str = "all",
+    where: list[str] | None = None,
+    sort: str = "id",
+    offset: int = 0,
+    limit: int = 20,
+) -> dict:
+    store = require_dex_store()
+    rows = query_rows(types, generation, forms, where, sort)
+    page = rows[offset:offset + limit]
+    return {
+        "total": int(rows.size),
+        "offset": offset,
+        "limit": limit,
+        "items": [store.record(int(r)) for r in page],
+    }
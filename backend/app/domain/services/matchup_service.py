@@ -0,0 +1,91 @@
+"""
+Matriz de enfrentamientos N x M sobre el dex local (sin IA ni red).
+
+Los ids se traducen a filas del dex y `battle_model.matchup_matrix` calcula
+todo el bloque vectorizado. El modo streaming calcula y emite por bloques
+de filas (NDJSON), así la memoria no crece con N y el cliente recibe las
+primeras filas enseguida.
+"""
+import json
+from typing import Iterator, List
+
+import numpy as np
+
+from app.domain.services import battle_model
+from app.domain.services.pokemon_service import require_dex_store
+from app.infra.dex_store import DexStore
+
+ROW_CHUNK = 128
+SCORE_DECIMALS = 3
+
+
+def _resolve(store: DexStore, ids: List[int]) -> tuple[list[int], np.ndarray, list[int]]:
+    known, rows, unknown = [], [], []
+    for pid in dict.fromkeys(ids):
+        row = store.row_of_id(pid)
+        if row is None:
+            unknown.append(pid)
+        else:
+            known.append(pid)
+            rows.append(row)
+    return known, np.array(rows, dtype=np.intp), unknown
+
+
+# texto JSON de cada score posible (redondeado a SCORE_DECIMALS): serializar
+# N x M floats con json.dumps domina el costo; indexar esta tabla no
+_SCALE = 10 ** SCORE_DECIMALS
+_SCORE_TEXT = np.array([json.dumps(round(v / _SCALE, SCORE_DECIMALS)) for v in range(-_SCALE, _SCALE + 1)], dtype=object)
+_OUTCOME_TEXT = np.array(["-1", "0", "1"], dtype=object)
+
+
+def _block(store: DexStore, rows_a: np.ndarray, rows_b: np.ndarray) -> tuple[list[str], list[str]]:
+    """Filas de scores/outcomes ya como texto JSON (`[..]` por fila)."""
+    score, outcome = battle_model.matchup_matrix(
+        store.stats[rows_a], store.types[rows_a], store.stats[rows_b], store.types[rows_b]
+    )
+    score_idx = np.rint(np.clip(score, -1.0, 1.0) * _SCALE).astype(np.intp) + _SCALE
+    scores = ["[" + ",".join(r) + "]" for r in _SCORE_TEXT[score_idx].tolist()]
+    outcomes = ["[" + ",".join(r) + "]" for r in _OUTCOME_TEXT[outcome + 1].tolist()]
+    return scores, outcomes
+
+
+def _prepare(a_ids: List[int], b_ids: List[int]):
+    store = require_dex_store()
+    a_known, rows_a, a_unknown = _resolve(store, a_ids)
+    b_known, rows_b, b_unknown = _resolve(store, b_ids)
+    header = {
+        "a": a_known,
+        "b": b_known,
+        "unknown_ids": list(dict.fromkeys(a_unknown + b_unknown)),
+    }
+    return store, rows_a, rows_b, header
+
+
+def _header_json(header: dict) -> str:
+    return json.dumps(header, separators=(",", ":"))[:-1]  # sin la llave de cierre
+
+
+def matchup_matrix(a_ids: List[int], b_ids: List[int]) -> bytes:
+    """Respuesta completa ya serializada (evita validar N x M floats con pydantic)."""
+    store, rows_a, rows_b, header = _prepare(a_ids, b_ids)
+    scores, outcomes = ([], []) if not (rows_a.size and rows_b.size) else _block(store, rows_a, rows_b)
+    body = f'{_header_json(header)},"scores":[{",".join(scores)}],"outcomes":[{",".join(outcomes)}]}}'
+    return body.encode()
+
+
+def stream_matchup_matrix(a_ids: List[int], b_ids: List[int]) -> Iterator[bytes]:
+    """NDJSON: primera línea con los ids, después una línea por fila de A."""
+    store, rows_a, rows_b, header = _prepare(a_ids, b_ids)
+
+    def lines():
+        yield json.dumps(header, separators=(",", ":")).encode() + b"\n"
+        if not rows_b.size:
+            return
+        for lo in range(0, rows_a.size, ROW_CHUNK):
+            scores, outcomes = _block(store, rows_a[lo:lo + ROW_CHUNK], rows_b)
+            yield "".join(
+                f'{{"id":{pid},"scores":{s},"outcomes":{o}}}\n'
+                for pid, s, o in zip(header["a"][lo:lo + ROW_CHUNK], scores, outcomes)
+            ).encode()
+
+    return lines()
@@ -0,0 +1,185 @@
+"""
+Snapshot de cada miembro de equipo (nombre, sprite, códigos de tipo) guardado
+en `team_members` al agregarlo, para que el detalle del equipo salga de una
+sola consulta SQL sin pedir cada Pokémon.
+
+`snapshot_fp` guarda el fingerprint del dex con el que se escribió; cuando el
+dataset se reconstruye, `refresh_member_snapshots` reescribe las filas viejas.
+Corre en un hilo al arrancar la app, o a mano:
+
+    uv run python -m app.domain.services.member_snapshot_service refresh
+"""
+import sys
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.domain.services.pokemon_service import get_pokemon
+from app.infra.dex_store import TYPE_CODES, TYPE_NAMES, DexStore, get_dex_store
+from app.infra.orm import Team, TeamMember
+
+_team_members = TeamMember.__table__
+
+
+def encode_types(types: list[str]) -> str:
+    return ",".join(str(TYPE_CODES[t]) for t in types if t in TYPE_CODES)
+
+
+def decode_types(type_codes: str | None) -> list[str]:
+    if not type_codes:
+        return []
+    return [TYPE_NAMES[int(c)] for c in type_codes.split(",")]
+
+
+def snapshot_from_store(store: DexStore, row: int) -> Dict[str, Any]:
+    return {
+        "name": store.name(row),
+        "sprite": store.sprite(row),
+        "type_codes": ",".join(str(c) for c in store.types[row].tolist() if c >= 0),
+        "snapshot_fp": store.fingerprint,
+    }
+
+
+def local_snapshot(pokemon_id: int) -> Dict[str, Any]:
+    """Snapshot solo desde el dex local (sin red); {} si no está."""
+    store = get_dex_store()
+    if store is not None:
+        row = store.row_of_id(pokemon_id)
+        if row is not None:
+            return snapshot_from_store(store, row)
+    return {}
+
+
+def snapshot_of(pokemon_id: int) -> Dict[str, Any]:
+    """Columnas de snapshot para un miembro nuevo. Sin dex cae a PokeAPI/cache."""
+    local = local_snapshot(pokemon_id)
+    if local:
+        return local
+
+    try:
+        poke = get_pokemon(pokemon_id)
+    except Exception:
+        # se queda vacío; el detalle hace el lookup hasta que haya snapshot
+        return {}
+    # sin fingerprint: el refresh lo reescribe cuando exista el dex
+    return {
+        "name": poke.name,
+        "sprite": poke.sprite,
+        "type_codes": encode_types(poke.types),
+        "snapshot_fp": None,
+    }
+
+
+def member_view(member: TeamMember) -> Dict[str, Any]:
+    """Miembro como lo devuelve el detalle del equipo."""
+    if member.name is not None:
+        return {
+            "id": member.pokemon_id,
+            "name": member.name,
+            "sprite": member.sprite,
+            "types": decode_types(member.type_codes),
+            "slot": member.slot,
+        }
+
+    # filas anteriores a la migración (o sin datos al agregarlas)
+    try:
+        poke = get_pokemon(member.pokemon_id)
+        return {
+            "id": poke.id,
+            "name": poke.name,
+            "sprite": poke.sprite,
+            "types": poke.types,
+            "slot": member.slot,
+        }
+    except Exception:
+        return {
+            "id": member.pokemon_id,
+            "name": f"pokemon-{member.pokemon_id}",
+            "sprite": None,
+            "types": [],
+            "slot": member.slot,
+        }
+
+
+def refresh_member_snapshots(db: Session) -> int:
+    """Reescribe los snapshots que no son del dex actual. Devuelve filas tocadas."""
+    store = get_dex_store()
+    if store is None:
+        return 0
+    fp = store.fingerprint
+
+    stale = or_(TeamMember.snapshot_fp.is_(None), TeamMember.snapshot_fp != fp)
+    pokemon_ids = [pid for (pid,) in db.query(TeamMember.pokemon_id).filter(stale).distinct()]
+
+    params = []
+    for pid in pokemon_ids:
+        row = store.row_of_id(pid)
+        if row is None:
+            continue
+        snap = snapshot_from_store(store, row)
+        params.append({"b_pokemon_id": pid, **{f"b_{k}": v for k, v in snap.items()}})
+    if not params:
+        return 0
+
+    # los teams afectados cambian de versión: invalida su detalle cacheado
+    touched = [p["b_pokemon_id"] for p in params]
+    db.execute(
+        update(Team)
+        .where(Team.id.in_(
+            select(TeamMember.team_id).where(stale, TeamMember.pokemon_id.in_(touched))
+        ))
+        .values(version=Team.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    # un solo UPDATE ejecutado en lote (executemany)
+    stmt = (
+        update(_team_members)
+        .where(
+            _team_members.c.pokemon_id == bindparam("b_pokemon_id"),
+            or_(_team_members.c.snapshot_fp.is_(None), _team_members.c.snapshot_fp != fp),
+        )
+        .values(
+            name=bindparam("b_name"),
+            sprite=bindparam("b_sprite"),
+            type_codes=bindparam("b_type_codes"),
+            snapshot_fp=bindparam("b_snapshot_fp"),
+        )
+    )
+    result = db.connection().execute(stmt, params)
+    db.commit()
+    return result.rowcount
+
+
+def _refresh_job() -> None:
+    from app.infra.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        refresh_member_snapshots(db)
+    finally:
+        db.close()
+
+
+def start_refresh_job() -> threading.Thread | None:
+    """Lanza el refresh en un hilo daemon si hay dex; no bloquea el arranque."""
+    if get_dex_store() is None:
+        return None
+    thread = threading.Thread(target=_refresh_job, name="member-snapshot-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "refresh":
+        print("usage: python -m app.domain.services.member_snapshot_service refresh")
+        sys.exit(1)
+    if get_dex_store() is None:
+        print("dex dataset not built (run: python -m app.infra.dex_store build)")
+        sys.exit(1)
+    from app.infra.db import SessionLocal
+
+    with SessionLocal() as session:
+        print(f"refreshed {refresh_member_snapshots(session)} team members")
@@ -1,23 +1,123 @@
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 
+import numpy as np
+from fastapi import HTTPException
+
 from app.core.config import settings
-from app.domain.models.pokemon import PokemonDTO
+from app.domain.models.pokemon import PokemonDTO, PokemonListPage
+from app.domain.services.role_service import get_role_index
 from app.infra.cache import local_cache
 from app.infra import pokedapi
+from app.infra.dex_store import DexStore, get_dex_store
 
 CACHE_TTL = settings.CACHE_TTL_SECONDS
+BATCH_FETCH_WORKERS = 16
+
+def require_dex_store() -> DexStore:
+    """Dex local para endpoints que lo recorren completo (no hay fallback a PokeAPI)."""
+    store = get_dex_store()
+    if store is None:
+        raise HTTPException(503, "Local Pokédex dataset not built (run: python -m app.infra.dex_store build)")
+    return store
+
+def _lookup_local(name_or_id: str | int) -> Dict[str, Any] | None:
+    """Dict normalizado desde el dex local o la cache, sin tocar la red."""
+    # primero el dex local mapeado en memoria (compartido entre workers)
+    store = get_dex_store()
+    if store is not None:
+        row = store.resolve(name_or_id)
+        if row is not None:
+            record = store.record(row)
+            roles = get_role_index()
+            if roles is not None:
+                record["role"] = roles.role(row)
+            return record
+    return local_cache.get(f"pokemon:{str(name_or_id).lower()}")
+
+def _fetch_remote(name_or_id: str | int) -> Dict[str, Any]:
+    raw = pokedapi.fetch_pokemon_raw(name_or_id)
+    normalized = pokedapi.normalize_pokemon(raw)
+    local_cache.set(f"pokemon:{str(name_or_id).lower()}", normalized, CACHE_TTL)
+    return normalized
 
 def get_pokemon(name_or_id: str | int) -> PokemonDTO:
-    key = f"pokemon:{str(name_or_id).lower()}"
+    found = _lookup_local(name_or_id)
+    if found is None:
+        found = _fetch_remote(name_or_id)
+    return PokemonDTO.model_validate(found)
+
+def get_pokemon_batch(keys: List[str], fields: List[str] | None = None) -> List[Dict[str, Any]]:
+    """
+    Resuelve muchos Pokémon en orden. Primero dex/cache; los que falten se
+    piden a PokeAPI en paralelo. Cada item lleva `data` o `error`.
+    """
+    unique = list(dict.fromkeys(k.strip().lower() for k in keys if k.strip()))
+    resolved: Dict[str, Dict[str, Any]] = {}
+    misses = []
+    for key in unique:
+        found = _lookup_local(key)
+        if found is None:
+            misses.append(key)
+        else:
+            resolved[key] = found
+
+    errors: Dict[str, str] = {}
+    if misses:
+        def fetch(key: str):
+            try:
+                return key, _fetch_remote(key), None
+            except Exception:
+                return key, None, "Pokémon not found"
+
+        with ThreadPoolExecutor(max_workers=min(BATCH_FETCH_WORKERS, len(misses))) as pool:
+            for key, data, error in pool.map(fetch, misses):
+                if data is None:
+                    errors[key] = error
+                else:
+                    resolved[key] = data
+
+    items = []
+    for raw_key in keys:
+        key = raw_key.strip().lower()
+        data = resolved.get(key)
+        if data is None:
+            items.append({"key": raw_key, "data": None, "error": errors.get(key, "Pokémon not found")})
+            continue
+        if fields:
+            data = {f: data.get(f) for f in fields}
+        items.append({"key": raw_key, "data": data, "error": None})
+    return items
+
+def list_page_etag(after: int | None, offset: int, limit: int) -> str:
+    store = require_dex_store()
+    cursor = "" if after is None else after
+    return f'"dex-{store.fingerprint}-a{cursor}-o{offset}-l{limit}"'
+
+def list_pokemon_page(after: int | None, offset: int, limit: int) -> bytes:
+    """
+    Página compacta del dex (id, name, sprite, types) ya serializada.
+    Keyset por id (`after`); `offset` solo aplica si no hay `after`.
+    """
+    store = require_dex_store()
+    key = f"dexlist:{store.fingerprint}:{after}:{offset}:{limit}"
     cached = local_cache.get(key)
     if cached:
-        return PokemonDTO.model_validate(cached)
+        return cached
 
-    raw = pokedapi.fetch_pokemon_raw(name_or_id)
-    normalized = pokedapi.normalize_pokemon(raw)
-    local_cache.set(key, normalized, CACHE_TTL)
-    return PokemonDTO.model_validate(normalized)
+    start = int(np.searchsorted(store.ids, after, side="right")) if after is not None else offset
+    rows = range(start, min(start + limit, len(store)))
+    has_more = rows.stop < len(store)
+    page = PokemonListPage(
+        total=len(store),
+        limit=limit,
+        next_after=int(store.ids[rows.stop - 1]) if has_more and rows else None,
+        items=[store.summary(r) for r in rows],
+    )
+    body = page.model_dump_json().encode("utf-8")
+    local_cache.set(key, body, CACHE_TTL)
+    return body
 
 def search_pokemon(query: str, limit: int = 20) -> List[Dict[str, Any]]:
     if not query or not query.strip():
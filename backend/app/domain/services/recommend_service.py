@@ -1,34 +1,157 @@
+"""
+Recomendador local: puntúa todo el dex contra los huecos de la colección.
+
+Para cada Pokémon que el usuario no tiene se suman (vectorizado sobre N):
+- cobertura ofensiva nueva (tipos que la colección aún no pega súper efectivo)
+- resistencias a los tipos donde la colección acumula más debilidades que
+  resistencias (y penalización si el candidato también es débil a ellos)
+- stats fuertes justo donde la colección está por debajo de la media del dex
+- BST
+
+La IA es opcional: solo reordena/explica los mejores candidatos locales.
+"""
+import numpy as np
 from openai import OpenAI
 from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
 from app.core.config import settings
-from app.domain.services.pokemon_service import get_pokemon
+from app.domain.models.recommend import RecommendRerankResponse
 from app.domain.repositories.collection_repository import CollectionRepository
-from sqlalchemy.orm import Session
+from app.domain.services.dex_features import DexFeatures, get_dex_features, mask_types, popcount
+from app.domain.services.type_chart_service import N_TYPES
+from app.infra.dex_store import FLAG_DEFAULT_FORM, STAT_KEYS, TYPE_NAMES
 
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+RERANK_POOL = 3  # candidatos enviados a la IA = limit * RERANK_POOL
+
+W_COVERAGE = 1.0
+W_DEFENSE = 1.0
+W_STATS = 0.5
+W_BST = 0.5
+BST_SCALE = 600.0
+
 SYSTEM_PROMPT = """
-You are a Pokémon expert. You will receive a list of Pokémon owned by a user.
+You are a Pokémon expert. You will receive a summary of a user's collection
+and a ranked list of candidate Pokémon that fill its type and stat gaps.
 
 Your tasks:
-1. Analyze type distribution.
-2. Identify weaknesses and missing synergies.
-3. Recommend 3–5 Pokémon that would improve the user's team.
-
-For each recommended Pokémon include:
-- name (English)
-- reason (short explanation)
-
-Return as a structured JSON object:
-{
-  "summary": "...",
-  "recommendations": [
-    {"name": "Example", "reason": "..." }
-  ]
-}
+1. Pick the best candidates for the user, in order (only names from the list).
+2. Give a short reason for each one.
+3. Write a short summary of the collection's gaps.
 """
 
-def recommend_for_user(db: Session, user_id: int):
+
+def collection_gaps(features: DexFeatures, owned: np.ndarray) -> dict:
+    weak = (features.taken[owned] > 1).sum(axis=0)
+    resist = (features.taken[owned] < 1).sum(axis=0)
+    # tipos donde pesan más las debilidades que las resistencias
+    defense_gap = np.maximum(weak - resist, 0).astype(np.float32) / len(owned)
+    stat_gap = np.maximum(
+        features.stats_norm.mean(axis=0) - features.stats_norm[owned].mean(axis=0), 0.0
+    )
+    covered = np.bitwise_or.reduce(features.offense_mask[owned])
+    return {"covered": int(covered), "defense_gap": defense_gap, "stat_gap": stat_gap}
+
+
+def score_candidates(features: DexFeatures, owned: np.ndarray, gaps: dict) -> np.ndarray:
+    """Score [N] de cada fila del dex; -inf para las que no son candidatas."""
+    store = features.store
+    new_cover = popcount(features.offense_mask & np.uint32(~gaps["covered"] & 0xFFFFFFFF)) / N_TYPES
+
+    gap = gaps["defense_gap"]
+    gap_total = max(float(gap.sum()), 1e-9)
+    defense = ((features.taken < 1) @ gap - (features.taken > 1) @ gap) / gap_total
+
+    stat_gap = gaps["stat_gap"]
+    stats = features.stats_norm @ stat_gap / max(float(stat_gap.sum()), 1e-9)
+
+    score = (
+        W_COVERAGE * new_cover
+        + W_DEFENSE * defense
+        + W_STATS * stats
+        + W_BST * features.bst / BST_SCALE
+    ).astype(np.float32)
+
+    score[owned] = -np.inf
+    score[(store.flags & FLAG_DEFAULT_FORM) == 0] = -np.inf
+    return score
+
+
+def _type_list(codes: list[int], limit: int = 4) -> str:
+    return ", ".join(TYPE_NAMES[t] for t in codes[:limit])
+
+
+def _reason(features: DexFeatures, row: int, gaps: dict) -> str:
+    parts = []
+    new_cover = mask_types(int(features.offense_mask[row]) & ~gaps["covered"])
+    if new_cover:
+        parts.append(f"Adds super-effective STAB vs {_type_list(new_cover)}")
+    gap_types = [t for t in np.argsort(-gaps["defense_gap"]).tolist() if gaps["defense_gap"][t] > 0]
+    resisted = [t for t in gap_types if features.taken[row, t] < 1]
+    if resisted:
+        parts.append(f"resists {_type_list(resisted)}")
+    parts.append(f"BST {int(features.bst[row])}")
+    return "; ".join(parts)
+
+
+def _summary(gaps: dict, owned_count: int) -> str:
+    covered = popcount(gaps["covered"]).item()
+    text = f"Your {owned_count} Pokémon hit {covered}/{N_TYPES} types super-effectively"
+    gap = gaps["defense_gap"]
+    weak_spots = [TYPE_NAMES[t] for t in np.argsort(-gap).tolist()[:3] if gap[t] > 0]
+    if weak_spots:
+        text += f"; biggest defensive gaps: {', '.join(weak_spots)}"
+    stat_gap = gaps["stat_gap"]
+    if stat_gap.max() > 0:
+        text += f"; lowest stat vs the dex average: {STAT_KEYS[int(stat_gap.argmax())]}"
+    return text + "."
+
+
+def _rerank(store, features, owned: np.ndarray, candidates: list[int], gaps: dict, limit: int):
+    if not settings.OPENAI_API_KEY:
+        return None
+    content = {
+        "owned": [
+            {"name": store.name(r), "types": store.type_names(r)} for r in owned[:20].tolist()
+        ],
+        "gaps": _summary(gaps, len(owned)),
+        "candidates": [
+            {"name": store.name(r), "types": store.type_names(r), "why": _reason(features, r, gaps)}
+            for r in candidates
+        ],
+        "pick": limit,
+    }
+    try:
+        response = client.responses.parse(
+            model="gpt-4.1",
+            input=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": str(content)},
+            ],
+            text_format=RecommendRerankResponse,
+        )
+        parsed = response.output_parsed
+    except Exception:
+        return None  # se devuelve el ranking local
+
+    by_name = {store.name(r): r for r in candidates}
+    picked, seen = [], set()
+    for rec in parsed.recommendations:
+        row = by_name.get(rec.name.strip().lower())
+        if row is None or row in seen:
+            continue  # la IA no puede inventar candidatos
+        seen.add(row)
+        picked.append((row, rec.reason))
+    if not picked:
+        return None
+    return parsed.summary, picked[:limit]
+
+
+def recommend_for_user(db: Session, user_id: int, limit: int = DEFAULT_LIMIT, rerank: bool = False):
     # Obtain user's collection
     repo = CollectionRepository(db)
     items = repo.list_ids(user_id)
@@ -36,69 +159,33 @@ def recommend_for_user(db: Session, user_id: int):
     if not items:
         raise HTTPException(400, "You must have at least 1 Pokémon in your collection")
 
-    # Load full details for AI
-    pokemon_list = []
-    for m in items[:20]:
-        try:
-            p = get_pokemon(m)
-            pokemon_list.append({
-                "id": p.id,
-                "name": p.name,
-                "types": p.types,
-                "stats": p.stats
-            })
-        except Exception:
-            continue
-
-    # Build content for AI
-    content = {
-        "owned": pokemon_list
-    }
-
-    response = client.responses.create(
-        model="gpt-4.1",
-        input=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": str(content)},
-        ]
+    features = get_dex_features()
+    store = features.store
+    owned = np.array(
+        sorted({r for r in (store.row_of_id(pid) for pid in items) if r is not None}),
+        dtype=np.intp,
     )
+    if owned.size == 0:
+        raise HTTPException(400, "None of your Pokémon are in the local Pokédex")
 
-    output_text = response.output_text
+    gaps = collection_gaps(features, owned)
+    score = score_candidates(features, owned, gaps)
 
-    # We expect JSON, but if AI outputs Markdown we try to extract JSON
-    import json
-    try:
-        parsed = json.loads(output_text)
-    except Exception:
-        # Attempt to fix markdown formatting
-        cleaned = output_text.strip().replace("```json", "").replace("```", "")
-        parsed = json.loads(cleaned)
-
-    # Convert AI names to real Pokémon info
-    results = []
-    for rec in parsed.get("recommendations", []):
-        name = rec["name"]
-        reason = rec.get("reason", "")
-        try:
-            poke = get_pokemon(name)
-            results.append({
-                "id": poke.id,
-                "name": poke.name,
-                "sprite": poke.sprite,
-                "types": poke.types,
-                "reason": reason
-            })
-        except Exception:
-            # fallback only with name
-            results.append({
-                "id": None,
-                "name": name,
-                "sprite": None,
-                "types": [],
-                "reason": reason
-            })
+    pool = min(limit * (RERANK_POOL if rerank else 1), int(np.isfinite(score).sum()))
+    top = np.argpartition(-score, pool - 1)[:pool] if pool else np.array([], dtype=np.intp)
+    top = top[np.argsort(-score[top], kind="stable")].tolist()
+
+    summary = _summary(gaps, len(owned))
+    ranked = [(row, _reason(features, row, gaps)) for row in top[:limit]]
+    if rerank and top:
+        reranked = _rerank(store, features, owned, top, gaps, limit)
+        if reranked is not None:
+            summary, ranked = reranked
 
     return {
-        "summary": parsed.get("summary", ""),
-        "recommendations": results
-    }
\ No newline at end of file
+        "summary": summary,
+        "recommendations": [
+            {**store.summary(row), "score": round(float(score[row]), 4), "reason": reason}
+            for row, reason in ranked
+        ],
+    }
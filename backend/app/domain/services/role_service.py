@@ -0,0 +1,190 @@
+"""
+Roles por stats (sweeper, muro, ...) precalculados para todo el dex.
+
+k-means (k = len(ROLE_TEMPLATES)) sobre la forma del reparto de stats:
+cada stat / BST, estandarizada por columna. Cada centroide recibe el
+nombre de la plantilla más parecida (asignación uno a uno). Etiquetas y
+centroides se guardan junto al dex (`roles.npy`, `role_centroids.npy`,
+`roles.json`). `python -m app.infra.dex_store build` ya los escribe; si
+faltan o son de otro dataset se recalculan en memoria la primera vez que se
+piden (son milisegundos) y se intentan guardar.
+
+Reconstruir solo los roles:
+
+    uv run python -m app.domain.services.role_service build
+"""
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.infra.dex_store import STAT_KEYS, DexStore, get_dex_store
+
+# énfasis de cada rol sobre (hp, atk, def, spa, spd, spe)
+ROLE_TEMPLATES = {
+    "physical sweeper": (0, 1, 0, -1, 0, 1),
+    "special sweeper": (0, -1, 0, 1, 0, 1),
+    "physical wall": (1, 0, 1, 0, 0, -1),
+    "special wall": (1, 0, 0, 0, 1, -1),
+    "bulky attacker": (1, 1, 0, 1, 0, -1),
+    "mixed attacker": (-1, 1, -1, 1, -1, 0),
+}
+ROLE_NAMES = tuple(ROLE_TEMPLATES)
+
+KMEANS_SEED = 0
+KMEANS_ITERS = 100
+
+
+def role_features(stats: np.ndarray) -> np.ndarray:
+    """[N, 6] stats base -> reparto (stat / BST) estandarizado por columna."""
+    stats = np.asarray(stats, dtype=np.float64)
+    share = stats / np.maximum(stats.sum(axis=1, keepdims=True), 1.0)
+    return (share - share.mean(axis=0)) / np.maximum(share.std(axis=0), 1e-9)
+
+
+def kmeans(x: np.ndarray, k: int, seed: int = KMEANS_SEED, iters: int = KMEANS_ITERS) -> tuple[np.ndarray, np.ndarray]:
+    """Lloyd con inicialización k-means++ (determinístico para un `seed`)."""
+    rng = np.random.default_rng(seed)
+    centers = np.empty((k, x.shape[1]))
+    centers[0] = x[rng.integers(len(x))]
+    d2 = ((x - centers[0]) ** 2).sum(axis=1)
+    for j in range(1, k):
+        centers[j] = x[rng.choice(len(x), p=d2 / d2.sum())]
+        d2 = np.minimum(d2, ((x - centers[j]) ** 2).sum(axis=1))
+
+    for _ in range(iters):
+        labels = ((x[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, x)
+        new = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        if np.allclose(new, centers):
+            break
+        centers = new
+    labels = ((x[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    return labels, centers
+
+
+def name_clusters(centers: np.ndarray) -> list[str]:
+    """Asigna a cada centroide la plantilla más parecida (coseno), sin repetir."""
+    templates = np.array(list(ROLE_TEMPLATES.values()), dtype=np.float64)
+    templates /= np.linalg.norm(templates, axis=1, keepdims=True)
+    unit = centers / np.maximum(np.linalg.norm(centers, axis=1, keepdims=True), 1e-9)
+    sim = unit @ templates.T
+
+    names: list[str | None] = [None] * len(centers)
+    used = set()
+    for flat in np.argsort(-sim, axis=None).tolist():
+        c, t = divmod(flat, len(ROLE_NAMES))
+        if names[c] is None and t not in used:
+            names[c] = ROLE_NAMES[t]
+            used.add(t)
+    return names
+
+
+def _write_atomic(target: Path, write) -> None:
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class RoleIndex:
+    def __init__(self, store: DexStore, labels: np.ndarray, centroids: np.ndarray, names: list[str]):
+        self.store = store
+        self.labels = labels
+        self.centroids = centroids
+        self.names = names
+
+    @classmethod
+    def build(cls, store: DexStore) -> "RoleIndex":
+        labels, centers = kmeans(role_features(store.stats), len(ROLE_NAMES))
+        return cls(store, labels.astype(np.uint8), centers.astype(np.float32), name_clusters(centers))
+
+    @classmethod
+    def load(cls, store: DexStore) -> "RoleIndex | None":
+        path = store.path
+        try:
+            meta = json.loads((path / "roles.json").read_text())
+        except (OSError, ValueError):
+            return None
+        if meta.get("fingerprint") != store.fingerprint:
+            return None
+        try:
+            labels = np.load(path / "roles.npy", mmap_mode="r").view(np.ndarray)
+            centroids = np.load(path / "role_centroids.npy")
+        except (OSError, ValueError):
+            return None  # a medio escribir o corrupto: se recalcula
+        if len(labels) != len(store):
+            return None
+        return cls(store, labels, centroids, meta["names"])
+
+    def save(self, path: Path | None = None) -> Path:
+        """
+        Cada archivo se escribe a un temporal y se renombra (os.replace es
+        atómico), así un worker que tiene roles.npy mapeado nunca lo ve
+        truncado. roles.json va último: sin él los .npy nuevos no se usan.
+        """
+        path = Path(path or self.store.path)
+        meta = {"fingerprint": self.store.fingerprint, "names": self.names, "stat_keys": list(STAT_KEYS)}
+        _write_atomic(path / "roles.npy", lambda f: np.save(f, self.labels))
+        _write_atomic(path / "role_centroids.npy", lambda f: np.save(f, self.centroids))
+        _write_atomic(path / "roles.json", lambda f: f.write(json.dumps(meta, indent=2).encode()))
+        return path
+
+    def role(self, row: int) -> str:
+        return self.names[int(self.labels[row])]
+
+    def role_of_id(self, pokemon_id: int) -> str | None:
+        row = self.store.row_of_id(pokemon_id)
+        return None if row is None else self.role(row)
+
+
+_index: RoleIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_role_index() -> RoleIndex | None:
+    """Índice de roles del proceso, o None si no hay dex local."""
+    global _index
+    store = get_dex_store()
+    if store is None:
+        return None
+    if _index is None or _index.store is not store:
+        with _index_lock:
+            if _index is None or _index.store is not store:
+                index = RoleIndex.load(store)
+                if index is None:
+                    index = RoleIndex.build(store)
+                    try:
+                        index.save()
+                    except OSError:
+                        pass  # dataset de solo lectura: se recalcula en cada arranque
+                _index = index
+    return _index
+
+
+def role_of_id(pokemon_id: int) -> str | None:
+    index = get_role_index()
+    return None if index is None else index.role_of_id(pokemon_id)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("usage: python -m app.domain.services.role_service build")
+        sys.exit(1)
+    store = get_dex_store()
+    if store is None:
+        print("dex dataset not built (run: python -m app.infra.dex_store build)")
+        sys.exit(1)
+    index = RoleIndex.build(store)
+    index.save()
+    counts = np.bincount(index.labels, minlength=len(index.names))
+    for name, count in zip(index.names, counts.tolist()):
+        print(f"{name:>17}: {count}")
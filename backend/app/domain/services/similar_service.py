@@ -0,0 +1,143 @@
+import threading
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.domain.services.pokemon_service import require_dex_store
+from app.infra.dex_store import DexStore
+
+METRICS = ("cosine", "euclidean")
+DEFAULT_TYPE_WEIGHT = 0.25
+TOPK_TABLE_SIZE = 50  # vecinos precalculados por Pokémon (peso de tipo por defecto)
+
+
+def _popcount(x: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(x).astype(np.float32)
+
+
+class SimilarityIndex:
+    """
+    Matrices precalculadas sobre el dex: stats estandarizados (z-score por stat),
+    su versión unitaria para coseno y los bitmasks de tipo para el solapamiento.
+    """
+
+    def __init__(self, store: DexStore):
+        self.store = store
+        stats = store.stats.astype(np.float32)
+        std = stats.std(axis=0)
+        std[std == 0] = 1.0
+        self.z = (stats - stats.mean(axis=0)) / std
+        norms = np.linalg.norm(self.z, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.unit = self.z / norms
+        self.sq_norms = (self.z ** 2).sum(axis=1)
+        self.type_mask = store.type_mask
+        self.type_count = _popcount(self.type_mask)
+        # distancia euclídea "típica" para pasar a similitud en [0, 1]
+        self.scale = float(np.sqrt(2 * self.z.shape[1]))
+        self._tables: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def stat_similarity(self, rows: np.ndarray, metric: str) -> np.ndarray:
+        """Matriz [len(rows), N] de similitud de stats en [0, 1]."""
+        if metric == "cosine":
+            return (1.0 + self.unit[rows] @ self.unit.T) / 2.0
+        d2 = self.sq_norms[rows, None] + self.sq_norms[None, :] - 2.0 * (self.z[rows] @ self.z.T)
+        return 1.0 / (1.0 + np.sqrt(np.maximum(d2, 0.0)) / self.scale)
+
+    def type_overlap(self, rows: np.ndarray) -> np.ndarray:
+        """Jaccard entre los tipos de `rows` y todo el dex, [len(rows), N]."""
+        inter = _popcount(self.type_mask[rows, None] & self.type_mask[None, :])
+        union = self.type_count[rows, None] + self.type_count[None, :] - inter
+        return inter / np.maximum(union, 1.0)
+
+    def scores(self, rows: np.ndarray, metric: str, type_weight: float):
+        stat_sim = self.stat_similarity(rows, metric)
+        type_sim = self.type_overlap(rows)
+        score = (1.0 - type_weight) * stat_sim + type_weight * type_sim
+        score[np.arange(len(rows)), rows] = -np.inf  # nunca uno mismo
+        return score, stat_sim, type_sim
+
+    def top_k(self, rows: np.ndarray, k: int, metric: str, type_weight: float):
+        score, stat_sim, type_sim = self.scores(rows, metric, type_weight)
+        k = min(k, score.shape[1] - 1)
+        part = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(score, part, axis=1).argsort(axis=1)[:, ::-1]
+        top = np.take_along_axis(part, order, axis=1)
+        pick = lambda m: np.take_along_axis(m, top, axis=1)
+        return top, pick(score), pick(stat_sim), pick(type_sim)
+
+    def table(self, metric: str):
+        """Top-TOPK_TABLE_SIZE de todo el dex con el peso de tipo por defecto (lazy)."""
+        if metric not in self._tables:
+            with self._lock:
+                if metric not in self._tables:
+                    all_rows = np.arange(len(self.store))
+                    self._tables[metric] = self.top_k(all_rows, TOPK_TABLE_SIZE, metric, DEFAULT_TYPE_WEIGHT)
+        return self._tables[metric]
+
+
+_index: SimilarityIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    global _index
+    store = require_dex_store()
+    if _index is None or _index.store is not store:
+        with _index_lock:
+            if _index is None or _index.store is not store:
+                _index = SimilarityIndex(store)
+    return _index
+
+
+def _resolve_rows(keys: list[str]) -> list[int | None]:
+    store = require_dex_store()
+    return [store.resolve(k) for k in keys]
+
+
+def _result(index: SimilarityIndex, row: int, metric: str, top, score, stat_sim, type_sim) -> dict:
+    store = index.store
+    items = []
+    for j, other in enumerate(top.tolist()):
+        item = store.summary(other)
+        item["score"] = round(float(score[j]), 4)
+        item["stat_similarity"] = round(float(stat_sim[j]), 4)
+        item["type_overlap"] = round(float(type_sim[j]), 4)
+        items.append(item)
+    return {"pokemon": store.summary(row), "metric": metric, "items": items}
+
+
+def _similar_rows(rows: list[int], k: int, metric: str, type_weight: float) -> list[dict]:
+    if metric not in METRICS:
+        raise HTTPException(400, f"Invalid metric: {metric!r}")
+    index = get_similarity_index()
+    rows_arr = np.asarray(rows, dtype=np.intp)
+
+    if type_weight == DEFAULT_TYPE_WEIGHT and k <= TOPK_TABLE_SIZE:
+        top, score, stat_sim, type_sim = (m[rows_arr, :k] for m in index.table(metric))
+    else:
+        top, score, stat_sim, type_sim = index.top_k(rows_arr, k, metric, type_weight)
+
+    return [
+        _result(index, row, metric, top[i], score[i], stat_sim[i], type_sim[i])
+        for i, row in enumerate(rows)
+    ]
+
+
+def similar_pokemon(name_or_id: str, k: int = 10, metric: str = "cosine", type_weight: float = DEFAULT_TYPE_WEIGHT) -> dict:
+    row = _resolve_rows([name_or_id])[0]
+    if row is None:
+        raise HTTPException(404, "Pokémon not found")
+    return _similar_rows([row], k, metric, type_weight)[0]
+
+
+def similar_pokemon_batch(keys: list[str], k: int = 10, metric: str = "cosine", type_weight: float = DEFAULT_TYPE_WEIGHT) -> list[dict]:
+    rows = _resolve_rows(keys)
+    found = [r for r in rows if r is not None]
+    results = iter(_similar_rows(found, k, metric, type_weight) if found else [])
+    return [
+        {"key": key, "data": next(results), "error": None} if row is not None
+        else {"key": key, "data": None, "error": "Pokémon not found"}
+        for key, row in zip(keys, rows)
+    ]
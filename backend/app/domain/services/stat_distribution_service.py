@@ -0,0 +1,104 @@
+"""
+Distribución de stats de todo el dex, precalculada una vez por proceso.
+
+Se guarda cada columna (6 stats + BST) ordenada; un percentil es un par de
+búsquedas binarias y un histograma son `buckets + 1` búsquedas, sin recorrer
+el dex en cada request.
+"""
+import threading
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.domain.models.pokemon import StatDistributionResult
+from app.domain.services.pokemon_service import require_dex_store
+from app.infra.cache import local_cache
+from app.infra.dex_store import STAT_KEYS, DexStore, get_dex_store
+
+DISTRIBUTION_FIELDS = STAT_KEYS + ("bst",)
+SUMMARY_QUANTILES = (10, 25, 50, 75, 90)
+
+
+class StatDistribution:
+    def __init__(self, store: DexStore):
+        self.store = store
+        self.sorted = {key: np.sort(store.stat_column(key)) for key in DISTRIBUTION_FIELDS}
+
+    def percentile(self, key: str, value: int) -> float:
+        """Rango percentil (mid-rank): % del dex por debajo, contando la mitad de los empates."""
+        column = self.sorted[key]
+        below = int(np.searchsorted(column, value, side="left"))
+        equal = int(np.searchsorted(column, value, side="right")) - below
+        return round(100.0 * (below + equal / 2) / column.size, 1)
+
+    def percentiles(self, stats: dict) -> dict:
+        result = {key: self.percentile(key, stats[key]) for key in STAT_KEYS}
+        result["bst"] = self.percentile("bst", sum(stats[key] for key in STAT_KEYS))
+        return result
+
+    def histogram(self, key: str, buckets: int) -> dict:
+        column = self.sorted[key]
+        lo, hi = int(column[0]), int(column[-1])
+        width = max(1, -(-(hi - lo + 1) // buckets))  # ceil
+        edges = lo + width * np.arange(buckets + 1)
+        counts = np.diff(np.searchsorted(column, edges, side="left"))
+        summary = {"min": lo, "max": hi, "mean": round(float(column.mean()), 1)}
+        for q in SUMMARY_QUANTILES:
+            summary[f"p{q}"] = int(column[min(column.size - 1, column.size * q // 100)])
+        return {
+            "stat": key,
+            "total": int(column.size),
+            "summary": summary,
+            "buckets": [
+                {"min": int(edges[i]), "max": int(edges[i + 1]) - 1, "count": int(counts[i])}
+                for i in range(buckets)
+                if edges[i] <= hi
+            ],
+        }
+
+
+_distribution: StatDistribution | None = None
+_distribution_lock = threading.Lock()
+
+
+def _get_distribution(store: DexStore) -> StatDistribution:
+    global _distribution
+    if _distribution is None or _distribution.store is not store:
+        with _distribution_lock:
+            if _distribution is None or _distribution.store is not store:
+                _distribution = StatDistribution(store)
+    return _distribution
+
+
+def stat_percentiles(stats: dict) -> dict | None:
+    """Percentiles de un juego de stats base, o None si no hay dex local."""
+    store = get_dex_store()
+    if store is None:
+        return None
+    return _get_distribution(store).percentiles(stats)
+
+
+def _check_stat(stat: str) -> None:
+    if stat not in DISTRIBUTION_FIELDS:
+        raise HTTPException(400, f"Unknown stat: {stat!r}")
+
+
+def distribution_etag(stat: str, buckets: int) -> str:
+    _check_stat(stat)
+    store = require_dex_store()
+    return f'"dist-{store.fingerprint}-{stat}-{buckets}"'
+
+
+def stat_distribution(stat: str, buckets: int) -> bytes:
+    """Histograma ya serializado (cacheado por dataset/stat/buckets)."""
+    _check_stat(stat)
+    store = require_dex_store()
+    key = f"dexdist:{store.fingerprint}:{stat}:{buckets}"
+    cached = local_cache.get(key)
+    if cached:
+        return cached
+    result = StatDistributionResult(**_get_distribution(store).histogram(stat, buckets))
+    body = result.model_dump_json().encode("utf-8")
+    local_cache.set(key, body, settings.CACHE_TTL_SECONDS)
+    return body
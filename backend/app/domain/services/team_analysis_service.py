@@ -0,0 +1,92 @@
+"""
+Análisis determinístico de un roster: cobertura ofensiva, debilidades
+compartidas, resistencias y agregados de stats. Todo sale del dex local y de
+la tabla de tipos; el resultado se cachea por hash del roster, así que un
+cambio de miembros produce otra clave (invalidación implícita).
+"""
+import hashlib
+
+import numpy as np
+
+from app.core.config import settings
+from app.domain.services.pokemon_service import require_dex_store
+from app.domain.services.role_service import get_role_index
+from app.domain.services.type_chart_service import N_TYPES, type_chart
+from app.infra.cache import local_cache
+from app.infra.dex_store import STAT_KEYS, TYPE_NAMES
+
+# cada tipo como defensor de un solo tipo
+_SINGLE_TYPES = np.stack([np.arange(N_TYPES), np.full(N_TYPES, -1)], axis=1)
+
+
+def roster_hash(pokemon_ids: list[int]) -> str:
+    key = ",".join(str(pid) for pid in sorted(pokemon_ids))
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _by_type(values: np.ndarray) -> dict:
+    return {TYPE_NAMES[i]: v for i, v in enumerate(values.tolist())}
+
+
+def _role_counts(rows: np.ndarray) -> dict:
+    roles = get_role_index()
+    if roles is None or not rows.size:
+        return {}
+    counts = np.bincount(roles.labels[rows], minlength=len(roles.names))
+    return {name: int(c) for name, c in zip(roles.names, counts.tolist()) if c}
+
+
+def analyze_roster(pokemon_ids: list[int]) -> dict:
+    store = require_dex_store()
+    key = f"team-analysis:{store.fingerprint}:{roster_hash(pokemon_ids)}"
+    cached = local_cache.get(key)
+    if cached:
+        return cached
+
+    rows, unknown = [], []
+    for pid in pokemon_ids:
+        row = store.row_of_id(pid)
+        if row is None:
+            unknown.append(pid)
+        else:
+            rows.append(row)
+    rows = np.array(rows, dtype=np.intp)
+    pairs = store.types[rows]
+
+    # ataque: mejor multiplicador STAB del equipo contra cada tipo
+    best = type_chart.best_stab(pairs, _SINGLE_TYPES).max(axis=0) if rows.size else np.ones(N_TYPES)
+    # defensa: multiplicador que recibe cada miembro de cada tipo atacante
+    taken = type_chart.defensive(pairs) if rows.size else np.ones((0, N_TYPES))
+    weak = (taken > 1).sum(axis=0)
+    resist = ((taken < 1) & (taken > 0)).sum(axis=0)
+    immune = (taken == 0).sum(axis=0)
+
+    stats = store.stats[rows].astype(np.int32) if rows.size else np.zeros((1, len(STAT_KEYS)), np.int32)
+    bst = stats.sum(axis=1)
+
+    result = {
+        "members": [int(store.ids[r]) for r in rows],
+        "unknown_ids": unknown,
+        "offense": {
+            "best_multiplier": _by_type(best),
+            "super_effective": [TYPE_NAMES[i] for i in np.flatnonzero(best > 1)],
+            "not_covered": [TYPE_NAMES[i] for i in np.flatnonzero(best <= 1)],
+        },
+        "defense": {
+            "weak": _by_type(weak),
+            "resist": _by_type(resist),
+            "immune": _by_type(immune),
+            "shared_weaknesses": [TYPE_NAMES[i] for i in np.flatnonzero(weak >= 2)],
+            "unresisted": [TYPE_NAMES[i] for i in np.flatnonzero((resist + immune) == 0)],
+        },
+        "stats": {
+            "total": dict(zip(STAT_KEYS, stats.sum(axis=0).tolist())),
+            "average": dict(zip(STAT_KEYS, np.round(stats.mean(axis=0), 1).tolist())),
+            "min": dict(zip(STAT_KEYS, stats.min(axis=0).tolist())),
+            "max": dict(zip(STAT_KEYS, stats.max(axis=0).tolist())),
+            "average_bst": round(float(bst.mean()), 1),
+        },
+        "roles": _role_counts(rows),
+    }
+    local_cache.set(key, result, settings.CACHE_TTL_SECONDS)
+    return result
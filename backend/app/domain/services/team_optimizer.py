@@ -0,0 +1,105 @@
+"""
+Optimizador local de equipos (beam search sobre bitmasks).
+
+Cada estado del beam guarda los bitmasks acumulados del equipo parcial:
+cobertura ofensiva, resistencias y debilidades vistas al menos una / dos
+veces, más sumas de stats. Expandir un estado con todos los candidatos es
+una operación vectorizada [beam, candidatos], así que escala a colecciones
+de 1000+ Pokémon.
+"""
+import numpy as np
+
+from app.domain.services.dex_features import DexFeatures, popcount
+from app.domain.services.type_chart_service import N_TYPES
+
+TEAM_SIZE = 6
+BEAM_WIDTH = 48
+
+W_COVERAGE = 1.0
+W_RESIST = 0.5
+W_SHARED_WEAKNESS = 1.0
+W_UNCOVERED_WEAKNESS = 1.0
+W_STATS = 1.0
+W_BALANCE = 0.2
+BST_SCALE = 600.0
+
+
+def _score(off, res, weak2, bst_sum, atk_sum, spa_sum, size):
+    coverage = popcount(off) / N_TYPES
+    resist = popcount(res) / N_TYPES
+    # debilidades compartidas por 2+ miembros; peor aún si nadie las resiste
+    shared = popcount(weak2) / N_TYPES
+    uncovered = popcount(weak2 & ~res) / N_TYPES
+    strength = bst_sum / (BST_SCALE * size)
+    balance = np.abs(atk_sum - spa_sum) / np.maximum(atk_sum + spa_sum, 1.0)
+    return (
+        W_COVERAGE * coverage
+        + W_RESIST * resist
+        - W_SHARED_WEAKNESS * shared
+        - W_UNCOVERED_WEAKNESS * uncovered
+        + W_STATS * strength
+        - W_BALANCE * balance
+    )
+
+
+def optimize_team(features: DexFeatures, rows: list[int], size: int = TEAM_SIZE, beam_width: int = BEAM_WIDTH) -> list[int]:
+    """Mejor equipo (filas del dex) que encuentra el beam search entre `rows`."""
+    rows = np.unique(np.asarray(rows, dtype=np.intp))
+    if rows.size <= size:
+        return rows.tolist()
+
+    off_c = features.offense_mask[rows]
+    res_c = features.resist_mask[rows]
+    weak_c = features.weak_mask[rows]
+    bst_c = features.bst[rows]
+    atk_c = features.stats_norm[rows, 1]
+    spa_c = features.stats_norm[rows, 3]
+    n = rows.size
+
+    # estado inicial: equipo vacío
+    zeros = np.zeros(1, dtype=np.uint32)
+    off, res, weak1, weak2 = zeros, zeros, zeros, zeros
+    bst_sum = atk_sum = spa_sum = np.zeros(1, dtype=np.float32)
+    members = np.zeros((1, 0), dtype=np.intp)
+
+    for step in range(1, size + 1):
+        # [beam, n] expandiendo cada estado con cada candidato
+        n_off = off[:, None] | off_c[None, :]
+        n_res = res[:, None] | res_c[None, :]
+        n_weak2 = weak2[:, None] | (weak1[:, None] & weak_c[None, :])
+        n_weak1 = weak1[:, None] | weak_c[None, :]
+        n_bst = bst_sum[:, None] + bst_c[None, :]
+        n_atk = atk_sum[:, None] + atk_c[None, :]
+        n_spa = spa_sum[:, None] + spa_c[None, :]
+        score = _score(n_off, n_res, n_weak2, n_bst, n_atk, n_spa, step)
+
+        if members.shape[1]:
+            score[np.arange(len(members))[:, None], members] = -np.inf
+
+        # mejores expansiones, sin repetir el mismo conjunto de miembros
+        flat = score.ravel()
+        take = min(flat.size, beam_width * (step + 1))
+        best = np.argpartition(-flat, take - 1)[:take]
+        best = best[np.argsort(-flat[best], kind="stable")]
+
+        seen, keep = set(), []
+        for idx in best.tolist():
+            if not np.isfinite(flat[idx]):
+                break
+            b, c = divmod(idx, n)
+            team = frozenset(members[b].tolist()) | {c}
+            if team in seen:
+                continue
+            seen.add(team)
+            keep.append((b, c))
+            if len(keep) == beam_width:
+                break
+
+        b_idx = np.array([b for b, _ in keep], dtype=np.intp)
+        c_idx = np.array([c for _, c in keep], dtype=np.intp)
+        off, res = n_off[b_idx, c_idx], n_res[b_idx, c_idx]
+        weak1, weak2 = n_weak1[b_idx, c_idx], n_weak2[b_idx, c_idx]
+        bst_sum, atk_sum, spa_sum = n_bst[b_idx, c_idx], n_atk[b_idx, c_idx], n_spa[b_idx, c_idx]
+        members = np.concatenate([members[b_idx], c_idx[:, None]], axis=1)
+
+    return rows[members[0]].tolist()
@@ -1,31 +1,22 @@
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.domain.models.team import TeamDetailDTO
 from app.domain.repositories.collection_repository import CollectionRepository
 from app.domain.repositories.team_repository import TeamRepository
-from app.domain.services.pokemon_service import get_pokemon
+from app.domain.services.member_snapshot_service import local_snapshot, member_view, snapshot_of
+from app.domain.services.team_analysis_service import analyze_roster
+from app.domain.services.tournament_service import run_tournament, run_tournament_job
+from app.infra.cache import local_cache
+
+TEAM_MAX_SIZE = 6
 
 
 def _team_to_detail(team) -> dict:
-    """Convierte un objeto Team a su estructura detallada"""
-    members_detailed = []
-
-    for m in team.members:
-        try:
-            poke = get_pokemon(m.pokemon_id)
-            members_detailed.append({
-                "id": poke.id,
-                "name": poke.name,
-                "sprite": poke.sprite,
-                "types": poke.types,
-            })
-        except Exception:
-            members_detailed.append({
-                "id": m.pokemon_id,
-                "name": f"pokemon-{m.pokemon_id}",
-                "sprite": None,
-                "types": [],
-            })
+    """Convierte un objeto Team a su estructura detallada (desde los snapshots)"""
+    members_detailed = [member_view(m) for m in team.members]
 
     return {
         "id": team.id,
@@ -47,18 +38,18 @@ def create_team(db: Session, user_id: int, name: str):
     return _team_to_detail(team)
 
 
-def list_teams(db: Session, user_id: int):
+def list_teams(db: Session, user_id: int, after: int | None = None, limit: int | None = None):
     repo = TeamRepository(db)
-    teams = repo.list_by_user(user_id)
+    rows = repo.list_summaries(user_id, after=after, limit=limit)
 
     return [
         {
-            "id": t.id,
-            "name": t.name,
-            "count": len(t.members),
-            "created_at": t.created_at.isoformat(),
+            "id": team_id,
+            "name": name,
+            "count": count,
+            "created_at": created_at.isoformat(),
         }
-        for t in teams
+        for team_id, name, created_at, count in rows
     ]
 
 
@@ -72,72 +63,189 @@ def get_team(db: Session, user_id: int, team_id: int):
     return _team_to_detail(team)
 
 
-def rename_team(db: Session, user_id: int, team_id: int, new_name: str):
+def team_etag(db: Session, user_id: int, team_id: int) -> str:
+    """ETag del detalle: id + creación (los ids se pueden reutilizar) + versión."""
+    row = TeamRepository(db).version_of(user_id, team_id)
+    if row is None:
+        raise HTTPException(404, "Team not found")
+    version, created_at = row
+    # created_at es nullable (filas viejas): sin fecha queda id + versión
+    created = created_at.strftime("%Y%m%d%H%M%S%f") if created_at else "0"
+    return f'"team-{team_id}-{created}-v{version}"'
+
+
+def team_detail_bytes(db: Session, user_id: int, team_id: int, etag: str) -> bytes:
+    """Detalle ya serializado; la clave lleva la versión, así que nunca queda viejo."""
+    key = f"teamdetail:{etag}"
+    cached = local_cache.get(key)
+    if cached:
+        return cached
+    detail = get_team(db, user_id, team_id)
+    body = TeamDetailDTO(**detail).model_dump_json().encode("utf-8")
+    local_cache.set(key, body, settings.CACHE_TTL_SECONDS)
+    return body
+
+
+def get_team_analysis(db: Session, user_id: int, team_id: int):
     repo = TeamRepository(db)
     team = repo.get_team(team_id)
 
     if not team or team.user_id != user_id:
         raise HTTPException(404, "Team not found")
 
+    analysis = analyze_roster([m.pokemon_id for m in team.members])
+    return {"team_id": team.id, **analysis}
+
+
+def _tournament_entries(db: Session, user_id: int) -> list[dict]:
+    repo = TeamRepository(db)
+    return [
+        {"id": t.id, "name": t.name, "pokemon_ids": [m.pokemon_id for m in t.members]}
+        for t in repo.list_by_user(user_id)
+    ]
+
+
+def get_tournament(db: Session, user_id: int):
+    return run_tournament(db, _tournament_entries(db, user_id))
+
+
+def schedule_tournament(db: Session, user_id: int, background_tasks):
+    # los rosters se leen ahora; la tarea abre su propia sesión y guarda los
+    # cruces en la DB, así que cualquier worker los aprovecha
+    entries = _tournament_entries(db, user_id)
+    background_tasks.add_task(run_tournament_job, entries)
+    return {"scheduled": True, "teams": len(entries)}
+
+
+def _detail_or_404(repo: TeamRepository, team_id: int) -> dict:
+    team = repo.get_team(team_id)
+    if not team:
+        raise HTTPException(404, "Team not found")
+    return _team_to_detail(team)
+
+
+def rename_team(db: Session, user_id: int, team_id: int, new_name: str):
     if not new_name.strip():
         raise HTTPException(400, "Name required")
 
-    team.name = new_name.strip()
+    repo = TeamRepository(db)
+    if not repo.rename_team(user_id, team_id, new_name.strip()):
+        db.rollback()
+        raise HTTPException(404, "Team not found")
     db.commit()
 
-    return _team_to_detail(team)
+    return _detail_or_404(repo, team_id)
 
 
 def add_member(db: Session, user_id: int, team_id: int, pokemon_id: int):
     repo = TeamRepository(db)
-    team = repo.get_team(team_id)
+    # dueño, colección y capacidad van dentro del INSERT; duplicados -> unique.
+    # Acá el snapshot sale solo del dex local: nada de red antes de validar
+    snapshot = local_snapshot(pokemon_id)
+    try:
+        added = repo.add_member(user_id, team_id, pokemon_id, TEAM_MAX_SIZE, **snapshot)
+    except IntegrityError:
+        db.rollback()
+        added = 0
+
+    if not added:
+        db.rollback()
+        state = repo.mutation_state(user_id, team_id, pokemon_id)
+        if not state["owned"]:
+            raise HTTPException(404, "Team not found")
+        if not state["in_collection"]:
+            raise HTTPException(400, "You must have this Pokémon in your collection first")
+        if state["is_member"]:
+            raise HTTPException(409, "Pokemon already in this team")
+        if state["size"] < TEAM_MAX_SIZE:
+            # otro request tomó el mismo slot libre al mismo tiempo
+            raise HTTPException(409, "Team was modified concurrently, try again")
+        raise HTTPException(400, f"Team full (max {TEAM_MAX_SIZE} pokemon)")
+    if not snapshot:
+        # sin dex: ya validado, se completa con PokeAPI/cache
+        fallback = snapshot_of(pokemon_id)
+        if fallback:
+            repo.set_snapshot(team_id, pokemon_id, **fallback)
+    repo.bump_version(team_id)
+    db.commit()
 
-    if not team or team.user_id != user_id:
-        raise HTTPException(404, "Team not found")
+    return _detail_or_404(repo, team_id)
 
-    # validar si está en collection
-    collection_repo = CollectionRepository(db)
-    if not collection_repo.exists(user_id, pokemon_id):
-        raise HTTPException(400, "You must have this Pokémon in your collection first")
 
-    if len(team.members) >= 6:
-        raise HTTPException(400, "Team full (max 6 pokemon)")
+def set_members(db: Session, user_id: int, team_id: int, pokemon_ids: list[int]):
+    """Reemplaza el roster completo; el orden de `pokemon_ids` define los slots."""
+    if len(pokemon_ids) > TEAM_MAX_SIZE:
+        raise HTTPException(400, f"Team full (max {TEAM_MAX_SIZE} pokemon)")
+    if len(set(pokemon_ids)) != len(pokemon_ids):
+        raise HTTPException(400, "Duplicate Pokémon in roster")
 
-    if repo.member_exists(team_id, pokemon_id):
-        raise HTTPException(409, "Pokemon already in this team")
+    repo = TeamRepository(db)
+    if not repo.is_owner(user_id, team_id):
+        raise HTTPException(404, "Team not found")
 
-    repo.add_member(team_id, pokemon_id)
+    owned = CollectionRepository(db).owned_among(user_id, pokemon_ids)
+    missing = [pid for pid in pokemon_ids if pid not in owned]
+    if missing:
+        raise HTTPException(
+            400,
+            "You must have these Pokémon in your collection first: "
+            + ", ".join(str(pid) for pid in missing),
+        )
+
+    repo.replace_members(team_id, [
+        {"pokemon_id": pid, "slot": slot, **snapshot_of(pid)}
+        for slot, pid in enumerate(pokemon_ids, start=1)
+    ])
+    repo.bump_version(team_id)
     db.commit()
-    db.refresh(team)
 
-    return _team_to_detail(team)
+    return _detail_or_404(repo, team_id)
 
 
-def remove_member(db: Session, user_id: int, team_id: int, pokemon_id: int):
+def reorder_members(db: Session, user_id: int, team_id: int, moves: list[tuple[int, int]]):
+    """Aplica (pokemon_id, slot) a los miembros indicados; el resto conserva su slot.
+    Un slot destino ocupado solo vale si su miembro también se mueve."""
+    slots = dict(moves)
+    if len(slots) != len(moves):
+        raise HTTPException(400, "Duplicate Pokémon in order")
+    if len(set(slots.values())) != len(slots):
+        raise HTTPException(400, "Duplicate slot in order")
+
     repo = TeamRepository(db)
-    team = repo.get_team(team_id)
+    try:
+        moved = repo.reorder_members(user_id, team_id, slots)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(400, "Slot already taken; move its member in the same request")
+    if moved != len(slots):
+        db.rollback()
+        if not repo.is_owner(user_id, team_id):
+            raise HTTPException(404, "Team not found")
+        raise HTTPException(404, "Pokemon not in this team")
+    repo.bump_version(team_id)
+    db.commit()
 
-    if not team or team.user_id != user_id:
-        raise HTTPException(404, "Team not found")
+    return _detail_or_404(repo, team_id)
 
-    deleted = repo.remove_member(team_id, pokemon_id)
-    db.commit()
 
-    if not deleted:
+def remove_member(db: Session, user_id: int, team_id: int, pokemon_id: int):
+    repo = TeamRepository(db)
+    if not repo.remove_member(user_id, team_id, pokemon_id):
+        db.rollback()
+        if not repo.mutation_state(user_id, team_id, pokemon_id)["owned"]:
+            raise HTTPException(404, "Team not found")
         raise HTTPException(404, "Pokemon not in this team")
+    repo.bump_version(team_id)
+    db.commit()
 
-    db.refresh(team)
-    return _team_to_detail(team)
+    return _detail_or_404(repo, team_id)
 
 
 def delete_team(db: Session, user_id: int, team_id: int):
     repo = TeamRepository(db)
-    team = repo.get_team(team_id)
-
-    if not team or team.user_id != user_id:
+    if not repo.delete_team(user_id, team_id):
+        db.rollback()
         raise HTTPException(404, "Team not found")
-
-    repo.delete_team(team_id)
     db.commit()
 
-    return {"deleted": True}
\ No newline at end of file
+    return {"deleted": True}
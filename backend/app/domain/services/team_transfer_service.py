@@ -0,0 +1,193 @@
+"""
+Exportar / importar teams en formato Showdown (texto del teambuilder) o NDJSON.
+
+La exportación se emite por lotes de teams, sin cargar todo en memoria. La
+importación resuelve los nombres contra el dex local y escribe todo con un
+INSERT en lote por tabla (teams, team_members y, si se pide, colección).
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.domain.repositories.collection_repository import CollectionRepository
+from app.domain.repositories.team_repository import TeamRepository
+from app.domain.services.member_snapshot_service import snapshot_from_store
+from app.domain.services.pokemon_service import require_dex_store
+from app.domain.services.team_service import TEAM_MAX_SIZE
+
+FORMATS = ("showdown", "ndjson")
+EXPORT_BATCH = 200
+MAX_IMPORT_TEAMS = 1000
+
+_HEADER = re.compile(r"^===\s*(?:\[[^\]]*\]\s*)?(.*?)\s*===$")
+_GENDER = re.compile(r"\s*\((?:M|F)\)$")
+_NICKNAME = re.compile(r"^.*\((.+)\)$")
+
+
+# ----------------------------
+# Export
+# ----------------------------
+def showdown_species(name: str) -> str:
+    """'charizard-mega-x' -> 'Charizard-Mega-X' (como los escribe Showdown)."""
+    return "-".join(part.capitalize() for part in name.split("-"))
+
+
+def _member_name(member) -> str:
+    return member.name or str(member.pokemon_id)
+
+
+def _showdown_team(team) -> str:
+    blocks = [f"=== {team.name} ===\n\n"]
+    blocks.extend(f"{showdown_species(_member_name(m))}\n\n" for m in team.members)
+    return "".join(blocks)
+
+
+def _ndjson_team(team) -> str:
+    record = {
+        "id": team.id,
+        "name": team.name,
+        "members": [
+            {"id": m.pokemon_id, "name": m.name, "slot": m.slot}
+            for m in team.members
+        ],
+    }
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def stream_export(db: Session, user_id: int, fmt: str) -> Iterator[bytes]:
+    """Un chunk por lote de teams; la sesión solo retiene el lote actual."""
+    if fmt not in FORMATS:
+        raise HTTPException(400, f"Unknown format (use one of: {', '.join(FORMATS)})")
+    render = _showdown_team if fmt == "showdown" else _ndjson_team
+    repo = TeamRepository(db)
+
+    def chunks():
+        for batch in repo.iter_with_members(user_id, EXPORT_BATCH):
+            yield "".join(render(t) for t in batch).encode()
+
+    return chunks()
+
+
+# ----------------------------
+# Parse
+# ----------------------------
+def species_key(line: str) -> str:
+    """Primera línea de un bloque Showdown -> clave del dex ('Mr. Mime @ X' -> 'mr-mime')."""
+    species = line.split(" @ ", 1)[0].strip()
+    species = _GENDER.sub("", species)
+    nickname = _NICKNAME.match(species)
+    if nickname:
+        species = nickname.group(1)
+    species = species.lower().replace(".", "").replace("'", "").replace("’", "").replace(":", "")
+    return "-".join(species.split())
+
+
+def parse_showdown(text: str) -> List[Dict[str, Any]]:
+    """Texto del teambuilder -> [{name, members: [claves]}]. Sin cabecera = un solo team."""
+    teams: List[Dict[str, Any]] = []
+    current = None
+    expecting_species = True
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            expecting_species = True
+            continue
+        header = _HEADER.match(line)
+        if header:
+            # "=== [gen9ou] Carpeta/Nombre ===" -> "Nombre"
+            current = {"name": header.group(1).rsplit("/", 1)[-1].strip(), "members": []}
+            teams.append(current)
+            expecting_species = True
+            continue
+        if expecting_species:
+            if current is None:
+                current = {"name": "", "members": []}
+                teams.append(current)
+            current["members"].append(species_key(line))
+            expecting_species = False
+        # el resto del bloque (Ability:, EVs:, - Move...) no se guarda
+    return teams
+
+
+def parse_ndjson(text: str) -> List[Dict[str, Any]]:
+    """Una línea por team: {"name": ..., "members": [id | nombre | {"id"/"name": ...}]}."""
+    teams = []
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            members = []
+            for m in record.get("members", []):
+                if isinstance(m, dict):
+                    m = m.get("id") or m.get("name")
+                members.append(str(m).strip().lower())
+            teams.append({"name": str(record.get("name") or ""), "members": members})
+        except (ValueError, AttributeError, TypeError):
+            raise HTTPException(400, f"Invalid NDJSON on line {lineno}")
+    return teams
+
+
+# ----------------------------
+# Import
+# ----------------------------
+def import_teams(db: Session, user_id: int, text: str, fmt: str, add_to_collection: bool = False) -> dict:
+    if fmt not in FORMATS:
+        raise HTTPException(400, f"Unknown format (use one of: {', '.join(FORMATS)})")
+    parsed = parse_showdown(text) if fmt == "showdown" else parse_ndjson(text)
+    if not parsed:
+        raise HTTPException(400, "No teams found")
+    if len(parsed) > MAX_IMPORT_TEAMS:
+        raise HTTPException(400, f"Too many teams (max {MAX_IMPORT_TEAMS} per import)")
+
+    store = require_dex_store()
+    plans = []
+    for i, team in enumerate(parsed, start=1):
+        rows, unresolved, dropped = [], [], []
+        for key in team["members"]:
+            row = store.resolve(key)
+            if row is None:
+                unresolved.append(key)
+            elif row in rows:
+                dropped.append(key)
+            elif len(rows) >= TEAM_MAX_SIZE:
+                dropped.append(key)
+            else:
+                rows.append(row)
+        name = team["name"].strip() or f"Imported team {i}"
+        plans.append({"name": name, "rows": rows, "unresolved": unresolved, "dropped": dropped})
+
+    # colección: una consulta para todo el import y, si se pide, un solo INSERT
+    wanted = list(dict.fromkeys(int(store.ids[r]) for p in plans for r in p["rows"]))
+    collection = CollectionRepository(db)
+    owned = collection.owned_among(user_id, wanted)
+    if add_to_collection:
+        collection.add_many(user_id, [pid for pid in wanted if pid not in owned])
+        owned.update(wanted)
+
+    repo = TeamRepository(db)
+    team_ids = repo.create_teams(user_id, [p["name"] for p in plans])
+    members, results = [], []
+    for team_id, plan in zip(team_ids, plans):
+        slot = 0
+        for row in plan["rows"]:
+            pid = int(store.ids[row])
+            if pid not in owned:
+                plan["dropped"].append(store.name(row))
+                continue
+            slot += 1
+            members.append({"team_id": team_id, "pokemon_id": pid, "slot": slot, **snapshot_from_store(store, row)})
+        results.append({
+            "id": team_id,
+            "name": plan["name"],
+            "count": slot,
+            "unresolved": plan["unresolved"],
+            "skipped": plan["dropped"],
+        })
+    repo.insert_members(members)
+    db.commit()
+
+    return {"created": len(results), "teams": results}
@@ -0,0 +1,183 @@
+"""
+Torneo todos contra todos entre los equipos de un usuario.
+
+Modelo de equipo vs equipo (sobre `battle_model.matchup_scores`, S[i, j]
+antisimétrico entre miembros):
+- respuesta de A = media, sobre los rivales j, del mejor S[i, j] de A
+- respuesta de B = lo mismo desde el lado de B (-S)
+- valor del cruce = (respuesta A - respuesta B) / 2, en (-1, 1)
+
+Cada cruce se guarda por (fingerprint del dex, hash de roster A, hash de
+roster B) en la tabla `tournament_matches`, que ven todos los workers, con
+`local_cache` delante. Al cambiar un equipo cambia su hash, así que solo se
+recalculan sus cruces (su fila); el resto sale de lo guardado. Los cruces
+pendientes se calculan vectorizados; con muchos, se reparten en el pool de
+procesos compartido.
+"""
+import numpy as np
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.repositories.tournament_repository import TournamentRepository
+from app.domain.services import battle_model
+from app.domain.services.dex_features import DexFeatures, get_dex_features
+from app.domain.services.team_analysis_service import roster_hash
+from app.infra.cache import local_cache
+from app.infra.workers import cpu_workers, process_pool
+
+TEAM_SIZE = 6
+DRAW_MARGIN = 1e-6
+POINTS_WIN, POINTS_DRAW = 3, 1
+
+# el pool de procesos solo compensa con muchos cruces pendientes
+POOL_MIN_PAIRS = 50_000
+POOL_CHUNK = 10_000
+
+
+def _pair_key(fingerprint: str, hash_a: str, hash_b: str) -> str:
+    return f"tournament:{fingerprint}:{hash_a}:{hash_b}"
+
+
+def _play_chunk(args) -> np.ndarray:
+    """Valor de cada cruce; `idx_*`: [P, 6] índices a S (-1 = hueco)."""
+    scores, idx_a, idx_b = args
+    valid_a, valid_b = idx_a >= 0, idx_b >= 0
+    sub = scores[np.maximum(idx_a, 0)[:, :, None], np.maximum(idx_b, 0)[:, None, :]]  # [P, 6, 6]
+    both = valid_a[:, :, None] & valid_b[:, None, :]
+
+    best_a = np.where(both, sub, -np.inf).max(axis=1)   # [P, 6] mejor de A contra cada j
+    best_b = np.where(both, -sub, -np.inf).max(axis=2)  # [P, 6] mejor de B contra cada i
+    answer_a = np.where(valid_b, best_a, 0).sum(axis=1) / valid_b.sum(axis=1)
+    answer_b = np.where(valid_a, best_b, 0).sum(axis=1) / valid_a.sum(axis=1)
+    return (answer_a - answer_b) / 2
+
+
+def play_matches(features: DexFeatures, rosters: list[np.ndarray], pairs: list[tuple[int, int]],
+                 workers: int | None = None) -> np.ndarray:
+    """Juega `pairs` (índices en `rosters`, filas del dex) y devuelve [P] valores para A."""
+    if not pairs:
+        return np.zeros(0, dtype=np.float32)
+    store = features.store
+    pair_idx = np.array(pairs, dtype=np.intp)
+    # S solo entre los miembros de equipos que juegan, una sola vez
+    playing = np.unique(pair_idx)
+    members = np.unique(np.concatenate([rosters[t] for t in playing.tolist()]))
+    scores, _ = battle_model.matchup_scores(
+        features.battle_stats[members], store.types[members],
+        features.battle_stats[members], store.types[members],
+    )
+
+    padded = np.full((len(rosters), TEAM_SIZE), -1, dtype=np.intp)
+    for t in playing.tolist():
+        rows = rosters[t][:TEAM_SIZE]
+        padded[t, :rows.size] = np.searchsorted(members, rows)
+    idx_a, idx_b = padded[pair_idx[:, 0]], padded[pair_idx[:, 1]]
+
+    if workers is None:
+        workers = cpu_workers() if len(pairs) >= POOL_MIN_PAIRS else 1
+    if workers > 1:
+        jobs = [
+            (scores, idx_a[lo:lo + POOL_CHUNK], idx_b[lo:lo + POOL_CHUNK])
+            for lo in range(0, len(pairs), POOL_CHUNK)
+        ]
+        return np.concatenate(list(process_pool().map(_play_chunk, jobs)))
+    return _play_chunk((scores, idx_a, idx_b))
+
+
+def _standings(teams: list[dict], values: dict[tuple[int, int], float]) -> list[dict]:
+    table = {
+        t["id"]: {"team_id": t["id"], "name": t["name"], "played": 0, "wins": 0, "draws": 0,
+                  "losses": 0, "points": 0, "margin": 0.0}
+        for t in teams
+    }
+    for (a, b), value in values.items():
+        for team_id, v in ((a, value), (b, -value)):
+            row = table[team_id]
+            row["played"] += 1
+            row["margin"] += v
+            if v > DRAW_MARGIN:
+                row["wins"] += 1
+                row["points"] += POINTS_WIN
+            elif v < -DRAW_MARGIN:
+                row["losses"] += 1
+            else:
+                row["draws"] += 1
+                row["points"] += POINTS_DRAW
+    for row in table.values():
+        row["margin"] = round(row["margin"], 4)
+    return sorted(table.values(), key=lambda r: (-r["points"], -r["margin"], r["team_id"]))
+
+
+def run_tournament(db: Session, teams: list[dict]) -> dict:
+    """
+    `teams`: [{"id", "name", "pokemon_ids"}]. Equipos sin miembros en el dex
+    quedan fuera (`skipped`). Devuelve la tabla y cuántos cruces se
+    calcularon frente a los que ya estaban guardados.
+    """
+    features = get_dex_features()
+    store = features.store
+    fingerprint = store.fingerprint
+
+    playable, rosters, hashes, skipped = [], [], [], []
+    for team in teams:
+        rows = [r for r in (store.row_of_id(pid) for pid in team["pokemon_ids"]) if r is not None]
+        if not rows:
+            skipped.append(team["id"])
+            continue
+        playable.append(team)
+        rosters.append(np.array(sorted(set(rows)), dtype=np.intp))
+        hashes.append(roster_hash([int(store.ids[r]) for r in rosters[-1]]))
+
+    values: dict[tuple[int, int], float] = {}
+    misses = []
+    for i in range(len(playable)):
+        for j in range(i + 1, len(playable)):
+            # clave en orden canónico de hashes; el valor es para el primero
+            flip = hashes[i] > hashes[j]
+            pair = (hashes[j], hashes[i]) if flip else (hashes[i], hashes[j])
+            ids = (playable[i]["id"], playable[j]["id"])
+            cached = local_cache.get(_pair_key(fingerprint, *pair))
+            if cached is None:
+                misses.append((i, j, pair, ids, flip))
+            else:
+                values[ids] = -cached if flip else cached
+
+    # lo que este proceso no tiene puede haberlo calculado otro worker
+    repo = TournamentRepository(db)
+    stored = repo.values_of(fingerprint, [m[2] for m in misses])
+    pending, pending_keys = [], []
+    for i, j, pair, ids, flip in misses:
+        value = stored.get(pair)
+        if value is None:
+            pending.append((j, i) if flip else (i, j))
+            pending_keys.append((pair, ids, flip))
+            continue
+        local_cache.set(_pair_key(fingerprint, *pair), value, settings.CACHE_TTL_SECONDS)
+        values[ids] = -value if flip else value
+
+    computed = {}
+    for (pair, ids, flip), value in zip(pending_keys, play_matches(features, rosters, pending).tolist()):
+        local_cache.set(_pair_key(fingerprint, *pair), value, settings.CACHE_TTL_SECONDS)
+        computed[pair] = value
+        values[ids] = -value if flip else value
+    if computed:
+        repo.save_values(fingerprint, computed)
+        db.commit()
+
+    return {
+        "teams": len(playable),
+        "matches": len(values),
+        "computed": len(pending),
+        "cached": len(values) - len(pending),
+        "skipped": skipped,
+        "standings": _standings(playable, values),
+    }
+
+
+def run_tournament_job(teams: list[dict]) -> None:
+    """Para BackgroundTasks: la sesión del request ya está cerrada al correr."""
+    from app.infra.db import SessionLocal
+
+    with SessionLocal() as db:
+        run_tournament(db, teams)
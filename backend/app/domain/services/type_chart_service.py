@@ -0,0 +1,110 @@
+"""
+Tabla de tipos local (Gen 6+), cargada una vez desde `app/data/type_chart.json`.
+
+- `matrix[a, d]`: multiplicador del tipo atacante `a` contra el tipo defensor `d`.
+- `dual[a, d1, d2]`: multiplicador contra la combinación (d1, d2). El índice
+  NO_TYPE representa "sin segundo tipo", así un Pokémon de un solo tipo es
+  (d1, NO_TYPE).
+
+Los códigos de tipo son los de `dex_store.TYPE_NAMES`, así que las columnas
+`types` del dex se pueden usar directamente (con -1 -> NO_TYPE).
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.infra.dex_store import TYPE_CODES, TYPE_NAMES
+
+CHART_PATH = Path(__file__).resolve().parents[2] / "data" / "type_chart.json"
+
+N_TYPES = len(TYPE_NAMES)
+NO_TYPE = N_TYPES
+
+
+class TypeChart:
+    def __init__(self, data: dict):
+        matrix = np.ones((N_TYPES, N_TYPES), dtype=np.float32)
+        for section, value in (("super_effective", 2.0), ("not_very_effective", 0.5), ("no_effect", 0.0)):
+            for attacker, defenders in data[section].items():
+                for defender in defenders:
+                    matrix[TYPE_CODES[attacker], TYPE_CODES[defender]] = value
+        self.matrix = matrix
+
+        ext = np.ones((N_TYPES, N_TYPES + 1), dtype=np.float32)
+        ext[:, :N_TYPES] = matrix
+        self.dual = ext[:, :, None] * ext[:, None, :]
+        # la diagonal (d, d) es un tipo único, no "doble"
+        idx = np.arange(N_TYPES)
+        self.dual[:, idx, idx] = matrix
+
+    @classmethod
+    def load(cls, path: Path = CHART_PATH) -> "TypeChart":
+        return cls(json.loads(Path(path).read_text()))
+
+    @staticmethod
+    def defender_index(pairs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Columnas `types` del dex ([N, 2], -1 = vacío) -> índices (d1, d2) para `dual`."""
+        pairs = np.asarray(pairs, dtype=np.intp)
+        d1 = pairs[..., 0]
+        d2 = np.where(pairs[..., 1] < 0, NO_TYPE, pairs[..., 1])
+        return d1, d2
+
+    def defensive(self, defender_pairs: np.ndarray) -> np.ndarray:
+        """[N, 18]: multiplicador que recibe cada defensor de cada tipo atacante."""
+        d1, d2 = self.defender_index(defender_pairs)
+        return self.dual[:, d1, d2].T
+
+    def attack(self, attack_types: np.ndarray, defender_pairs: np.ndarray) -> np.ndarray:
+        """[M, N]: tipos atacantes sueltos contra combinaciones defensoras."""
+        d1, d2 = self.defender_index(defender_pairs)
+        a = np.asarray(attack_types, dtype=np.intp)
+        return self.dual[a[:, None], d1[None, :], d2[None, :]]
+
+    def best_stab(self, attacker_pairs: np.ndarray, defender_pairs: np.ndarray) -> np.ndarray:
+        """[M, N]: mejor multiplicador usando cualquiera de los tipos del atacante (STAB)."""
+        attacker_pairs = np.asarray(attacker_pairs, dtype=np.intp)
+        d1, d2 = self.defender_index(defender_pairs)
+        a1 = attacker_pairs[:, 0]
+        a2 = np.where(attacker_pairs[:, 1] < 0, a1, attacker_pairs[:, 1])
+        m1 = self.dual[a1[:, None], d1[None, :], d2[None, :]]
+        m2 = self.dual[a2[:, None], d1[None, :], d2[None, :]]
+        return np.maximum(m1, m2)
+
+
+# instancia única para todo el proceso
+type_chart = TypeChart.load()
+
+
+def type_codes(names: list[str]) -> list[int]:
+    codes = []
+    for name in names:
+        code = TYPE_CODES.get(name.strip().lower())
+        if code is None:
+            raise HTTPException(400, f"Unknown type: {name!r}")
+        codes.append(code)
+    return codes
+
+
+def type_pair(names: list[str]) -> np.ndarray:
+    """Lista de 1 o 2 nombres de tipo -> par de códigos como en el dex."""
+    codes = list(dict.fromkeys(type_codes(names)))
+    if not 1 <= len(codes) <= 2:
+        raise HTTPException(400, "A Pokémon has one or two types")
+    return np.array(codes + [-1] * (2 - len(codes)), dtype=np.int8)
+
+
+def matchup(defender: list[str], attackers: list[str] | None = None) -> dict:
+    pair = type_pair(defender)
+    attack_codes = type_codes(attackers) if attackers else list(range(N_TYPES))
+    multipliers = type_chart.attack(np.array(attack_codes), pair[None, :])[:, 0]
+
+    by_type = {TYPE_NAMES[c]: float(m) for c, m in zip(attack_codes, multipliers.tolist())}
+    return {
+        "defender": [TYPE_NAMES[c] for c in pair if c >= 0],
+        "multipliers": by_type,
+        "weaknesses": [t for t, m in by_type.items() if m > 1],
+        "resistances": [t for t, m in by_type.items() if 0 < m < 1],
+        "immunities": [t for t, m in by_type.items() if m == 0],
+    }
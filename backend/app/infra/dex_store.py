@@ -0,0 +1,322 @@
+"""
+Pokédex columnar inmutable, mapeado en memoria.
+
+El dex normalizado se guarda como un directorio de arrays `.npy` (una columna
+por archivo) más un `meta.json`. Cada worker de uvicorn lo abre con
+`np.load(..., mmap_mode="r")`, así que todas las páginas vienen del page cache
+del sistema operativo y se comparten entre procesos (zero-copy).
+
+Layout (N = número de Pokémon, ordenados por id ascendente):
+
+    ids.npy            int32  [N]      id de PokeAPI
+    species.npy        int16  [N]      id de especie (dex nacional)
+    generation.npy     int8   [N]      generación (1..9, 0 si se desconoce)
+    flags.npy          uint8  [N]      bit 0 = forma por defecto
+    types.npy          int8   [N, 2]   códigos de tipo (-1 = sin segundo tipo)
+    stats.npy          int16  [N, 6]   stats base en el orden de STAT_KEYS
+    names.offsets.npy  uint32 [N + 1]  tabla de nombres (utf-8 contiguo)
+    names.blob.npy     uint8  [...]
+    name_keys.npy      S<k>   [N]      nombres ordenados (índice de búsqueda)
+    name_order.npy     int32  [N]      fila de cada entrada de name_keys
+    sprites.offsets.npy / sprites.blob.npy   igual que los nombres
+
+Construirlo (descarga todo de PokeAPI una vez):
+
+    uv run python -m app.infra.dex_store build
+"""
+import hashlib
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+FORMAT_VERSION = 1
+
+DEFAULT_DEX_DIR = Path(__file__).resolve().parents[1] / "data" / "dex"
+
+STAT_KEYS = (
+    "hp",
+    "attack",
+    "defense",
+    "special_attack",
+    "special_defense",
+    "speed",
+)
+
+TYPE_NAMES = (
+    "normal", "fire", "water", "electric", "grass", "ice",
+    "fighting", "poison", "ground", "flying", "psychic", "bug",
+    "rock", "ghost", "dragon", "dark", "steel", "fairy",
+)
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+FLAG_DEFAULT_FORM = 1
+
+# último id de especie de cada generación (dex nacional)
+_GENERATION_BOUNDS = (151, 251, 386, 493, 649, 721, 809, 905, 1025)
+
+
+def generation_of_species(species_id: int) -> int:
+    for gen, last in enumerate(_GENERATION_BOUNDS, start=1):
+        if species_id <= last:
+            return gen
+    return 0
+
+
+# ----------------------------
+# Tablas de strings
+# ----------------------------
+def _pack_strings(values: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.uint64)
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, blob
+
+
+class _StringTable:
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __getitem__(self, row: int) -> str:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+
+# ----------------------------
+# Lectura
+# ----------------------------
+class DexStore:
+    """Vista de solo lectura sobre el dex columnar (arrays mapeados en memoria)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dex format version: {meta.get('version')}")
+        if tuple(meta.get("stat_keys", ())) != STAT_KEYS or tuple(meta.get("type_names", ())) != TYPE_NAMES:
+            raise ValueError("Dex dataset was built with a different stat/type layout")
+
+        def load(name: str) -> np.ndarray:
+            # view() quita la subclase np.memmap (más lenta al indexar) sin copiar
+            return np.load(self.path / f"{name}.npy", mmap_mode="r").view(np.ndarray)
+
+        self.ids = load("ids")
+        self.species = load("species")
+        self.generation = load("generation")
+        self.flags = load("flags")
+        self.types = load("types")
+        self.stats = load("stats")
+        self.name_keys = load("name_keys")
+        self.name_order = load("name_order")
+        self._names = _StringTable(load("names.offsets"), load("names.blob"))
+        self._sprites = _StringTable(load("sprites.offsets"), load("sprites.blob"))
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    # --- columnas derivadas (pequeñas, se calculan una vez por proceso) ---
+    @cached_property
+    def bst(self) -> np.ndarray:
+        return self.stats.sum(axis=1, dtype=np.int32)
+
+    @cached_property
+    def type_mask(self) -> np.ndarray:
+        """Bitmask uint32 por fila: bit `code` encendido si la fila tiene ese tipo."""
+        mask = np.zeros(len(self), dtype=np.uint32)
+        for slot in range(self.types.shape[1]):
+            codes = self.types[:, slot]
+            present = codes >= 0
+            mask[present] |= np.left_shift(np.uint32(1), codes[present].astype(np.uint32))
+        return mask
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash corto del contenido; cambia cada vez que se reconstruye el dataset."""
+        h = hashlib.sha1()
+        for arr in (self.ids, self.types, self.stats, self.flags):
+            h.update(arr.tobytes())
+        h.update(self._names.blob.tobytes())
+        h.update(self._sprites.blob.tobytes())
+        return h.hexdigest()[:16]
+
+    def stat_column(self, key: str) -> np.ndarray:
+        if key == "bst":
+            return self.bst
+        return self.stats[:, STAT_KEYS.index(key)]
+
+    # --- lookup ---
+    def row_of_id(self, pokemon_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self.ids, pokemon_id))
+        if row < len(self) and int(self.ids[row]) == pokemon_id:
+            return row
+        return None
+
+    def row_of_name(self, name: str) -> Optional[int]:
+        # búsqueda binaria sobre name_keys, sin construir un dict por proceso
+        key = name.encode("utf-8")
+        pos = int(np.searchsorted(self.name_keys, key))
+        if pos < len(self) and self.name_keys[pos] == key:
+            return int(self.name_order[pos])
+        return None
+
+    def resolve(self, name_or_id: str | int) -> Optional[int]:
+        key = str(name_or_id).strip().lower()
+        if key.isdigit():
+            return self.row_of_id(int(key))
+        return self.row_of_name(key)
+
+    # --- columnas por fila ---
+    def name(self, row: int) -> str:
+        return self._names[row]
+
+    def sprite(self, row: int) -> Optional[str]:
+        return self._sprites[row] or None
+
+    def type_names(self, row: int) -> List[str]:
+        return [TYPE_NAMES[c] for c in self.types[row].tolist() if c >= 0]
+
+    def is_default_form(self, row: int) -> bool:
+        return bool(self.flags[row] & FLAG_DEFAULT_FORM)
+
+    def summary(self, row: int) -> Dict[str, Any]:
+        return {
+            "id": int(self.ids[row]),
+            "name": self.name(row),
+            "sprite": self.sprite(row),
+            "types": self.type_names(row),
+        }
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Misma forma que `pokedapi.normalize_pokemon`."""
+        record = self.summary(row)
+        record["stats"] = dict(zip(STAT_KEYS, self.stats[row].tolist()))
+        return record
+
+
+_store: Optional[DexStore] = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+
+def dex_dir() -> Path:
+    return Path(settings.DEX_DATA_DIR) if settings.DEX_DATA_DIR else DEFAULT_DEX_DIR
+
+
+def get_dex_store() -> Optional[DexStore]:
+    """Devuelve el dex mapeado del proceso, o None si el dataset no fue construido."""
+    global _store, _store_loaded
+    if _store_loaded:
+        return _store
+    with _store_lock:
+        if not _store_loaded:
+            path = dex_dir()
+            _store = DexStore(path) if (path / "meta.json").exists() else None
+            _store_loaded = True
+    return _store
+
+
+# ----------------------------
+# Escritura
+# ----------------------------
+def dex_entry_from_raw(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Registro normalizado + metadatos de especie/forma a partir del JSON crudo."""
+    from app.infra.pokedapi import normalize_pokemon
+
+    entry = normalize_pokemon(raw)
+    species_url = (raw.get("species") or {}).get("url", "")
+    species_id = int(species_url.rstrip("/").rsplit("/", 1)[-1]) if species_url else raw["id"]
+    entry["species_id"] = species_id
+    entry["is_default"] = bool(raw.get("is_default", True))
+    return entry
+
+
+def write_dex(entries: Iterable[Dict[str, Any]], out_dir: Path) -> Path:
+    """Escribe el dataset columnar. `entries` usa la forma de `dex_entry_from_raw`."""
+    entries = sorted(entries, key=lambda e: e["id"])
+    n = len(entries)
+
+    ids = np.array([e["id"] for e in entries], dtype=np.int32)
+    species = np.array([e.get("species_id", e["id"]) for e in entries], dtype=np.int16)
+    generation = np.array([generation_of_species(int(s)) for s in species], dtype=np.int8)
+    flags = np.array(
+        [FLAG_DEFAULT_FORM if e.get("is_default", True) else 0 for e in entries],
+        dtype=np.uint8,
+    )
+
+    types = np.full((n, 2), -1, dtype=np.int8)
+    stats = np.zeros((n, len(STAT_KEYS)), dtype=np.int16)
+    for row, e in enumerate(entries):
+        for slot, t in enumerate(e["types"][:2]):
+            types[row, slot] = TYPE_CODES[t]
+        stats[row] = [e["stats"][k] for k in STAT_KEYS]
+
+    names = [e["name"] for e in entries]
+    name_order = np.array(sorted(range(n), key=lambda i: names[i].encode("utf-8")), dtype=np.int32)
+    name_keys = np.array([names[i].encode("utf-8") for i in name_order], dtype=np.bytes_)
+    names_offsets, names_blob = _pack_strings(names)
+    sprites_offsets, sprites_blob = _pack_strings(e.get("sprite") or "" for e in entries)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    columns = {
+        "ids": ids,
+        "species": species,
+        "generation": generation,
+        "flags": flags,
+        "types": types,
+        "stats": stats,
+        "name_keys": name_keys,
+        "name_order": name_order,
+        "names.offsets": names_offsets,
+        "names.blob": names_blob,
+        "sprites.offsets": sprites_offsets,
+        "sprites.blob": sprites_blob,
+    }
+    for name, arr in columns.items():
+        np.save(out_dir / f"{name}.npy", arr)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "count": n,
+        "stat_keys": list(STAT_KEYS),
+        "type_names": list(TYPE_NAMES),
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+    return out_dir
+
+
+def build_from_pokeapi(out_dir: Path, workers: int = 16) -> Path:
+    """Descarga todos los Pokémon de PokeAPI y escribe el dataset columnar."""
+    from app.infra import pokedapi
+
+    listing = pokedapi.search_names("", limit=5000)
+    ids = [item["id"] for item in listing if item["id"] is not None]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        raws = list(pool.map(pokedapi.fetch_pokemon_raw, ids))
+
+    return write_dex((dex_entry_from_raw(raw) for raw in raws), out_dir)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("usage: python -m app.infra.dex_store build [out_dir]")
+        sys.exit(1)
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else dex_dir()
+    path = build_from_pokeapi(target)
+    print(f"dex written to {path}")
+
+    # roles junto al dataset, para que ningún request tenga que calcularlos
+    from app.domain.services.role_service import RoleIndex
+
+    RoleIndex.build(DexStore(path)).save(path)
+    print(f"roles written to {path}")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -16,12 +16,14 @@ class CollectionItem(Base):
     __tablename__ = "collection_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     pokemon_id = Column(Integer, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     __table_args__ = (
         UniqueConstraint("user_id", "pokemon_id", name="uq_user_pokemon"),
+        # cubre list_ids: filtro por usuario y orden created_at, id sin ir a la tabla
+        Index("ix_collection_items_user_created", "user_id", "created_at", "id", "pokemon_id"),
     )
 
     user = relationship("User")
@@ -30,15 +32,19 @@ class Team(Base):
     __tablename__ = "teams"
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # sube con cada cambio del team o su roster; arma el ETag del detalle
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     members = relationship(
         "TeamMember",
         back_populates="team",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        # team_id primero: en selectin (team_id IN ...) el orden sale de ix_team_members_team_slot
+        order_by=lambda: (TeamMember.team_id, TeamMember.slot, TeamMember.id),
     )
 
 
@@ -47,9 +53,32 @@ class TeamMember(Base):
 
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
-    pokemon_id = Column(Integer, nullable=False)
+    pokemon_id = Column(Integer, nullable=False, index=True)
     slot = Column(Integer, nullable=True)
 
+    # snapshot del Pokémon al agregarlo; el detalle del equipo se arma sin lookups
+    name = Column(String, nullable=True)
+    sprite = Column(String, nullable=True)
+    type_codes = Column(String, nullable=True)  # códigos de TYPE_NAMES, ej. "1,9"
+    snapshot_fp = Column(String, nullable=True)  # fingerprint del dex usado
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    team = relationship("Team", back_populates="members")
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint("team_id", "pokemon_id", name="uq_team_pokemon"),
+        # roster en orden de slot sin ordenar en memoria; un miembro por slot
+        Index("ix_team_members_team_slot", "team_id", "slot", unique=True),
+    )
+
+    team = relationship("Team", back_populates="members")
+
+
+class TournamentMatch(Base):
+    """Valor de un cruce del torneo, compartido entre workers (ver tournament_service)."""
+    __tablename__ = "tournament_matches"
+
+    # fingerprint del dex + hashes de roster en orden (hash_a < hash_b)
+    fingerprint = Column(String(16), primary_key=True)
+    hash_a = Column(String(16), primary_key=True)
+    hash_b = Column(String(16), primary_key=True)
+    value = Column(Float, nullable=False)  # para el roster de hash_a
@@ -0,0 +1,33 @@
+"""
+Pool de procesos compartido para cálculo pesado con NumPy (simulaciones,
+torneos). Se crea la primera vez que se usa y vive lo que vive el proceso:
+arrancar cpu_count procesos en cada request cuesta más que el cálculo.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def cpu_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=cpu_workers())
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
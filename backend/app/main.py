@@ -1,13 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.api.routers import auth, pokedex, collection, teams, ai
+from app.api.routers import auth, pokedex, collection, teams, ai, types, battles, matchups
+from app.domain.services.member_snapshot_service import start_refresh_job
+from app.infra.workers import shutdown_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # si el dex cambió desde la última vez, refresca los snapshots de los equipos
+    start_refresh_job()
+    yield
+    shutdown_pool()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth.router, prefix="/auth")
 app.include_router(pokedex.router)
 app.include_router(collection.router)
 app.include_router(teams.router)
 app.include_router(ai.router)
+app.include_router(types.router)
+app.include_router(battles.router)
+app.include_router(matchups.router)
 
 @app.get("/")
 def read_root():
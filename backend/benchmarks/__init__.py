@@ -0,0 +1,12 @@
+"""
+Benchmarks locales. Ejecutar desde backend/:
+
+    uv run python -m benchmarks.bench_dex_store
+"""
+import os
+
+# la app exige estas variables al importar settings
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+# los servicios de IA crean el cliente de OpenAI al importarse (no se llama)
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
@@ -0,0 +1,48 @@
+"""
+Dex sintético para los benchmarks (no requiere red).
+
+Genera ~1300 registros con la misma forma que `dex_store.dex_entry_from_raw`
+y los escribe con el writer real, así los benchmarks ejercitan el formato
+columnar tal cual lo usa la app.
+"""
+import os
+import random
+import tempfile
+from pathlib import Path
+
+from app.infra.dex_store import TYPE_NAMES, STAT_KEYS, write_dex
+
+SPRITE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{}.png"
+
+
+def synthetic_entries(n: int = 1300, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    entries = []
+    n_forms = max(0, n - 1025)
+    ids = list(range(1, n - n_forms + 1)) + list(range(10001, 10001 + n_forms))
+    for pid in ids:
+        species_id = pid if pid <= 1025 else rng.randint(1, 1025)
+        types = rng.sample(TYPE_NAMES, rng.choice((1, 2)))
+        entries.append({
+            "id": pid,
+            "name": f"poke-{pid}",
+            "sprite": SPRITE_URL.format(pid),
+            "types": types,
+            "stats": {k: rng.randint(5, 200) for k in STAT_KEYS},
+            "species_id": species_id,
+            "is_default": pid <= 1025,
+        })
+    return entries
+
+
+def use_synthetic_dex(n: int = 1300) -> Path:
+    """Escribe un dex sintético en un directorio temporal y apunta la app a él."""
+    from app.core.config import settings
+    import app.infra.dex_store as dex_store
+
+    out = Path(tempfile.mkdtemp(prefix="dex-bench-"))
+    write_dex(synthetic_entries(n), out)
+    os.environ["DEX_DATA_DIR"] = str(out)
+    settings.DEX_DATA_DIR = str(out)
+    dex_store._store_loaded = False
+    return out
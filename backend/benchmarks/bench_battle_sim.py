@@ -0,0 +1,50 @@
+"""
+Simulador Monte Carlo: combates simulados por segundo (por núcleo y con pool).
+"""
+import os
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import synthetic_entries
+
+
+def _arrays(n: int, seed: int = 0):
+    from app.domain.services.battle_sim_service import _arrays
+
+    entries = synthetic_entries(seed=seed)
+    rng = np.random.default_rng(seed)
+    a = [entries[i] for i in rng.integers(0, len(entries), n)]
+    b = [entries[i] for i in rng.integers(0, len(entries), n)]
+    return (*_arrays(a), *_arrays(b))
+
+
+def _rate(pairs: int, trials: int, workers: int, runs: int = 3) -> float:
+    from app.domain.services.battle_sim_service import simulate_pairs
+
+    arrays = _arrays(pairs)
+    simulate_pairs(*arrays, trials=trials, seed=0, workers=workers)  # warm-up
+    t0 = time.perf_counter()
+    for r in range(runs):
+        simulate_pairs(*arrays, trials=trials, seed=r, workers=workers)
+    return pairs * trials * runs / (time.perf_counter() - t0)
+
+
+def main():
+    from app.domain.services.battle_sim_service import POOL_MIN_SIMULATIONS
+
+    cores = os.cpu_count() or 1
+    for pairs, trials in ((1, 100_000), (500, 1_000), (5_000, 1_000)):
+        rate = _rate(pairs, trials, workers=1)
+        print(f"{pairs:5d} pairs x {trials:6d} trials, 1 core : {rate / 1e6:6.2f} M battles/s")
+    if cores > 1:
+        # el lote más chico que va al pool (POOL_MIN_SIMULATIONS) y uno grande
+        for pairs in (POOL_MIN_SIMULATIONS // 1_000, 5_000):
+            single = _rate(pairs, 1_000, workers=1)
+            rate = _rate(pairs, 1_000, workers=cores)
+            print(f"{pairs:5d} pairs x   1000 trials, {cores} procs: {rate / 1e6:6.2f} M battles/s "
+                  f"(x{rate / single:.2f} vs 1 core)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Counters de la colección: costo de ordenar N Pokémon contra un rival.
+"""
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import use_synthetic_dex
+
+RUNS = 1_000
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services.counter_service import rank_counters
+    from app.domain.services.dex_features import get_dex_features
+
+    features = get_dex_features()
+    rng = np.random.default_rng(0)
+    total = len(features.store)
+    for size in (10, 100, 1000):
+        rows = rng.choice(total, size=size, replace=False)
+        t0 = time.perf_counter()
+        for i in range(RUNS):
+            rank_counters(features, rows, i % total)
+        us = (time.perf_counter() - t0) / RUNS * 1e6
+        print(f"collection {size:5d}: {us:7.1f} us per ranking")
+
+
+if __name__ == "__main__":
+    main()
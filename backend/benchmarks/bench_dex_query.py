@@ -0,0 +1,37 @@
+"""
+Costo de evaluar `/pokedex/query` (máscaras + orden + página) sobre el dex.
+"""
+import time
+
+from benchmarks._synthetic import use_synthetic_dex
+
+RUNS = 2_000
+
+CASES = {
+    "no filters, sort id": {},
+    "speed>=100 & spa>=120, sort -bst": {"where": ["speed>=100", "special_attack>=120"], "sort": "-bst"},
+    "type fire, gen 1, sort -speed": {"types": ["fire"], "generation": 1, "sort": "-speed"},
+    "default forms, bst>=500, sort attack": {"forms": "default", "where": ["bst>=500"], "sort": "attack"},
+}
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services import dex_query_service
+
+    dex_query_service.query_rows()  # cachea bst / type_mask
+    for label, kwargs in CASES.items():
+        t0 = time.perf_counter()
+        for _ in range(RUNS):
+            rows = dex_query_service.query_rows(**kwargs)
+        rows_us = (time.perf_counter() - t0) / RUNS * 1e6
+
+        t0 = time.perf_counter()
+        for _ in range(RUNS):
+            dex_query_service.query_pokemon(**kwargs, limit=20)
+        page_us = (time.perf_counter() - t0) / RUNS * 1e6
+        print(f"{label:<40} matches {rows.size:5d}  eval {rows_us:7.1f} us  eval+page(20) {page_us:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
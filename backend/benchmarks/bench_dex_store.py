@@ -0,0 +1,95 @@
+"""
+Dex mapeado en memoria vs. cache de dicts por proceso.
+
+Levanta W procesos (como W workers de uvicorn). Cada uno carga el dex completo
+en su modo y reporta RSS / PSS (PSS reparte las páginas compartidas entre los
+procesos que las mapean). Los lookups de `get_pokemon` se miden worker por
+worker para que la contención de CPU no ensucie la latencia.
+"""
+import multiprocessing as mp
+import time
+
+from benchmarks._synthetic import synthetic_entries, use_synthetic_dex
+
+WORKERS = 4
+LOOKUPS = 20_000
+
+
+def _mem_kb() -> tuple[int, int]:
+    rss = pss = 0
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except FileNotFoundError:
+        pass
+    return rss, pss
+
+
+def _worker(mode: str, dex_dir: str, barrier, lock, out):
+    import os
+    os.environ["DEX_DATA_DIR"] = dex_dir
+
+    from app.core.config import settings
+    from app.domain.services import pokemon_service
+    from app.infra import dex_store
+    from app.infra.cache import local_cache
+
+    base_rss, base_pss = _mem_kb()
+
+    if mode == "dict":
+        settings.DEX_DATA_DIR = "/nonexistent"
+        entries = synthetic_entries()
+        ids = [e["id"] for e in entries]
+        for e in entries:
+            record = {k: e[k] for k in ("id", "name", "sprite", "types", "stats")}
+            local_cache.set(f"pokemon:{e['id']}", record, 3600)
+            local_cache.set(f"pokemon:{e['name']}", record, 3600)
+        del entries
+    else:
+        settings.DEX_DATA_DIR = dex_dir
+        store = dex_store.get_dex_store()
+        ids = store.ids.tolist()
+        for row in range(len(store)):
+            store.record(row)
+
+    with lock:
+        t0 = time.perf_counter()
+        for i in range(LOOKUPS):
+            pokemon_service.get_pokemon(ids[i % len(ids)])
+        elapsed = time.perf_counter() - t0
+
+    barrier.wait()  # todos los workers vivos con el dex cargado
+    rss, pss = _mem_kb()
+    barrier.wait()
+    out.put((mode, rss - base_rss, pss - base_pss, elapsed / LOOKUPS * 1e6))
+
+
+def main():
+    dex_dir = str(use_synthetic_dex())
+    ctx = mp.get_context("spawn")
+
+    for mode in ("dict", "mmap"):
+        barrier = ctx.Barrier(WORKERS)
+        lock = ctx.Lock()
+        out = ctx.Queue()
+        procs = [ctx.Process(target=_worker, args=(mode, dex_dir, barrier, lock, out)) for _ in range(WORKERS)]
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        rss = sum(r[1] for r in results) / WORKERS
+        pss = sum(r[2] for r in results) / WORKERS
+        us = sum(r[3] for r in results) / WORKERS
+        print(f"{mode:>5}: +RSS/worker {rss:8.0f} KiB  +PSS/worker {pss:8.0f} KiB  get_pokemon {us:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Matriz de enfrentamientos: cálculo vectorizado y serialización (completa y NDJSON).
+"""
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import use_synthetic_dex
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services import battle_model, matchup_service
+    from app.domain.services.pokemon_service import require_dex_store
+
+    store = require_dex_store()
+    for n in (10, 100, 1000):
+        ids = store.ids[:n].tolist()
+        rows = np.arange(n)
+
+        t0 = time.perf_counter()
+        battle_model.matchup_matrix(store.stats[rows], store.types[rows], store.stats[rows], store.types[rows])
+        compute = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        body = matchup_service.matchup_matrix(ids, ids)
+        full = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        first = None
+        for chunk in matchup_service.stream_matchup_matrix(ids, ids):
+            if first is None:
+                first = (time.perf_counter() - t0) * 1000
+        stream = (time.perf_counter() - t0) * 1000
+
+        print(f"{n:4d} x {n:<4d}: compute {compute:7.2f} ms | full response {full:7.2f} ms "
+              f"({len(body) / 1e6:.1f} MB) | stream {stream:7.2f} ms (first line {first:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+300 llamadas a /pokedex/look vs. una sola llamada a /pokedex/batch.
+
+Se mide en proceso con TestClient (sin red real). Para el caso "cold" se
+simula la latencia de PokeAPI reemplazando `fetch_pokemon_raw` por una
+función que duerme UPSTREAM_LATENCY y devuelve un JSON crudo sintético.
+"""
+import time
+
+from benchmarks._synthetic import synthetic_entries, use_synthetic_dex
+
+N = 300
+UPSTREAM_LATENCY = 0.02
+
+
+def _raw(entry: dict) -> dict:
+    stat_names = {"special_attack": "special-attack", "special_defense": "special-defense"}
+    return {
+        "id": entry["id"],
+        "name": entry["name"],
+        "sprites": {"front_default": entry["sprite"]},
+        "types": [{"slot": i + 1, "type": {"name": t}} for i, t in enumerate(entry["types"])],
+        "stats": [{"stat": {"name": stat_names.get(k, k)}, "base_stat": v} for k, v in entry["stats"].items()],
+    }
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    import os
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    use_synthetic_dex()
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.infra import dex_store, pokedapi
+    from app.infra.cache import local_cache
+    from app.main import app
+
+    client = TestClient(app)
+    ids = [e["id"] for e in synthetic_entries()][:N]
+    joined = ",".join(map(str, ids))
+
+    def singles():
+        for pid in ids:
+            client.get(f"/pokedex/look/{pid}")
+
+    def one_batch():
+        client.get("/pokedex/batch", params={"ids": joined})
+
+    print(f"warm (local dex), {N} Pokémon")
+    print(f"  {N} x /pokedex/look : {_timed(singles):8.1f} ms")
+    print(f"  1 x /pokedex/batch  : {_timed(one_batch):8.1f} ms")
+
+    # cold: sin dex local, cache vacía, PokeAPI con latencia simulada
+    by_id = {str(e["id"]): e for e in synthetic_entries()}
+
+    def slow_fetch(name_or_id):
+        time.sleep(UPSTREAM_LATENCY)
+        return _raw(by_id[str(name_or_id)])
+
+    pokedapi.fetch_pokemon_raw = slow_fetch
+    settings.DEX_DATA_DIR = "/nonexistent"
+    dex_store._store_loaded = False
+
+    print(f"cold cache, upstream {UPSTREAM_LATENCY * 1000:.0f} ms/call")
+    local_cache._data.clear()
+    print(f"  {N} x /pokedex/look : {_timed(singles):8.1f} ms")
+    local_cache._data.clear()
+    print(f"  1 x /pokedex/batch  : {_timed(one_batch):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
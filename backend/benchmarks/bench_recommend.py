@@ -0,0 +1,33 @@
+"""
+Recomendador local: costo de puntuar todo el dex contra una colección.
+"""
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import use_synthetic_dex
+
+RUNS = 500
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services.dex_features import get_dex_features
+    from app.domain.services.recommend_service import collection_gaps, score_candidates
+
+    features = get_dex_features()
+    rng = np.random.default_rng(0)
+    total = len(features.store)
+    for size in (1, 20, 200, 1000):
+        owned = np.sort(rng.choice(total, size=size, replace=False))
+        t0 = time.perf_counter()
+        for _ in range(RUNS):
+            score = score_candidates(features, owned, collection_gaps(features, owned))
+            top = np.argpartition(-score, 4)[:5]
+            top[np.argsort(-score[top])]
+        us = (time.perf_counter() - t0) / RUNS * 1e6
+        print(f"collection {size:5d}: score {total} candidates + top-5 {us:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
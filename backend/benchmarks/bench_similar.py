@@ -0,0 +1,43 @@
+"""
+Vecinos más cercanos en espacio de stats: latencia por consulta y en lote.
+"""
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import use_synthetic_dex
+
+RUNS = 2_000
+
+
+def _per_call_us(fn, runs: int = RUNS) -> float:
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - t0) / runs * 1e6
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services import similar_service
+
+    index = similar_service.get_similarity_index()
+    rows = np.array([123])
+
+    for metric in similar_service.METRICS:
+        t0 = time.perf_counter()
+        index.table(metric)
+        build_ms = (time.perf_counter() - t0) * 1000
+        raw = _per_call_us(lambda: index.top_k(rows, 10, metric, 0.4))
+        table = _per_call_us(lambda: similar_service.similar_pokemon("123", 10, metric))
+        live = _per_call_us(lambda: similar_service.similar_pokemon("123", 10, metric, 0.4))
+        print(f"{metric:>9}: top-k table build {build_ms:6.1f} ms | kernel {raw:6.1f} us | "
+              f"endpoint (table) {table:6.1f} us | endpoint (live) {live:6.1f} us")
+
+    keys = [str(i) for i in range(1, 201)]
+    batch = _per_call_us(lambda: similar_service.similar_pokemon_batch(keys, 10, "cosine", 0.4), runs=50)
+    print(f"batch of {len(keys)} (live): {batch / 1000:6.2f} ms total, {batch / len(keys):6.1f} us per Pokémon")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Costo de `analyze_roster` para un equipo de 6, con y sin cache.
+"""
+import time
+
+from benchmarks._synthetic import use_synthetic_dex
+
+RUNS = 2_000
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services.team_analysis_service import analyze_roster
+    from app.infra.cache import local_cache
+
+    roster = [3, 6, 9, 25, 143, 10005]
+
+    t0 = time.perf_counter()
+    for _ in range(RUNS):
+        local_cache._data.clear()
+        analyze_roster(roster)
+    cold = (time.perf_counter() - t0) / RUNS * 1e6
+
+    t0 = time.perf_counter()
+    for _ in range(RUNS):
+        analyze_roster(roster)
+    warm = (time.perf_counter() - t0) / RUNS * 1e6
+
+    print(f"analyze_roster(6): computed {cold:6.1f} us | cached {warm:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Listado de teams: consultas SQL por llamada según cuántos teams tiene el
+usuario. Falla si el conteo deja de ser constante.
+
+Usa su propia base SQLite temporal (no la de DATABASE_URL), así se puede
+correr las veces que haga falta.
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmp.name) / 'listing.db'}"
+
+N_TEAMS = (1, 10, 50, 200)
+RUNS = 50
+
+
+def _count_statements(engine, fn) -> tuple[int, float]:
+    count = 0
+
+    def on_execute(*_):
+        nonlocal count
+        count += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        t0 = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - t0) * 1000
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return count, elapsed
+
+
+def _legacy_list(db, user_id):
+    # lo que hacía list_teams antes: un lazy load de members por team
+    from app.infra.orm import Team
+
+    teams = db.query(Team).filter(Team.user_id == user_id).all()
+    return [len(t.members) for t in teams]
+
+
+def main():
+    from app.domain.services.team_service import list_teams
+    from app.infra.db import SessionLocal, engine
+    from app.infra.orm import Base, Team, TeamMember, User
+
+    Base.metadata.create_all(engine)
+    counts = set()
+    for n in N_TEAMS:
+        with SessionLocal() as db:
+            user = User(email=f"bench-{n}@example.com", password_hash="x")
+            db.add(user)
+            db.flush()
+            for t in range(n):
+                team = Team(user_id=user.id, name=f"team-{t}")
+                team.members = [TeamMember(pokemon_id=p) for p in range(1, 1 + t % 7)]
+                db.add(team)
+            db.commit()
+            user_id = user.id
+
+        with SessionLocal() as db:
+            before, _ = _count_statements(engine, lambda: _legacy_list(db, user_id))
+        with SessionLocal() as db:
+            after, _ = _count_statements(engine, lambda: list_teams(db, user_id))
+            t0 = time.perf_counter()
+            for _ in range(RUNS):
+                list_teams(db, user_id)
+            ms = (time.perf_counter() - t0) / RUNS * 1000
+            page, _ = _count_statements(engine, lambda: list_teams(db, user_id, after=10**9, limit=20))
+        counts.update((after, page))
+        print(f"{n:4d} teams: lazy members {before:4d} queries | grouped count {after} query "
+              f"({ms:6.2f} ms) | keyset page {page} query")
+
+    assert counts == {1}, f"list_teams query count is not constant: {sorted(counts)}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Sentencias SQL y latencia por mutación de team (agregar, renombrar,
+quitar, borrar), incluyendo el commit y el detalle devuelto.
+"""
+import time
+
+from sqlalchemy import event
+
+from benchmarks._synthetic import use_synthetic_dex
+
+RUNS = 200
+
+
+class _Counter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __call__(self, *_):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *_):
+        event.remove(self.engine, "before_cursor_execute", self)
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services import team_service
+    from app.infra.db import SessionLocal, engine
+    from app.infra.dex_store import get_dex_store
+    from app.infra.orm import Base, CollectionItem, User
+
+    Base.metadata.create_all(engine)
+    ids = get_dex_store().ids[:7].tolist()
+    with SessionLocal() as db:
+        user = User(email="bench-mutations@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        db.add_all([CollectionItem(user_id=user.id, pokemon_id=p) for p in ids])
+        db.commit()
+        user_id = user.id
+
+    def measure(label, fn):
+        with SessionLocal() as db, _Counter(engine) as counter:
+            fn(db)
+        # latencia con sesión nueva en cada corrida, como una request
+        t0 = time.perf_counter()
+        for _ in range(RUNS):
+            with SessionLocal() as db:
+                fn(db)
+        ms = (time.perf_counter() - t0) / RUNS * 1000
+        print(f"{label:<16} {counter.count:3d} statements | {ms:6.2f} ms")
+
+    with SessionLocal() as db:
+        team_id = team_service.create_team(db, user_id, "bench")["id"]
+        for p in ids[:5]:
+            team_service.add_member(db, user_id, team_id, p)
+
+    p = ids[5]
+    measure("add member", lambda db: (
+        team_service.add_member(db, user_id, team_id, p),
+        team_service.remove_member(db, user_id, team_id, p),
+    ) and None)
+    with SessionLocal() as db, _Counter(engine) as add_only:
+        team_service.add_member(db, user_id, team_id, p)
+    with SessionLocal() as db, _Counter(engine) as remove_only:
+        team_service.remove_member(db, user_id, team_id, p)
+    print(f"{'  add only':<16} {add_only.count:3d} statements")
+    print(f"{'  remove only':<16} {remove_only.count:3d} statements")
+    measure("rename", lambda db: team_service.rename_team(db, user_id, team_id, "renamed"))
+    measure("get detail", lambda db: team_service.get_team(db, user_id, team_id))
+
+    def create_and_delete(db):
+        tid = team_service.create_team(db, user_id, "tmp")["id"]
+        team_service.delete_team(db, user_id, tid)
+
+    with SessionLocal() as db:
+        tid = team_service.create_team(db, user_id, "tmp")["id"]
+    with SessionLocal() as db, _Counter(engine) as delete_only:
+        team_service.delete_team(db, user_id, tid)
+    print(f"{'delete team':<16} {delete_only.count:3d} statements")
+    measure("create+delete", create_and_delete)
+
+
+if __name__ == "__main__":
+    main()
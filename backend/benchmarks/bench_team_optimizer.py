@@ -0,0 +1,34 @@
+"""
+Optimizador local de auto-team: latencia según el tamaño de la colección.
+"""
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import use_synthetic_dex
+
+RUNS = 50
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services.dex_features import get_dex_features
+    from app.domain.services.team_optimizer import optimize_team
+
+    t0 = time.perf_counter()
+    features = get_dex_features()
+    print(f"dex features build: {(time.perf_counter() - t0) * 1000:6.1f} ms")
+
+    rng = np.random.default_rng(0)
+    total = len(features.store)
+    for size in (6, 100, 1000, total):
+        rows = rng.choice(total, size=size, replace=False).tolist()
+        t0 = time.perf_counter()
+        for _ in range(RUNS):
+            optimize_team(features, rows)
+        ms = (time.perf_counter() - t0) / RUNS * 1000
+        print(f"collection {size:5d}: {ms:7.2f} ms per team")
+
+
+if __name__ == "__main__":
+    main()
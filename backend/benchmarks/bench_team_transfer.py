@@ -0,0 +1,64 @@
+"""
+Import / export de teams para una cuenta grande: latencia y sentencias SQL.
+"""
+import time
+
+from sqlalchemy import event
+
+from benchmarks._synthetic import use_synthetic_dex
+
+N_TEAMS = 500
+
+
+def main():
+    use_synthetic_dex()
+    import numpy as np
+
+    from app.domain.services.team_transfer_service import import_teams, showdown_species, stream_export
+    from app.infra.db import SessionLocal, engine
+    from app.infra.dex_store import get_dex_store
+    from app.infra.orm import Base, User
+
+    Base.metadata.create_all(engine)
+    store = get_dex_store()
+    rng = np.random.default_rng(0)
+    text = "".join(
+        f"=== [gen9ou] team-{t} ===\n\n"
+        + "".join(f"{showdown_species(store.name(r))} @ Leftovers\nAbility: X\n- Tackle\n\n"
+                  for r in rng.choice(len(store), 6, replace=False).tolist())
+        for t in range(N_TEAMS)
+    )
+
+    with SessionLocal() as db:
+        user = User(email="bench-transfer@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    statements = 0
+
+    def on_execute(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    with SessionLocal() as db:
+        t0 = time.perf_counter()
+        result = import_teams(db, user_id, text, "showdown", add_to_collection=True)
+        ms = (time.perf_counter() - t0) * 1000
+    members = sum(t["count"] for t in result["teams"])
+    print(f"import {result['created']} teams / {members} members ({len(text) / 1024:.0f} KiB): "
+          f"{ms:7.1f} ms, {statements} statements")
+
+    for fmt in ("showdown", "ndjson"):
+        statements = 0
+        with SessionLocal() as db:
+            t0 = time.perf_counter()
+            size = sum(len(chunk) for chunk in stream_export(db, user_id, fmt))
+            ms = (time.perf_counter() - t0) * 1000
+        print(f"export {fmt:>8}: {ms:7.1f} ms, {size / 1024:.0f} KiB, {statements} statements")
+    event.remove(engine, "before_cursor_execute", on_execute)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Torneo todos contra todos: frío, con cache, tras cambiar un equipo y desde
+otro worker (solo la tabla compartida, sin local_cache).
+"""
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import use_synthetic_dex
+
+
+def _ms(fn) -> tuple[float, dict]:
+    t0 = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - t0) * 1000, result
+
+
+def main():
+    use_synthetic_dex()
+    from app.domain.services.dex_features import get_dex_features
+    from app.domain.services.tournament_service import play_matches, run_tournament
+    from app.infra.cache import local_cache
+    from app.infra.db import SessionLocal, engine
+    from app.infra.orm import Base, TournamentMatch
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+
+    store = get_dex_features().store
+    rng = np.random.default_rng(0)
+    for n_teams in (10, 100, 400):
+        local_cache._data.clear()
+        db.query(TournamentMatch).delete()
+        db.commit()
+        teams = [
+            {"id": t, "name": f"team-{t}", "pokemon_ids": store.ids[rng.choice(len(store), 6, replace=False)].tolist()}
+            for t in range(n_teams)
+        ]
+        cold, r = _ms(lambda: run_tournament(db, teams))
+        warm, _ = _ms(lambda: run_tournament(db, teams))
+        teams[0]["pokemon_ids"] = teams[0]["pokemon_ids"][:5]
+        inc, r2 = _ms(lambda: run_tournament(db, teams))
+        # otro worker: sin local_cache, todo sale de la tabla
+        local_cache._data.clear()
+        shared, r3 = _ms(lambda: run_tournament(db, teams))
+        assert r3["computed"] == 0
+        print(f"{n_teams:4d} teams ({r['matches']:6d} matches): cold {cold:8.1f} ms | cached {warm:7.1f} ms | "
+              f"one team changed {inc:7.1f} ms ({r2['computed']} recomputed) | other worker {shared:7.1f} ms")
+
+    # el pool de procesos da el mismo resultado que el cálculo en proceso
+    features = get_dex_features()
+    rosters = [rng.choice(len(store), 6, replace=False) for _ in range(300)]
+    pairs = [(i, j) for i in range(300) for j in range(i + 1, 300)]
+    single, a = _ms(lambda: play_matches(features, rosters, pairs, workers=1))
+    pooled, b = _ms(lambda: play_matches(features, rosters, pairs, workers=2))
+    assert np.allclose(a, b)
+    print(f"{len(pairs)} matches: in-process {single:.1f} ms | process pool (2) {pooled:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
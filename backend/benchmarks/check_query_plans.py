@@ -0,0 +1,145 @@
+"""
+EXPLAIN QUERY PLAN de las consultas calientes de los repositorios.
+
+Crea una base SQLite temporal con las migraciones de Alembic (no con
+create_all), ejecuta cada método de repositorio capturando el SQL que emite
+y revisa el plan de cada sentencia: falla si alguna recorre una tabla o un
+índice completo (SCAN, salvo las de FULL_SCAN_ALLOWED) o necesita un
+B-tree temporal para ordenar.
+
+    uv run python -m benchmarks.check_query_plans
+"""
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+_tmp = tempfile.TemporaryDirectory()
+DB_URL = f"sqlite:///{Path(_tmp.name) / 'plans.db'}"
+os.environ["DATABASE_URL"] = DB_URL
+
+from benchmarks._synthetic import use_synthetic_dex  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# SCAN recorre todo (también "USING [COVERING] INDEX": es todo el índice, en
+# orden); solo SEARCH tiene una condición (col=? / rango). Las filas
+# constantes (VALUES) no cuentan
+FULL_SCAN = re.compile(r"\bSCAN (?!\d* ?CONSTANT ROWS?\b)")
+# consultas que recorren todo a propósito (no corren en un request)
+FULL_SCAN_ALLOWED = {
+    # refresh de snapshots al arrancar: busca filas de cualquier team
+    "snapshots.refresh",
+}
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def _migrate() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(str(BACKEND_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    cfg.set_main_option("sqlalchemy.url", DB_URL)
+    command.upgrade(cfg, "head")
+
+
+def _seed(db) -> tuple[int, int]:
+    from app.infra.orm import CollectionItem, Team, TeamMember, User
+
+    user = User(email="plans@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    db.add_all(CollectionItem(user_id=user.id, pokemon_id=p) for p in range(1, 50))
+    teams = [Team(user_id=user.id, name=f"team-{t}") for t in range(20)]
+    for team in teams:
+        team.members = [TeamMember(pokemon_id=p, slot=p) for p in range(1, 7)]
+    db.add_all(teams)
+    db.commit()
+    return user.id, teams[0].id
+
+
+def _hot_queries(db, user_id: int, team_id: int):
+    """(nombre, llamada) por cada consulta de repositorio en un camino caliente."""
+    from app.domain.repositories.collection_repository import CollectionRepository
+    from app.domain.repositories.team_repository import TeamRepository
+    from app.domain.repositories.tournament_repository import TournamentRepository
+    from app.domain.services.member_snapshot_service import refresh_member_snapshots
+
+    teams = TeamRepository(db)
+    collection = CollectionRepository(db)
+    tournament = TournamentRepository(db)
+    return [
+        ("teams.list_summaries", lambda: teams.list_summaries(user_id)),
+        ("teams.list_summaries keyset", lambda: teams.list_summaries(user_id, after=team_id + 5, limit=5)),
+        ("teams.list_by_user", lambda: teams.list_by_user(user_id)),
+        ("teams.iter_with_members", lambda: list(teams.iter_with_members(user_id, 5))),
+        ("teams.get_team", lambda: teams.get_team(team_id)),
+        ("teams.version_of", lambda: teams.version_of(user_id, team_id)),
+        ("teams.is_owner", lambda: teams.is_owner(user_id, team_id)),
+        ("teams.mutation_state", lambda: teams.mutation_state(user_id, team_id, 3)),
+        ("teams.rename_team", lambda: teams.rename_team(user_id, team_id, "renamed")),
+        ("teams.bump_version", lambda: teams.bump_version(team_id)),
+        ("teams.reorder_members", lambda: teams.reorder_members(user_id, team_id, {1: 2, 2: 1})),
+        ("teams.remove_member", lambda: teams.remove_member(user_id, team_id, 6)),
+        ("teams.add_member", lambda: teams.add_member(user_id, team_id, 6, 6)),
+        ("teams.delete_team", lambda: teams.delete_team(user_id, team_id + 1)),
+        ("collection.list_ids", lambda: collection.list_ids(user_id)),
+        ("collection.exists", lambda: collection.exists(user_id, 3)),
+        ("collection.owned_among", lambda: collection.owned_among(user_id, [1, 2, 99])),
+        ("collection.remove", lambda: collection.remove(user_id, 49)),
+        ("collection.remove_many", lambda: collection.remove_many(user_id, [47, 48, 99])),
+        ("tournament.save_values", lambda: tournament.save_values("fp", {("a", "b"): 0.5, ("a", "c"): -0.1})),
+        ("tournament.values_of", lambda: tournament.values_of("fp", [("a", "b"), ("b", "c")])),
+        ("snapshots.refresh", lambda: refresh_member_snapshots(db)),
+    ]
+
+
+def main():
+    from sqlalchemy import event
+
+    _migrate()
+    use_synthetic_dex()
+    from app.infra.db import SessionLocal, engine
+
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+            captured.append((statement, parameters))
+
+    failures = 0
+    with SessionLocal() as db:
+        user_id, team_id = _seed(db)
+        for name, call in _hot_queries(db, user_id, team_id):
+            captured.clear()
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                call()
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+            statements = list(captured)
+
+            for statement, parameters in statements:
+                plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                details = [row[-1] for row in plan]
+                bad = [
+                    d for d in details
+                    if (FULL_SCAN.search(d) and name not in FULL_SCAN_ALLOWED) or TEMP_SORT in d
+                ]
+                allowed = not bad and any(FULL_SCAN.search(d) for d in details)
+                status = "FAIL" if bad else ("scan" if allowed else "ok")
+                failures += bool(bad)
+                print(f"[{status:>4}] {name}")
+                for d in details:
+                    print(f"         {'!' if d in bad else ' '} {d}")
+        db.rollback()
+
+    if failures:
+        print(f"\n{failures} statement(s) with full scans or temp sorts")
+        sys.exit(1)
+    print("\nall hot queries use indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""tournament matches
+
+Revision ID: 0d4e7b2f9c15
+Revises: f2c8d61b7a94
+Create Date: 2026-10-19 19:02:41.583127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d4e7b2f9c15'
+down_revision: Union[str, Sequence[str], None] = 'f2c8d61b7a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tournament_matches',
+        sa.Column('fingerprint', sa.String(length=16), nullable=False),
+        sa.Column('hash_a', sa.String(length=16), nullable=False),
+        sa.Column('hash_b', sa.String(length=16), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('fingerprint', 'hash_a', 'hash_b'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tournament_matches')
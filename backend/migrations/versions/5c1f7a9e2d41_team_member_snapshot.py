@@ -0,0 +1,37 @@
+"""team member snapshot
+
+Revision ID: 5c1f7a9e2d41
+Revises: b54d5f3332e2
+Create Date: 2026-10-19 10:12:31.408113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f7a9e2d41'
+down_revision: Union[str, Sequence[str], None] = 'b54d5f3332e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # filas existentes quedan en NULL; las rellena member_snapshot_service refresh
+    with op.batch_alter_table('team_members') as batch_op:
+        batch_op.add_column(sa.Column('name', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('sprite', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('type_codes', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('snapshot_fp', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('team_members') as batch_op:
+        batch_op.drop_column('snapshot_fp')
+        batch_op.drop_column('type_codes')
+        batch_op.drop_column('sprite')
+        batch_op.drop_column('name')
@@ -0,0 +1,37 @@
+"""unique team member
+
+Revision ID: 8d3b6e0f4a27
+Revises: 5c1f7a9e2d41
+Create Date: 2026-10-19 11:40:02.117684
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3b6e0f4a27'
+down_revision: Union[str, Sequence[str], None] = '5c1f7a9e2d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # duplicados previos: se queda la fila más vieja
+    op.execute(
+        "DELETE FROM team_members WHERE id NOT IN ("
+        "SELECT MIN(id) FROM team_members GROUP BY team_id, pokemon_id)"
+    )
+    # miembros de teams ya borrados (SQLite no aplicaba el CASCADE)
+    op.execute("DELETE FROM team_members WHERE team_id NOT IN (SELECT id FROM teams)")
+    with op.batch_alter_table('team_members') as batch_op:
+        batch_op.create_unique_constraint('uq_team_pokemon', ['team_id', 'pokemon_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('team_members') as batch_op:
+        batch_op.drop_constraint('uq_team_pokemon', type_='unique')
@@ -0,0 +1,35 @@
+"""backfill team member slots
+
+Revision ID: a7e2c94b1f05
+Revises: 8d3b6e0f4a27
+Create Date: 2026-10-19 13:05:47.562310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e2c94b1f05'
+down_revision: Union[str, Sequence[str], None] = '8d3b6e0f4a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # slot = orden de inserción dentro del team, para filas que nunca lo tuvieron
+    op.execute(
+        "UPDATE team_members SET slot = ("
+        "SELECT COUNT(*) FROM team_members AS prev "
+        "WHERE prev.team_id = team_members.team_id AND prev.id <= team_members.id"
+        ") WHERE slot IS NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # solo datos: los slots rellenados siguen siendo válidos
+    pass
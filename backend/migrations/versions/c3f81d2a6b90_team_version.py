@@ -0,0 +1,30 @@
+"""team version
+
+Revision ID: c3f81d2a6b90
+Revises: a7e2c94b1f05
+Create Date: 2026-10-19 15:21:09.734502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f81d2a6b90'
+down_revision: Union[str, Sequence[str], None] = 'a7e2c94b1f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('teams') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('teams') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,46 @@
+"""index audit
+
+Revision ID: e5a09c7d3b18
+Revises: c3f81d2a6b90
+Create Date: 2026-10-19 16:48:55.201947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a09c7d3b18'
+down_revision: Union[str, Sequence[str], None] = 'c3f81d2a6b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # listados de teams por usuario (el rowid/id va implícito en el índice)
+    op.create_index(op.f('ix_teams_user_id'), 'teams', ['user_id'], unique=False)
+    # roster de un team en orden de slot (ORDER BY slot, id sale del índice)
+    op.create_index('ix_team_members_team_slot', 'team_members', ['team_id', 'slot'], unique=False)
+    # refresh de snapshots por Pokémon
+    op.create_index(op.f('ix_team_members_pokemon_id'), 'team_members', ['pokemon_id'], unique=False)
+    # colección ordenada por fecha, cubriendo pokemon_id
+    op.create_index(
+        'ix_collection_items_user_created',
+        'collection_items',
+        ['user_id', 'created_at', 'id', 'pokemon_id'],
+        unique=False,
+    )
+    # redundante: es prefijo de uq_user_pokemon y del índice nuevo
+    op.drop_index(op.f('ix_collection_items_user_id'), table_name='collection_items')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_collection_items_user_id'), 'collection_items', ['user_id'], unique=False)
+    op.drop_index('ix_collection_items_user_created', table_name='collection_items')
+    op.drop_index(op.f('ix_team_members_pokemon_id'), table_name='team_members')
+    op.drop_index('ix_team_members_team_slot', table_name='team_members')
+    op.drop_index(op.f('ix_teams_user_id'), table_name='teams')
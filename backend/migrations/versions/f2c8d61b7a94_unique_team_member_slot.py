@@ -0,0 +1,47 @@
+"""unique team member slot
+
+Revision ID: f2c8d61b7a94
+Revises: e5a09c7d3b18
+Create Date: 2026-10-19 18:21:09.334817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d61b7a94'
+down_revision: Union[str, Sequence[str], None] = 'e5a09c7d3b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _renumber_slots() -> None:
+    # slots 1..n por team en el orden actual (slot, id): corrige slots > 6 y
+    # repetidos que dejaban add_member (max + 1) y reorder
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, team_id, slot FROM team_members")).all()
+    rows.sort(key=lambda r: (r.team_id, r.slot is None, r.slot or 0, r.id))
+    updates, team_id, slot = [], None, 0
+    for row in rows:
+        slot = slot + 1 if row.team_id == team_id else 1
+        team_id = row.team_id
+        if row.slot != slot:
+            updates.append({"id": row.id, "slot": slot})
+    if updates:
+        bind.execute(sa.text("UPDATE team_members SET slot = :slot WHERE id = :id"), updates)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _renumber_slots()
+    op.drop_index('ix_team_members_team_slot', table_name='team_members')
+    op.create_index('ix_team_members_team_slot', 'team_members', ['team_id', 'slot'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_team_members_team_slot', table_name='team_members')
+    op.create_index('ix_team_members_team_slot', 'team_members', ['team_id', 'slot'], unique=False)
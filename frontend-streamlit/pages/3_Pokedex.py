@@ -202,9 +202,10 @@
 #     st.info("Usa **Buscar**, **Random**, o **Explorar** para ver un Pokémon.")
 
 import streamlit as st
-from utils.ui import page_header, inject_global_css, pokemon_card, sidebar_auth_block
+from utils.ui import page_header, inject_global_css, pokemon_card, sidebar_auth_block, type_badges
 from utils.api import (
     api_pokedex_get,
+    api_pokedex_list,
     api_pokedex_random,
     api_pokedex_search,
     api_collection_add,
@@ -231,6 +232,10 @@ st.session_state.setdefault("pk_last_query", "")
 st.session_state.setdefault("pk_browse_id", 1)
 st.session_state.setdefault("pk_trigger_search", False)
 st.session_state.setdefault("pk_search_input", "")
+st.session_state.setdefault("pk_page_cursors", [None])  # cursor `after` de cada página visitada
+
+BROWSE_PAGE_SIZE = 50
+BROWSE_COLS = 5
 
 
 # --------------------------------------------------------------------
@@ -313,23 +318,22 @@ with tab_random:
 # TAB: BROWSE
 # --------------------------------------------------------------------
 with tab_browse:
-    st.subheader("Navegación por ID")
+    st.subheader("Explorar la Pokédex")
+
+    cursors = st.session_state.pk_page_cursors
+    ok_l, page = api_pokedex_list(after=cursors[-1], limit=BROWSE_PAGE_SIZE)
 
     col1, col2, col3, col4 = st.columns([1, 1, 2, 2])
 
     with col1:
-        if st.button("⬅️ Prev"):
-            st.session_state.pk_browse_id = max(1, st.session_state.pk_browse_id - 1)
-            ok_p, data_p = api_pokedex_get(st.session_state.pk_browse_id)
-            if ok_p:
-                st.session_state.pk_current = data_p
+        if st.button("⬅️ Prev", disabled=len(cursors) <= 1):
+            cursors.pop()
+            st.rerun()
 
     with col2:
-        if st.button("Next ➡️"):
-            st.session_state.pk_browse_id += 1
-            ok_n, data_n = api_pokedex_get(st.session_state.pk_browse_id)
-            if ok_n:
-                st.session_state.pk_current = data_n
+        if st.button("Next ➡️", disabled=not (ok_l and page.get("next_after"))):
+            cursors.append(page["next_after"])
+            st.rerun()
 
     with col3:
         new_id = st.number_input(
@@ -347,6 +351,23 @@ with tab_browse:
             if ok_i:
                 st.session_state.pk_current = data_i
 
+    if not ok_l:
+        st.error(page.get("detail", "No se pudo cargar la Pokédex"))
+    else:
+        st.caption(f"Página {len(cursors)} · {page.get('total', 0)} Pokémon en total")
+        grid = st.columns(BROWSE_COLS)
+        for i, item in enumerate(page.get("items", [])):
+            with grid[i % BROWSE_COLS]:
+                if item.get("sprite"):
+                    st.image(item["sprite"], width=96)
+                st.markdown(f"**#{item['id']:03d} {item['name'].title()}**")
+                type_badges(item.get("types", []))
+                if st.button("Ver", key=f"browse_{item['id']}"):
+                    ok_v, data_v = api_pokedex_get(item["id"])
+                    if ok_v:
+                        st.session_state.pk_current = data_v
+                        st.session_state.pk_browse_id = item["id"]
+
 
 # --------------------------------------------------------------------
 # RENDER DE TARJETA + ACCIONES
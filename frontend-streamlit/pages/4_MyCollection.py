@@ -4,8 +4,9 @@ from utils.ui import page_header, inject_global_css, pokemon_card, sidebar_auth_
 from utils.api import (
     api_collection_list,
     api_collection_add,
-    api_pokedex_get,
+    api_pokedex_batch,
     api_collection_remove,
+    api_collection_bulk,
     api_ai_recommendations, 
     api_teams_get,
     api_team_add_member
@@ -42,12 +43,19 @@ with tabs[0]:
         st.subheader("📁 Pokémon guardados")
         st.markdown("Aquí puedes ver todos los Pokémon que has guardado en tu colección, administrarlos y eliminarlos si lo deseas.")
 
+        # una sola llamada para toda la colección
+        ok_b, batch_items = api_pokedex_batch(ids)
+        details = {int(it["key"]): it.get("data") for it in batch_items} if ok_b else {}
+
+        # teams una sola vez (antes se pedía por cada Pokémon)
+        ok_t, teams = api_teams_get(st.session_state.access_token)
+
         cols = st.columns(2)
         for i, pid in enumerate(ids):
             col = cols[i % 2]
             with col:
-                ok_p, p = api_pokedex_get(pid)
-                if ok_p:
+                p = details.get(pid)
+                if p:
                     pokemon_card(p)
 
                     remove_key = f"remove_{pid}_{i}"
@@ -59,7 +67,6 @@ with tabs[0]:
                         else:
                             st.error((data or {}).get("detail", "No se pudo eliminar"))
                     # --- Agregar a un Team ---
-                    ok_t, teams = api_teams_get(st.session_state.access_token)
                     if ok_t and teams:
 
                         # build display entries: "TeamName (X/6)" and detect full ones
@@ -139,6 +146,19 @@ with tabs[1]:
         st.markdown("### 🎯 Pokémon recomendados")
 
         recs = rec_data["recommendations"]
+
+        # ---- ADD ALL (one request) ----
+        rec_ids = [int(r["id"]) for r in recs if r.get("id") and r.get("sprite") and r.get("name")]
+        if is_authenticated() and rec_ids:
+            if st.button(f"➕ Agregar las {len(rec_ids)} recomendaciones a mi colección", key="add_all_recs"):
+                ok_bulk, resp = api_collection_bulk(st.session_state.access_token, add=rec_ids)
+                if ok_bulk:
+                    st.success(f"{resp['added']} Pokémon añadidos ✅ ({len(rec_ids) - resp['added']} ya estaban)")
+                    st.session_state["_refresh_collection"] = True
+                else:
+                    detail = (resp or {}).get("detail", "No se pudieron agregar")
+                    st.error(f"❌ {detail}")
+
         cols = st.columns(2)
 
         invalid_count = 0
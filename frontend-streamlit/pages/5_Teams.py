@@ -9,7 +9,7 @@ from utils.api import (
     api_team_update_name,
     api_team_get_members,
     api_team_remove_member,
-    api_team_add_member,
+    api_team_set_members,
     api_ai_auto_team,  # <- NUEVO: endpoint de Auto Team Builder (POST /ai/auto-team)
 )
 
@@ -260,7 +260,7 @@ with tab_auto:
     st.markdown("---")
 
     # Aplicar a Team existente
-    st.markdown("#### ➕ Agregar estos 6 a un Team existente")
+    st.markdown("#### ➕ Usar estos 6 en un Team existente")
     ok_list, teams_for_apply = api_teams_get(st.session_state.access_token)
     if ok_list and teams_for_apply:
         # Build labels con conteo
@@ -269,31 +269,19 @@ with tab_auto:
 
         selected_idx = labels.index(choice)
         chosen_team = teams_for_apply[selected_idx]
-        is_full = chosen_team.get("count", 0) >= 6
-
-        if is_full:
-            st.warning(f"El equipo **{chosen_team['name']}** ya está lleno (6/6).")
-        else:
-            if st.button("👉 Agregar todos al Team seleccionado"):
-                successes, conflicts, errors = 0, 0, 0
-                for m in members:
-                    pid = m.get("id")
-                    if not pid:
-                        errors += 1
-                        continue
-                    ok_add, resp = api_team_add_member(st.session_state.access_token, chosen_team["id"], int(pid))
-                    if ok_add:
-                        successes += 1
-                    else:
-                        # 409 duplicado o 400/otros
-                        detail = (resp or {}).get("detail", "")
-                        if "already" in detail.lower():
-                            conflicts += 1
-                        else:
-                            errors += 1
-                st.success(f"Listo: añadidos {successes}, duplicados {conflicts}, errores {errors}.")
+        if chosen_team.get("count", 0) > 0:
+            st.caption(f"Se reemplazarán los {chosen_team['count']} Pokémon actuales de **{chosen_team['name']}**.")
+
+        if st.button("👉 Aplicar al Team seleccionado"):
+            pids = [int(m["id"]) for m in members if m.get("id")]
+            # una sola request: valida y escribe el roster completo (todo o nada)
+            ok_set, resp = api_team_set_members(st.session_state.access_token, chosen_team["id"], pids)
+            if ok_set:
+                st.success(f"Listo: {resp.get('count', len(pids))} Pokémon en **{chosen_team['name']}**.")
                 st.session_state.team_selected = chosen_team["id"]
                 st.rerun()
+            else:
+                st.error((resp or {}).get("detail", "No se pudo aplicar el equipo"))
     else:
         st.info("Crea un Team primero para poder aplicar la sugerencia aquí.")
 
@@ -311,21 +299,12 @@ with tab_auto:
                 st.error((detail_new or {}).get("detail", "No se pudo crear el Team"))
             else:
                 new_team_id = detail_new.get("id")
-                successes, conflicts, errors = 0, 0, 0
-                for m in members:
-                    pid = m.get("id")
-                    if not pid:
-                        errors += 1
-                        continue
-                    ok_add, resp = api_team_add_member(st.session_state.access_token, new_team_id, int(pid))
-                    if ok_add:
-                        successes += 1
-                    else:
-                        detail = (resp or {}).get("detail", "")
-                        if "already" in detail.lower():
-                            conflicts += 1
-                        else:
-                            errors += 1
-                st.success(f"Team **{new_name}** creado ✅ | añadidos {successes}, duplicados {conflicts}, errores {errors}.")
+                pids = [int(m["id"]) for m in members if m.get("id")]
+                ok_set, resp = api_team_set_members(st.session_state.access_token, new_team_id, pids)
+                if ok_set:
+                    st.success(f"Team **{new_name}** creado ✅ | {resp.get('count', len(pids))} Pokémon añadidos.")
+                else:
+                    st.warning(f"Team **{new_name}** creado, pero no se pudo agregar el roster: "
+                               f"{(resp or {}).get('detail', 'error')}")
                 st.session_state.team_selected = new_team_id
                 st.rerun()
\ No newline at end of file
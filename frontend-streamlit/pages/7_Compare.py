@@ -36,14 +36,15 @@ with colB:
 
 center = st.columns([1, 1, 1])
 with center[1]:
+    use_ai = st.checkbox("Incluir análisis detallado con IA (más lento)", key="compare_ai")
     compare_btn = st.button("⚔️ Comparar ✨")
 
 if compare_btn:
     if not pk_a.strip() or not pk_b.strip():
         st.error("Debes ingresar ambos Pokémon.")
     else:
-        with st.spinner("Comparando con IA..."):
-            ok, result = api_ai_compare(pk_a.strip(), pk_b.strip(), st.session_state.access_token)
+        with st.spinner("Comparando con IA..." if use_ai else "Comparando..."):
+            ok, result = api_ai_compare(pk_a.strip(), pk_b.strip(), st.session_state.access_token, ai_summary=use_ai)
             if ok:
                 st.session_state.cmp_result = result
             else:
@@ -61,7 +62,27 @@ if st.session_state.cmp_result:
     st.markdown(result["summary"])
 
     st.markdown("---")
-    st.markdown(f"## 🏆 Predicción del ganador: **{result['winner'].capitalize()}**")
+    winner = result.get("winner")
+    if winner:
+        st.markdown(f"## 🏆 Predicción del ganador: **{winner.capitalize()}**")
+    else:
+        st.markdown("## 🤝 Predicción: **empate**")
+
+    # Comparativa numérica
+    if result.get("stat_deltas"):
+        st.markdown("### 📈 Diferencia de estadísticas (A − B)")
+        st.table({stat: [delta] for stat, delta in result["stat_deltas"].items()})
+
+        eff = result.get("type_effectiveness", {})
+        cols = st.columns(2)
+        with cols[0]:
+            st.markdown(f"**{result['a']['name'].capitalize()} → {result['b']['name'].capitalize()}**")
+            for t, m in eff.get("a_vs_b", {}).items():
+                st.write(f"{t}: x{m:g}")
+        with cols[1]:
+            st.markdown(f"**{result['b']['name'].capitalize()} → {result['a']['name'].capitalize()}**")
+            for t, m in eff.get("b_vs_a", {}).items():
+                st.write(f"{t}: x{m:g}")
 
     st.markdown("---")
     
@@ -4,6 +4,7 @@ from dotenv import load_dotenv
 
 load_dotenv()
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+POKEDEX_BATCH_MAX = 500  # límite de /pokedex/batch
 
 def _headers(token: str | None = None) -> dict:
     h = {"Content-Type": "application/json"}
@@ -46,11 +47,26 @@ def api_refresh_with_access(access_token: str) -> tuple[bool, dict | None]:
 # -------- Pokedex --------
 def api_pokedex_get(id_or_name: str | int) -> tuple[bool, dict | None]:
     url = f"{API_URL}/pokedex/look/{id_or_name}"
-    r = requests.get(url, timeout=15)
+    r = requests.get(url, params={"percentiles": "true"}, timeout=15)
     if r.status_code == 200:
         return True, r.json()
     return False, r.json() if r.headers.get("content-type","").startswith("application/json") else {"detail": r.text}
 
+def api_pokedex_batch(ids: list[int | str], fields: list[str] | None = None) -> tuple[bool, list[dict]]:
+    """GET /pokedex/batch -> items en el mismo orden que `ids` ({key, data, error})"""
+    url = f"{API_URL}/pokedex/batch"
+    items = []
+    for start in range(0, len(ids), POKEDEX_BATCH_MAX):
+        chunk = ids[start:start + POKEDEX_BATCH_MAX]
+        params = {"ids": ",".join(str(i) for i in chunk)}
+        if fields:
+            params["fields"] = ",".join(fields)
+        r = requests.get(url, params=params, timeout=30)
+        if r.status_code != 200:
+            return False, []
+        items.extend((r.json() or {}).get("items", []))
+    return True, items
+
 def api_pokedex_random() -> tuple[bool, dict | None]:
     url = f"{API_URL}/pokedex/random"
     r = requests.get(url, timeout=15)
@@ -66,6 +82,17 @@ def api_pokedex_search(query: str, limit: int = 12) -> tuple[bool, list[dict]]:
         return True, data.get("items", [])
     return False, []
 
+def api_pokedex_list(after: int | None = None, limit: int = 50) -> tuple[bool, dict]:
+    """GET /pokedex/list -> página de resúmenes {id, name, sprite, types}"""
+    url = f"{API_URL}/pokedex/list"
+    params = {"limit": limit}
+    if after is not None:
+        params["after"] = after
+    r = requests.get(url, params=params, timeout=15)
+    if r.status_code == 200:
+        return True, r.json()
+    return False, r.json() if r.headers.get("content-type","").startswith("application/json") else {"detail": r.text}
+
 def api_ai_fun_facts(access_token: str, pokemon_id: int) -> tuple[bool, dict]:
     url = f"{API_URL}/ai/fun-facts/{pokemon_id}"
     r = requests.get(url, headers=_headers(access_token), timeout=30)
@@ -100,6 +127,14 @@ def api_collection_remove(access_token: str, pokemon_id: int) -> tuple[bool, dic
         return True, r.json()
     return False, r.json() if r.headers.get("content-type","").startswith("application/json") else {"detail": r.text}
 
+def api_collection_bulk(access_token: str, add: list[int] | None = None, remove: list[int] | None = None) -> tuple[bool, dict | None]:
+    url = f"{API_URL}/collection/bulk"
+    payload = {"add": list(add or []), "remove": list(remove or [])}
+    r = requests.post(url, json=payload, headers=_headers(access_token), timeout=30)
+    if r.status_code == 200:
+        return True, r.json()
+    return False, r.json() if r.headers.get("content-type","").startswith("application/json") else {"detail": r.text}
+
 def api_ai_recommendations(access_token: str) -> tuple[bool, dict]:
     url = f"{API_URL}/ai/recommendations"
     r = requests.post(url, headers=_headers(access_token), timeout=30)
@@ -205,6 +240,25 @@ def api_team_add_member(access_token: str, team_id: int, pokemon_id: int) -> tup
         return False, {"detail": r.text}
 
 
+def api_team_set_members(access_token: str, team_id: int, pokemon_ids: list[int]) -> tuple[bool, dict]:
+    """PUT /teams/{team_id}/members -> reemplazar el roster completo y devolver TeamDetail"""
+    url = f"{API_URL}/teams/{team_id}/members"
+    r = requests.put(
+        url,
+        json={"pokemon_ids": pokemon_ids},
+        headers=_headers(access_token),
+        timeout=15,
+    )
+
+    if r.status_code == 200:
+        return True, r.json()
+
+    try:
+        return False, r.json()
+    except:
+        return False, {"detail": r.text}
+
+
 def api_team_remove_member(access_token: str, team_id: int, pokemon_id: int) -> tuple[bool, dict]:
     """DELETE /teams/{team_id}/remove/{pokemon_id} -> quitar miembro y devolver TeamDetail"""
     url = f"{API_URL}/teams/{team_id}/remove/{pokemon_id}"
@@ -258,13 +312,14 @@ def api_ai_identify(access_token: str, uploaded_file) -> tuple[bool, dict | None
     
 # ---- AI Compare ----
 
-def api_ai_compare(pokemon_a: str | int, pokemon_b: str | int, access_token: str) -> tuple[bool, dict]:
+def api_ai_compare(pokemon_a: str | int, pokemon_b: str | int, access_token: str, ai_summary: bool = False) -> tuple[bool, dict]:
     url = f"{API_URL}/ai/compare"
     payload = {
         "pokemon_a": pokemon_a,
         "pokemon_b": pokemon_b
     }
-    r = requests.post(url, json=payload, headers=_headers(access_token), timeout=30)
+    params = {"ai_summary": "true"} if ai_summary else None
+    r = requests.post(url, json=payload, params=params, headers=_headers(access_token), timeout=30)
 
     if r.status_code == 200:
         return True, r.json()
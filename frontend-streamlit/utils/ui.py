@@ -10,7 +10,7 @@ TYPE_COLORS = {
     "steel": "#B7B7CE", "fairy": "#D685AD",
 }
 
-BASE_STAT_MAX = 255  # escala aproximada
+BASE_STAT_MAX = 255  # escala aproximada (si el backend no manda percentiles)
 
 GLOBAL_CSS = """
 <style>
@@ -92,8 +92,14 @@ def type_badges(types: Iterable[str]):
         spans.append(f'<span class="badge" style="background:{color}">{t}</span>')
     st.markdown(" ".join(spans), unsafe_allow_html=True)
 
-def stat_row(name: str, value: int):
-    pct = max(0, min(100, int(value * 100 / BASE_STAT_MAX)))
+def stat_row(name: str, value: int, percentile: float | None = None):
+    # con percentil la barra muestra qué tan bueno es el stat frente a todo el dex
+    if percentile is not None:
+        pct = max(0, min(100, int(percentile)))
+        label = f'{value} <span style="opacity:.6;font-weight:400;">p{pct}</span>'
+    else:
+        pct = max(0, min(100, int(value * 100 / BASE_STAT_MAX)))
+        label = f"{value}"
     st.markdown(
         f"""
         <div class="stat-row">
@@ -101,7 +107,7 @@ def stat_row(name: str, value: int):
           <div class="stat-bar">
             <div class="stat-fill" style="width:{pct}%"></div>
           </div>
-          <div style="width:40px;text-align:right;font-weight:700;">{value}</div>
+          <div style="width:80px;text-align:right;font-weight:700;">{label}</div>
         </div>
         """,
         unsafe_allow_html=True
@@ -122,10 +128,11 @@ def pokemon_card(p: dict):
         with c2:
             st.markdown("**Base Stats**")
             s = p.get("stats", {})
-            stat_row("HP", s.get("hp", 0))
-            stat_row("ATK", s.get("attack", 0))
-            stat_row("DEF", s.get("defense", 0))
-            stat_row("SpA", s.get("special_attack", 0))
-            stat_row("SpD", s.get("special_defense", 0))
-            stat_row("SPD", s.get("speed", 0))
+            pc = p.get("percentiles") or {}
+            stat_row("HP", s.get("hp", 0), pc.get("hp"))
+            stat_row("ATK", s.get("attack", 0), pc.get("attack"))
+            stat_row("DEF", s.get("defense", 0), pc.get("defense"))
+            stat_row("SpA", s.get("special_attack", 0), pc.get("special_attack"))
+            stat_row("SpD", s.get("special_defense", 0), pc.get("special_defense"))
+            stat_row("SPD", s.get("speed", 0), pc.get("speed"))
         st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file